@@ -0,0 +1,118 @@
+"""
+@author Anish
+@description Benchmark: jsonify() cost for representative get_all_* outputs, stdlib vs FastJSONProvider
+@date 17/10/2026
+@returns nothing
+
+Run from the repository root (install orjson to see the fast path):
+    python Testing/benchmarks/bench_json.py --rows 2000
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List
+from datetime import datetime, timedelta
+from decimal import Decimal
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+import src.json_provider as json_provider  # noqa: E402
+
+WORDS = "semester exam schedule notice results hostel library placement internship workshop seminar project".split()
+BASE = datetime(2026, 1, 5, 9, 0)
+
+
+def text(n: int) -> str:
+    return " ".join(random.choices(WORDS, k=n))
+
+
+def sample_rows(n: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows shaped like the get_all_* helpers return them (DictCursor, DATETIME -> datetime)."""
+    return {
+        "notices": [
+            {"notice_id": i, "title": text(6), "content": text(60), "created_at": BASE - timedelta(hours=i), "posted_by": "65000001"}
+            for i in range(n, 0, -1)
+        ],
+        "events": [
+            {"event_id": i, "title": text(5), "content": text(40), "last_date": BASE + timedelta(days=i),
+             "posted_by": "65000001", "created_at": BASE - timedelta(days=i)}
+            for i in range(n, 0, -1)
+        ],
+        "jobs": [
+            {"job_id": i, "title": text(4), "description": text(50), "company": "TCS", "apply_link": "https://example.com/apply",
+             "posted_by": "70000002", "created_at": BASE - timedelta(days=i)}
+            for i in range(n, 0, -1)
+        ],
+        "schedules": [
+            {"schedule_id": i, "subject_id": i % 40, "teacher_id": i % 25, "title": text(3), "location": f"Room {100 + i % 30}",
+             "start_time": BASE + timedelta(hours=i), "end_time": BASE + timedelta(hours=i, minutes=50)}
+            for i in range(n, 0, -1)
+        ],
+        "students": [
+            {"student_id": i, "login_id": f"83{i:06d}", "name": text(2), "email": f"s{i}@example.com",
+             "roll_no": f"R{i}", "semester": 1 + i % 8, "program_id": 1 + i % 5, "cgpa": Decimal("8.25")}
+            for i in range(n, 0, -1)
+        ],
+    }
+
+
+def per_call_ms(app: Flask, rows: List[Dict[str, Any]], repeat: int) -> float:
+    with app.test_request_context():
+        app.json.response(rows)  # warm up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            app.json.response(rows).get_data()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+
+def make_app(provider: Callable[[Flask], Any]) -> Flask:
+    app = Flask("bench")
+    app.json = provider(app)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(1)
+    data = sample_rows(args.rows)
+
+    class DefaultWithDecimal(DefaultJSONProvider):
+        # Flask's stock provider, plus Decimal so the students sample encodes at all
+        default = staticmethod(lambda o: float(o) if isinstance(o, Decimal) else DefaultJSONProvider.default(o))
+
+    orjson_module = json_provider.orjson
+    apps = {"flask default": make_app(DefaultWithDecimal)}
+    json_provider.orjson = None
+    apps["fast (stdlib)"] = make_app(json_provider.FastJSONProvider)
+    results: Dict[str, Dict[str, float]] = {name: {} for name in data}
+    for collection, rows in data.items():
+        for label, app in apps.items():
+            results[collection][label] = per_call_ms(app, rows, args.repeat)
+    json_provider.orjson = orjson_module
+    if orjson_module is not None:
+        fast = make_app(json_provider.FastJSONProvider)
+        for collection, rows in data.items():
+            results[collection]["fast (orjson)"] = per_call_ms(fast, rows, args.repeat)
+    else:
+        print("orjson is not installed: only the stdlib path is measured\n")
+
+    labels = list(next(iter(results.values())))
+    print(f"{args.rows} rows per collection, ms per jsonify()\n")
+    print(f"{'collection':<12}" + "".join(f"{label:>16}" for label in labels) + f"{'speedup':>10}")
+    for collection, timings in results.items():
+        speedup = timings["flask default"] / timings[labels[-1]]
+        print(f"{collection:<12}" + "".join(f"{timings[label]:>16.2f}" for label in labels) + f"{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+@author Anish
+@description Benchmark: logins/sec for password verification at different KDF cost settings
+@date 17/10/2026
+@returns nothing
+
+Run from the repository root:
+    python Testing/benchmarks/bench_password_hashing.py --logins 200 --concurrency 16
+"""
+
+from __future__ import annotations
+from typing import Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+from src.passwords import PasswordHasher, hash_password_sync, verify_password_sync  # noqa: E402
+
+SETTINGS: List[Tuple[str, Tuple[Any, ...]]] = [
+    ("pbkdf2_sha256", (100_000,)),
+    ("pbkdf2_sha256", (310_000,)),
+    ("pbkdf2_sha256", (600_000,)),
+    ("scrypt", (2 ** 14, 8, 1)),
+    ("scrypt", (2 ** 15, 8, 1)),
+]
+
+
+def logins_per_second(verify: Any, encoded: str, logins: int, concurrency: int) -> float:
+    """Drive `logins` verifications from `concurrency` request-like threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        results = list(threads.map(lambda _: verify("correct horse", encoded), range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+    return logins / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16, help="simulated Flask request threads")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="hash pool processes")
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(workers=args.workers, queue_size=args.workers * 8, timeout=60)
+    hasher.start()
+
+    print(f"{args.logins} logins, {args.concurrency} threads, {args.workers} hash processes\n")
+    print(f"{'algorithm':<15}{'params':<20}{'single hash ms':>16}{'inline login/s':>16}{'pool login/s':>14}")
+    for algorithm, params in SETTINGS:
+        encoded = hash_password_sync("correct horse", algorithm, params)
+
+        started = time.perf_counter()
+        verify_password_sync("correct horse", encoded)
+        single_ms = (time.perf_counter() - started) * 1000
+
+        inline = logins_per_second(verify_password_sync, encoded, args.logins, args.concurrency)
+        pooled = logins_per_second(hasher.verify, encoded, args.logins, args.concurrency)
+        print(f"{algorithm:<15}{str(params):<20}{single_ms:>16.1f}{inline:>16.1f}{pooled:>14.1f}")
+
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
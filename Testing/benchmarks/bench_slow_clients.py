@@ -0,0 +1,158 @@
+"""
+@author Anish
+@description Benchmark: fast-client latency while hundreds of slow clients hold connections (sync vs ASGI mode)
+@date 17/10/2026
+@returns nothing
+
+Start the backend one way, run this, then restart it the other way and rerun with --compare:
+    sync:  python app.py                          (or gunicorn -w 1 --threads 16 app:app)
+    ASGI:  uvicorn app:asgi_app --port 8080       (or SERVER_MODE="asgi" python app.py)
+
+    python Testing/benchmarks/bench_slow_clients.py --slow-clients 300 --json results/sync.json
+    python Testing/benchmarks/bench_slow_clients.py --slow-clients 300 --compare results/sync.json
+
+Each slow client sends its request a few bytes at a time (--trickle-ms) and reads the
+response at --read-kbps, like a phone on a poor connection, then starts over. Meanwhile
+--fast-clients ordinary clients hit --fast-path as fast as they can; their latency is
+what thread exhaustion shows up in. With METRICS_TOKEN set on the server, pass
+--metrics-token to also report the server's peak thread count.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+import requests
+
+from load_test import Recorder, print_report
+
+
+async def slow_client(host: str, port: int, path: str, args: argparse.Namespace, recorder: Recorder, stop: threading.Event) -> None:
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\nConnection: close\r\n\r\n".encode()
+    per_read = max(1, int(args.read_kbps * 1024 / 10))
+    while not stop.is_set():
+        started = time.perf_counter()
+        ok = False
+        writer: Optional[asyncio.StreamWriter] = None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port, limit=per_read), args.timeout)
+            for i in range(0, len(request), args.trickle_bytes):
+                writer.write(request[i:i + args.trickle_bytes])
+                await writer.drain()
+                await asyncio.sleep(args.trickle_ms / 1000)
+            status = await asyncio.wait_for(reader.readline(), args.timeout)
+            ok = status.split(b" ")[1:2] == [b"200"]
+            # ~10 reads per second of per_read bytes each
+            while not stop.is_set():
+                chunk = await asyncio.wait_for(reader.read(per_read), args.timeout)
+                if not chunk:
+                    break
+                await asyncio.sleep(0.1)
+        except (OSError, ValueError, asyncio.TimeoutError, IndexError):
+            ok = False
+        finally:
+            if writer is not None:
+                writer.close()
+        recorder.add(f"slow GET {path}", time.perf_counter() - started, ok)
+
+
+def run_slow_clients(args: argparse.Namespace, recorder: Recorder, stop: threading.Event) -> None:
+    url = urlsplit(args.base_url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+
+    async def main() -> None:
+        tasks = []
+        for i in range(args.slow_clients):
+            tasks.append(asyncio.create_task(slow_client(host, port, args.slow_path, args, recorder, stop)))
+            await asyncio.sleep(args.ramp / max(1, args.slow_clients))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def fast_client(args: argparse.Namespace, recorder: Recorder, stop: threading.Event) -> None:
+    http = requests.Session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            ok = http.get(args.base_url.rstrip("/") + args.fast_path, timeout=args.timeout).status_code == 200
+        except requests.RequestException:
+            ok = False
+        recorder.add(f"fast GET {args.fast_path}", time.perf_counter() - started, ok)
+
+
+def server_threads(args: argparse.Namespace) -> Optional[float]:
+    """The server's live thread count from /metrics (process_threads), if reachable."""
+    headers = {"Authorization": f"Bearer {args.metrics_token}"} if args.metrics_token else {}
+    try:
+        resp = requests.get(args.base_url.rstrip("/") + "/metrics", headers=headers, timeout=5)
+    except requests.RequestException:
+        return None
+    for line in resp.text.splitlines():
+        if line.startswith("process_threads "):
+            return float(line.split()[1])
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--slow-clients", type=int, default=300)
+    parser.add_argument("--slow-path", default="/notice/all", help="A public read route with a large body.")
+    parser.add_argument("--trickle-bytes", type=int, default=8)
+    parser.add_argument("--trickle-ms", type=float, default=50.0)
+    parser.add_argument("--read-kbps", type=float, default=32.0)
+    parser.add_argument("--fast-clients", type=int, default=8)
+    parser.add_argument("--fast-path", default="/programs/all")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which the slow clients connect.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds (after the ramp).")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--metrics-token", default=os.getenv("METRICS_TOKEN", ""))
+    parser.add_argument("--json", dest="json_out", help="Write the report to this file.")
+    parser.add_argument("--compare", help="A report written by an earlier --json run.")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)["routes"]
+
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [threading.Thread(target=run_slow_clients, args=(args, recorder, stop), daemon=True)]
+    threads += [threading.Thread(target=fast_client, args=(args, recorder, stop), daemon=True) for _ in range(args.fast_clients)]
+    for t in threads:
+        t.start()
+    time.sleep(args.ramp)
+    recorder.recording = True
+    started = time.perf_counter()
+    peak_threads: Optional[float] = None
+    while time.perf_counter() - started < args.duration:
+        count = server_threads(args)
+        if count is not None:
+            peak_threads = max(peak_threads or 0.0, count)
+        time.sleep(1.0)
+    recorder.recording = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+
+    report = recorder.summary(elapsed)
+    print(f"{args.slow_clients} slow + {args.fast_clients} fast clients, {elapsed:.0f}s against {args.base_url}")
+    print(f"server peak threads: {peak_threads:.0f}\n" if peak_threads is not None else "server peak threads: n/a (no /metrics)\n")
+    print_report(report, baseline)
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            out: Dict[str, Any] = {"config": {k: v for k, v in vars(args).items() if k not in ("json_out", "compare", "metrics_token")},
+                                   "peak_threads": peak_threads, "routes": report}
+            json.dump(out, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
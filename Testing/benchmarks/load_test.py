@@ -0,0 +1,258 @@
+"""
+@author Anish
+@description Load test: drive the running API at a fixed concurrency, report throughput and p50/p95/p99 per route
+@date 17/10/2026
+@returns nothing
+
+1. Seed a local database:      python Testing/benchmarks/seed_db.py --reset
+2. Start the backend with DEV_ENV="True" (plain-http cookies) and the seeded DB.
+3. Run from the repository root:
+    python Testing/benchmarks/load_test.py --concurrency 16 --duration 60 --json results/base.json
+4. After a change, rerun with --compare results/base.json to see the delta per route.
+
+Each virtual user logs in once as a student and once as an admin, then loops over a
+weighted mix of operations (--mix) until --duration runs out. Requests made during
+--warmup are not counted.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import defaultdict
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+
+# name -> default weight; one operation may issue several requests
+DEFAULT_MIX: Dict[str, int] = {
+    "login": 2,
+    "refresh": 4,
+    "programs": 6,
+    "subjects": 6,
+    "teachers": 4,
+    "students": 2,
+    "notices": 10,
+    "events": 6,
+    "jobs": 6,
+    "schedules": 6,
+    "dashboard": 10,
+    "admin_write": 3,
+}
+READ_ROUTES: Dict[str, str] = {
+    "programs": "/programs/all",
+    "subjects": "/subjects/all",
+    "teachers": "/teachers/all",
+    "students": "/students/all",
+    "notices": "/notice/all",
+    "events": "/event/all",
+    "jobs": "/job/all",
+    "schedules": "/schedules/all",
+    "dashboard": "/dashboard",
+}
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(p / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Recorder:
+    """Latencies and error counts per route, shared by every virtual user."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def add(self, route: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        with self._lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            routes = {route: sorted(values) for route, values in self.latencies.items()}
+            errors = dict(self.errors)
+        routes["TOTAL"] = sorted(v for values in routes.values() for v in values)
+        errors["TOTAL"] = sum(errors.values())
+        out: Dict[str, Dict[str, float]] = {}
+        for route, ordered in sorted(routes.items()):
+            out[route] = {
+                "requests": len(ordered),
+                "errors": errors.get(route, 0),
+                "rps": len(ordered) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": (ordered[-1] * 1000) if ordered else 0.0,
+            }
+        return out
+
+
+class Client:
+    """
+    One logged-in account. JWT cookies are kept by hand and sent explicitly, so the
+    Secure flag set outside DEV_ENV does not stop them going over plain http.
+    """
+
+    def __init__(self, base_url: str, recorder: Recorder, timeout: float) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.cookies: Dict[str, str] = {}
+
+    def call(self, method: str, path: str, route: Optional[str] = None, csrf: Optional[str] = None, **kwargs: Any) -> Optional[requests.Response]:
+        headers = kwargs.pop("headers", {})
+        if csrf and csrf in self.cookies:
+            headers["X-CSRF-TOKEN"] = self.cookies[csrf]
+        started = time.perf_counter()
+        try:
+            resp = self.http.request(method, self.base_url + path, headers=headers, cookies=self.cookies, timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            self.recorder.add(route or f"{method} {path}", time.perf_counter() - started, False)
+            return None
+        self.recorder.add(route or f"{method} {path}", time.perf_counter() - started, resp.status_code < 400)
+        self.cookies.update(resp.cookies.get_dict())
+        self.http.cookies.clear()
+        return resp
+
+    def login(self, login_id: str, password: str) -> bool:
+        resp = self.call("POST", "/auth/login", json={"login_id": login_id, "password": password})
+        return resp is not None and resp.status_code == 200
+
+
+def build_operations(student: Client, admin: Client, users: Dict[str, Any], rng: random.Random) -> Dict[str, Callable[[], None]]:
+    password = users["password"]
+
+    def login() -> None:
+        student.login(rng.choice(users["students"]), password)
+
+    def refresh() -> None:
+        student.call("POST", "/auth/refresh", csrf="csrf_refresh_token")
+
+    def admin_write() -> None:
+        resp = admin.call("POST", "/notice/add", csrf="csrf_access_token",
+                          json={"title": "Load test notice", "content": "Posted by load_test.py " * 10})
+        if resp is None or resp.status_code != 201:
+            return
+        notice_id = resp.json().get("notice_id")
+        admin.call("PUT", f"/notice/update/{notice_id}", route="PUT /notice/update/<id>", csrf="csrf_access_token",
+                   json={"title": "Load test notice (edited)"})
+        admin.call("DELETE", f"/notice/delete/{notice_id}", route="DELETE /notice/delete/<id>", csrf="csrf_access_token")
+
+    def read(path: str) -> Callable[[], None]:
+        def op() -> None:
+            student.call("GET", path)
+        return op
+
+    operations: Dict[str, Callable[[], None]] = {"login": login, "refresh": refresh, "admin_write": admin_write}
+    for name, path in READ_ROUTES.items():
+        operations[name] = read(path)
+    return operations
+
+
+def virtual_user(args: argparse.Namespace, users: Dict[str, Any], mix: List[Tuple[str, int]], recorder: Recorder,
+                 stop: threading.Event, seed: int) -> None:
+    rng = random.Random(seed)
+    student = Client(args.base_url, recorder, args.timeout)
+    admin = Client(args.base_url, recorder, args.timeout)
+    if not student.login(rng.choice(users["students"]), users["password"]) or not admin.login(rng.choice(users["admins"]), users["password"]):
+        print("[ERROR] virtual user could not log in; is the server using the seeded database?")
+        return
+    operations = build_operations(student, admin, users, rng)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    while not stop.is_set():
+        operations[rng.choices(names, weights)[0]]()
+
+
+def parse_mix(text: Optional[str]) -> List[Tuple[str, int]]:
+    mix = dict(DEFAULT_MIX)
+    if text:
+        mix = {name: 0 for name in mix}
+        for part in text.split(","):
+            name, _, weight = part.partition("=")
+            if name.strip() not in DEFAULT_MIX:
+                raise SystemExit(f"Unknown operation {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+            mix[name.strip()] = int(weight or 1)
+    return [(name, weight) for name, weight in mix.items() if weight > 0]
+
+
+def print_report(report: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]]) -> None:
+    header = f"{'route':<32}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    if baseline:
+        header += f"{'p95 Δ':>9}{'req/s Δ':>9}"
+    print(header)
+    for route, r in report.items():
+        line = (f"{route:<32}{r['requests']:>8}{r['errors']:>8}{r['rps']:>9.1f}"
+                f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+        if baseline:
+            before = baseline.get(route)
+            if before and before["p95_ms"] and before["rps"]:
+                line += f"{(r['p95_ms'] / before['p95_ms'] - 1) * 100:>+8.0f}%{(r['rps'] / before['rps'] - 1) * 100:>+8.0f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8080")
+    parser.add_argument("--users-file", default=os.path.join(os.path.dirname(__file__), "bench_users.json"))
+    parser.add_argument("--concurrency", type=int, default=16, help="Virtual users, each issuing one request at a time.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds (after warmup).")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--mix", help=f"Comma-separated name=weight, e.g. notices=5,login=1 (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_out", help="Write the report to this file.")
+    parser.add_argument("--compare", help="A report written by an earlier --json run.")
+    args = parser.parse_args()
+
+    with open(args.users_file, encoding="utf-8") as fh:
+        users = json.load(fh)
+    mix = parse_mix(args.mix)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)["routes"]
+
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=virtual_user, args=(args, users, mix, recorder, stop, args.seed + i), daemon=True)
+        for i in range(args.concurrency)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(args.warmup)
+    recorder.recording = True
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    recorder.recording = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for t in threads:
+        t.join(timeout=args.timeout)
+
+    report = recorder.summary(elapsed)
+    print(f"{args.concurrency} virtual users, {elapsed:.0f}s against {args.base_url}\n")
+    print_report(report, baseline)
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k not in ("json_out", "compare")}, "mix": dict(mix), "routes": report}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
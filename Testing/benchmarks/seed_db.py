@@ -0,0 +1,221 @@
+"""
+@author Anish
+@description Seed a local college_db with realistic volumes for the load test (load_test.py)
+@date 17/10/2026
+@returns nothing
+
+Uses the DB_* settings from backend/.env (DB_ENGINE="sqlite" seeds SQLITE_PATH). Run from the repository root:
+    python Testing/benchmarks/seed_db.py --reset --students 5000 --teachers 200 --years 3 --tokens 200000
+
+All seeded accounts share one password (--password); their login ids are written to
+--users-file for load_test.py. Never point this at a database you care about:
+--reset empties every table first.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Tuple
+from datetime import datetime, timedelta
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+
+import pymysql  # noqa: E402
+import pymysql.cursors  # noqa: E402
+from src.db import DB_ENGINE, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD, SQLITE_PATH  # noqa: E402
+from src.sqlite_backend import connect as sqlite_connect  # noqa: E402
+from src.passwords import PASSWORD_HASH_ALGORITHM, current_params, hash_password_sync  # noqa: E402
+
+TABLES = (
+    "subject_teachers", "schedules", "students", "subjects", "teachers", "admins", "programs",
+    "notices", "events", "job_updates", "token_blocklist", "id_counter", "collection_versions",
+)
+PROGRAMS = [
+    ("BTECH_IT", "B.Tech in Information Technology", "4 Years", "Undergraduate", 8),
+    ("MTECH_IT", "M.Tech in Information Technology", "2 Years", "Postgraduate", 4),
+    ("MCA", "Master of Computer Applications", "2 Years", "Postgraduate", 4),
+    ("PHD_IT", "Ph.D in Information Technology", "3-5 Years", "Doctoral", 2),
+]
+WORDS = (
+    "semester exam schedule notice results hostel library placement internship workshop seminar "
+    "project lab viva syllabus assignment fees scholarship sports cultural hackathon alumni"
+).split()
+COMPANIES = ["TCS", "Infosys", "Wipro", "Cognizant", "Accenture", "Capgemini", "IBM", "Deloitte"]
+BATCH = 2000
+
+
+def text(n: int) -> str:
+    return " ".join(random.choices(WORDS, k=n))
+
+
+def insert_many(cur: Any, sql: str, rows: Sequence[Tuple[Any, ...]]) -> None:
+    """executemany in BATCH-sized chunks (pymysql folds each chunk into one INSERT)."""
+    for i in range(0, len(rows), BATCH):
+        cur.executemany(sql, rows[i:i + BATCH])
+
+
+def people(prefix: str, count: int, start: int, password: str) -> List[Tuple[str, str, str, str]]:
+    return [
+        (f"{prefix}{str(start + i).zfill(6)}", f"{text(1).title()} {prefix}{start + i}", f"bench{prefix}{start + i}@example.com", password)
+        for i in range(count)
+    ]
+
+
+def seed(cur: Any, args: argparse.Namespace, encoded: str) -> Dict[str, Any]:
+    now = datetime.now().replace(microsecond=0)
+    first_day = (now - timedelta(days=365 * args.years)).replace(hour=0, minute=0, second=0)
+    counts: Dict[str, int] = {}
+
+    # programs / subjects (8 per semester)
+    insert_many(cur, "INSERT INTO programs (code, name, duration, level, description) VALUES (%s, %s, %s, %s, %s)",
+                [(code, name, duration, level, text(20)) for code, name, duration, level, _ in PROGRAMS])
+    cur.execute("SELECT program_id, code FROM programs")
+    program_ids = {r["code"]: r["program_id"] for r in cur.fetchall()}
+    subject_rows = [
+        (program_ids[code], f"{code[:3]}{sem}{k:02d}", text(3).title(), sem)
+        for code, _, _, _, semesters in PROGRAMS for sem in range(1, semesters + 1) for k in range(8)
+    ]
+    insert_many(cur, "INSERT INTO subjects (program_id, code, name, semester) VALUES (%s, %s, %s, %s)", subject_rows)
+    cur.execute("SELECT subject_id FROM subjects")
+    subject_ids = [r["subject_id"] for r in cur.fetchall()]
+    counts["programs"], counts["subjects"] = len(PROGRAMS), len(subject_rows)
+
+    # accounts: login ids continue from id_counter so reseeding without --reset doesn't collide
+    login_ids: Dict[str, List[str]] = {}
+    for prefix, table, count in (("65", "admins", args.admins), ("70", "teachers", args.teachers), ("83", "students", args.students)):
+        cur.execute("INSERT IGNORE INTO id_counter (prefix, last_no) VALUES (%s, 0)", (prefix,))
+        cur.execute("SELECT last_no FROM id_counter WHERE prefix=%s FOR UPDATE", (prefix,))
+        start = int(cur.fetchone()["last_no"]) + 1
+        rows = people(prefix, count, start, encoded)
+        if table == "admins":
+            insert_many(cur, "INSERT INTO admins (login_id, name, email, password) VALUES (%s, %s, %s, %s)", rows)
+        elif table == "teachers":
+            insert_many(cur, "INSERT INTO teachers (login_id, name, email, password, subject) VALUES (%s, %s, %s, %s, %s)",
+                        [r + (text(2).title(),) for r in rows])
+        else:
+            programs = list(program_ids.values())
+            insert_many(cur, "INSERT INTO students (login_id, name, email, password, roll_no, semester, program_id) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                        [r + (f"R{r[0]}", random.randint(1, 8), random.choice(programs)) for r in rows])
+        cur.execute("UPDATE id_counter SET last_no=%s WHERE prefix=%s", (start + count - 1, prefix))
+        login_ids[table] = [r[0] for r in rows]
+        counts[table] = count
+
+    cur.execute("SELECT teacher_id FROM teachers")
+    teacher_ids = [r["teacher_id"] for r in cur.fetchall()]
+    insert_many(cur, "INSERT INTO subject_teachers (teacher_id, subject_id) VALUES (%s, %s)",
+                [(random.choice(teacher_ids), sid) for sid in subject_ids for _ in range(2)])
+    counts["subject_teachers"] = len(subject_ids) * 2
+
+    # timetable: every weekday of the period, --slots-per-day lectures across 30 rooms
+    schedule_rows: List[Tuple[Any, ...]] = []
+    day = first_day
+    while day < now + timedelta(days=180):
+        if day.weekday() < 5:
+            for k in range(args.slots_per_day):
+                start = day + timedelta(hours=9 + (k % 8))
+                schedule_rows.append((random.choice(subject_ids), random.choice(teacher_ids), text(3).title(),
+                                      f"Room {100 + k // 8 % 30}", start, start + timedelta(minutes=50)))
+        day += timedelta(days=1)
+    insert_many(cur, "INSERT INTO schedules (subject_id, teacher_id, title, location, start_time, end_time) VALUES (%s, %s, %s, %s, %s, %s)",
+                schedule_rows)
+    counts["schedules"] = len(schedule_rows)
+
+    # notices / events / job updates spread over the period
+    span = int((now - first_day).total_seconds())
+    posters = login_ids["admins"] + login_ids["teachers"][:20]
+
+    def when() -> datetime:
+        return first_day + timedelta(seconds=random.randrange(span))
+
+    notice_rows = [(text(6).capitalize(), text(80), when(), random.choice(posters)) for _ in range(args.notices_per_day * 365 * args.years)]
+    insert_many(cur, "INSERT INTO notices (title, content, created_at, posted_by) VALUES (%s, %s, %s, %s)", notice_rows)
+    event_rows: List[Tuple[Any, ...]] = []
+    for _ in range(60 * args.years):
+        created = when()
+        event_rows.append((text(5).capitalize(), text(50), created + timedelta(days=30), random.choice(posters), created))
+    insert_many(cur, "INSERT INTO events (title, content, last_date, posted_by, created_at) VALUES (%s, %s, %s, %s, %s)", event_rows)
+    job_rows = [(text(4).capitalize(), text(60), random.choice(COMPANIES), "https://example.com/apply", random.choice(posters), when())
+                for _ in range(150 * args.years)]
+    insert_many(cur, "INSERT INTO job_updates (title, description, company, apply_link, posted_by, created_at) VALUES (%s, %s, %s, %s, %s, %s)",
+                job_rows)
+    counts["notices"], counts["events"], counts["job_updates"] = len(notice_rows), len(event_rows), len(job_rows)
+
+    # token_blocklist: rotated refresh tokens, 80% already expired (what the purge removes)
+    utc_now = datetime.utcnow().replace(microsecond=0)
+    token_rows = [
+        (uuid.uuid4().hex, utc_now - timedelta(minutes=random.randrange(1, 60 * 24 * 30)) if random.random() < 0.8
+         else utc_now + timedelta(minutes=random.randrange(1, 60 * 24 * 7)))
+        for _ in range(args.tokens)
+    ]
+    insert_many(cur, "INSERT INTO token_blocklist (jti, expires_at) VALUES (%s, %s)", token_rows)
+    counts["token_blocklist"] = len(token_rows)
+
+    cur.executemany("INSERT INTO collection_versions (name, version) VALUES (%s, 1) ON DUPLICATE KEY UPDATE version = version + 1",
+                    [(name,) for name in ("notices", "events", "job_updates", "schedules")])
+    return {"counts": counts, "login_ids": login_ids}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reset", action="store_true", help="Empty every table before seeding.")
+    parser.add_argument("--admins", type=int, default=5)
+    parser.add_argument("--teachers", type=int, default=200)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=3, help="History covered by notices/events/jobs/schedules.")
+    parser.add_argument("--slots-per-day", type=int, default=40)
+    parser.add_argument("--notices-per-day", type=int, default=3)
+    parser.add_argument("--tokens", type=int, default=200_000)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, so two runs produce the same data.")
+    parser.add_argument("--users-file", default=os.path.join(os.path.dirname(__file__), "bench_users.json"))
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    # One real hash shared by every account: logins still pay the full KDF cost
+    encoded = hash_password_sync(args.password, PASSWORD_HASH_ALGORITHM, current_params())
+
+    started = time.perf_counter()
+    sqlite = DB_ENGINE == "sqlite"
+    target = SQLITE_PATH if sqlite else f"{DB_NAME} on {DB_HOST}:{DB_PORT}"
+    if sqlite:
+        conn: Any = sqlite_connect(SQLITE_PATH)
+    else:
+        conn = pymysql.connect(host=DB_HOST, port=DB_PORT, user=DB_USER, password=DB_PASSWORD, database=DB_NAME,
+                               cursorclass=pymysql.cursors.DictCursor, autocommit=False)
+    try:
+        with conn.cursor() as cur:
+            if args.reset:
+                print(f"Emptying {target}")
+                if sqlite:
+                    # Children first: foreign keys stay enforced inside the transaction
+                    for table in TABLES:
+                        cur.execute(f"DELETE FROM {table}")
+                else:
+                    cur.execute("SET FOREIGN_KEY_CHECKS=0")
+                    for table in TABLES:
+                        cur.execute(f"TRUNCATE TABLE {table}")
+                    cur.execute("SET FOREIGN_KEY_CHECKS=1")
+            report = seed(cur, args, encoded)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    with open(args.users_file, "w", encoding="utf-8") as fh:
+        json.dump({"password": args.password, **report["login_ids"]}, fh)
+
+    print(f"Seeded {target} in {time.perf_counter() - started:.1f}s")
+    for table, count in report["counts"].items():
+        print(f"  {table:<18}{count:>10}")
+    print(f"Accounts written to {args.users_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,21 @@
 """
 
 from __future__ import annotations
-from typing import Dict, Optional, Tuple, Union, List, Any
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union, List, Any
 from os import getenv
+from functools import wraps
+import click
+import csv
+import hashlib
+import hmac
+import io
+import threading
+import time
 from datetime import timedelta, datetime
-from flask import Flask, jsonify, request, Response
+from flask import Flask, jsonify, request, Response, make_response, g, got_request_exception
 from flask_cors import CORS
 from dotenv import load_dotenv
+from werkzeug.test import EnvironBuilder
 from flask_jwt_extended import (
     JWTManager,
     create_access_token,
@@ -23,7 +32,7 @@ from flask_jwt_extended import (
     get_jwt_identity,
     get_jwt,
 )
-from src.utils import now_mysql
+from src.utils import now_mysql, encode_cursor, decode_cursor
 from src.db import (
     # programs
     get_all_programs,
@@ -36,13 +45,19 @@ from src.db import (
     delete_subject,
     # teachers
     get_all_teachers,
+    get_teachers_page,
     add_teacher,
+    add_teachers_bulk,
+    get_existing_teacher_emails,
     update_teacher,
     delete_teacher,
     # students
     get_all_students,
+    get_students_page,
     get_student_by_login,
     add_student,
+    add_students_bulk,
+    get_existing_student_emails,
     update_student,
     delete_student,
     # subject-teacher mapping
@@ -50,19 +65,30 @@ from src.db import (
     get_teachers_for_subject,
     # schedules
     get_all_schedules,
+    get_schedules_page,
+    get_schedule,
+    get_schedule_slots,
+    query_schedules,
     add_schedule,
     update_schedule,
+    ScheduleConflictError,
     delete_schedule,
     # notices/events/jobs
     get_all_notices,
+    get_notices_page,
+    get_notice,
     add_notice,
     update_notice,
     delete_notice,
     get_all_events,
+    get_events_page,
+    get_event,
     add_event,
     update_event,
     delete_event,
     get_all_jobs,
+    get_jobs_page,
+    get_job,
     add_job,
     update_job,
     delete_job,
@@ -70,13 +96,50 @@ from src.db import (
     get_user_by_login_id,
     verify_user,
     generate_login_id,
+    generate_login_ids,
     # token helpers (blocklist)
     add_token_to_blocklist,
     is_token_revoked,
+    get_active_revoked_tokens,
+    # change listeners
+    add_change_listener,
+    # dashboard
+    get_dashboard,
+    # collection versions (ETags)
+    get_collection_version,
+    # streaming exports
+    iter_collection,
+    get_collection_rows,
+    # request session
+    commit_request_session,
+    close_request_session,
+    checkpoint_request_session,
+    rollback_request_session,
+    # read replicas
+    replica_reads,
+    get_replica_set,
+    get_replica_stats,
+    DB_READ_YOUR_WRITES_SECONDS,
+    DB_POOL_MAX_SIZE,
+    # metrics
+    reference_cache,
+    dashboard_cache,
+    get_pool_stats,
 )
+from src.token_cache import RevokedTokenCache
+from src.maintenance import TokenPurger, run_token_purge
+from src.passwords import password_hasher, HasherBusyError
+from src.schedule_index import ScheduleIndex, parse_slot_time
+from src.search import SearchIndex
+from src.compression import Compressor, etag_variants
+from src.json_provider import FastJSONProvider
+from src.asgi import WSGIBridge, ASYNC_BODY_KEY
+from src.sse import ChangeFeed, Subscription, stream as sse_stream, stream_async as sse_stream_async
+from src.metrics import registry as metrics_registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
 
 # Application
 app: Flask = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app, supports_credentials=True, origins=[getenv("FRONTEND_ORIGIN", "http://localhost:3000")])
 
 # Configurations
@@ -97,17 +160,277 @@ app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(days=int(getenv("JWT_REFRESH
 
 jwt = JWTManager(app)
 
+# Revoked-token cache (TOKEN_CACHE_SYNC_SECONDS=0 disables it and always asks the DB)
+TOKEN_CACHE_SYNC_SECONDS: float = float(getenv("TOKEN_CACHE_SYNC_SECONDS", "30"))
+revoked_tokens: Optional[RevokedTokenCache] = None
+if TOKEN_CACHE_SYNC_SECONDS > 0:
+    revoked_tokens = RevokedTokenCache(
+        loader=get_active_revoked_tokens,
+        fallback=is_token_revoked,
+        sync_interval=TOKEN_CACHE_SYNC_SECONDS,
+        capacity=int(getenv("TOKEN_CACHE_CAPACITY", "100000")),
+    )
+    add_change_listener(
+        "token_blocklist",
+        lambda table, action, jti, row: revoked_tokens.add(jti, (row or {}).get("expires_at")),
+    )
+
+
+# Teacher / room double-booking index (rebuilt every SCHEDULE_INDEX_SYNC_SECONDS for other workers' writes)
+schedule_index = ScheduleIndex(
+    loader=get_schedule_slots,
+    fetch_one=get_schedule,
+    sync_interval=float(getenv("SCHEDULE_INDEX_SYNC_SECONDS", "60")),
+)
+add_change_listener("schedules", schedule_index.on_change)
+
+
+# Full-text search over notices / events / job updates (rebuilt every SEARCH_INDEX_SYNC_SECONDS)
+search_index = SearchIndex(
+    {
+        "notice": (
+            lambda: get_collection_rows("notices"), get_notice,
+            lambda r: (r["notice_id"], r.get("title") or "", r.get("content") or "",
+                       {"created_at": r.get("created_at"), "posted_by": r.get("posted_by")}),
+        ),
+        "event": (
+            lambda: get_collection_rows("events"), get_event,
+            lambda r: (r["event_id"], r.get("title") or "", r.get("content") or "",
+                       {"last_date": r.get("last_date"), "created_at": r.get("created_at"), "posted_by": r.get("posted_by")}),
+        ),
+        "job": (
+            lambda: get_collection_rows("jobs"), get_job,
+            lambda r: (r["job_id"], r.get("title") or "", f"{r.get('description') or ''} {r.get('company') or ''}",
+                       {"company": r.get("company"), "apply_link": r.get("apply_link"), "created_at": r.get("created_at")}),
+        ),
+    },
+    sync_interval=float(getenv("SEARCH_INDEX_SYNC_SECONDS", "300")),
+)
+add_change_listener("notices", search_index.listener("notice"))
+add_change_listener("events", search_index.listener("event"))
+add_change_listener("job_updates", search_index.listener("job"))
+
+
+# Live updates on GET /stream: every committed notice / event / job write, kept in a
+# ring buffer of SSE_BUFFER_SIZE events for Last-Event-ID resume
+live_feed = ChangeFeed(
+    capacity=int(getenv("SSE_BUFFER_SIZE", "1000")),
+    max_subscribers=int(getenv("SSE_MAX_SUBSCRIBERS", "100")),
+)
+add_change_listener("notices", live_feed.listener("notice", get_notice, app.json.dumps))
+add_change_listener("events", live_feed.listener("event", get_event, app.json.dumps))
+add_change_listener("job_updates", live_feed.listener("job", get_job, app.json.dumps))
+
+
+# Password KDF workers are forked now, before any background thread exists
+password_hasher.start()
+
+# Expired token_blocklist rows are purged in the background (0 disables; see also `flask purge-tokens`)
+TOKEN_PURGE_INTERVAL_SECONDS: float = float(getenv("TOKEN_PURGE_INTERVAL_SECONDS", "3600"))
+TOKEN_PURGE_BATCH_SIZE: int = int(getenv("TOKEN_PURGE_BATCH_SIZE", "1000"))
+token_purger: Optional[TokenPurger] = None
+_background_jobs_lock = threading.Lock()
+
+
+def start_background_jobs() -> None:
+    """
+    Start the token purger, once. Runs on the first request served rather than at
+    import, so CLI commands, scripts importing app and a gunicorn master that never
+    serves (with --preload) start no threads.
+    """
+    global token_purger
+    with _background_jobs_lock:
+        if token_purger is not None or TOKEN_PURGE_INTERVAL_SECONDS <= 0:
+            return
+        token_purger = TokenPurger(TOKEN_PURGE_INTERVAL_SECONDS, batch_size=TOKEN_PURGE_BATCH_SIZE)
+        token_purger.start()
+
+
+@app.before_request
+def ensure_background_jobs() -> None:
+    if token_purger is None and TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        start_background_jobs()
+
+
+@app.cli.command("purge-tokens")
+@click.option("--batch-size", default=TOKEN_PURGE_BATCH_SIZE, show_default=True, help="Rows deleted per transaction.")
+@click.option("--max-batches", default=None, type=int, help="Stop after this many batches.")
+def cli_purge_tokens(batch_size: int, max_batches: Optional[int]) -> None:
+    """Delete expired rows from token_blocklist and report rows purged and time taken."""
+    report = run_token_purge(batch_size=batch_size, max_batches=max_batches)
+    if not report["ok"]:
+        raise SystemExit(1)
+
 
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_headers, jwt_payload) -> bool:
     """
     Called by flask_jwt_extended to check if token is revoked.
-    We'll check the token's jti against DB.
+    Access tokens (every protected request) are answered by the in-process cache.
+    Refresh tokens, the ones /auth/refresh and /auth/logout actually revoke, are
+    always checked against the DB so a rotated token cannot be replayed on
+    another worker before its cache syncs.
     """
     jti = jwt_payload.get("jti")
     if not jti:
         return True
-    return is_token_revoked(jti)
+    if revoked_tokens is None or jwt_payload.get("type") == "refresh":
+        return is_token_revoked(jti)
+    return revoked_tokens.is_revoked(jti)
+
+
+# Prometheus metrics on GET /metrics (METRICS_TOKEN, when set, must be sent as "Authorization: Bearer <token>").
+# The timing hook is registered first so it runs after every other after_request hook.
+METRICS_ENABLED: bool = getenv("METRICS_ENABLED", "True").lower() in ("true", "1")
+METRICS_TOKEN: str = getenv("METRICS_TOKEN", "")
+HTTP_REQUEST_SECONDS = metrics_registry.histogram(
+    "http_request_duration_seconds", "Requests by Flask endpoint, method and status (_count is the request count).",
+    ("endpoint", "method", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge("http_requests_in_flight", "Requests currently being handled.")
+
+
+def _cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {"reference": reference_cache.stats(), "dashboard": dashboard_cache.stats(), "compressed": compressor.cache.stats()}
+
+
+def _pool_stats() -> Dict[str, int]:
+    return get_pool_stats() or {}
+
+
+metrics_registry.callback("cache_hits_total", "Cache lookups answered from the cache.", "counter",
+                          lambda: {(name,): s["hits"] for name, s in _cache_stats().items()}, ("cache",))
+metrics_registry.callback("cache_misses_total", "Cache lookups that had to load or compute.", "counter",
+                          lambda: {(name,): s["misses"] for name, s in _cache_stats().items()}, ("cache",))
+metrics_registry.callback("cache_hit_ratio", "hits / (hits + misses) since start.", "gauge",
+                          lambda: {(name,): s["hit_ratio"] for name, s in _cache_stats().items()}, ("cache",))
+metrics_registry.callback("db_pool_connections", "Open pool connections by state.", "gauge",
+                          lambda: {(state,): n for state, n in _pool_stats().items() if state in ("idle", "in_use")}, ("state",))
+metrics_registry.callback("db_pool_waiting", "Threads waiting for a pool connection.", "gauge",
+                          lambda: {(): n for state, n in _pool_stats().items() if state == "waiting"})
+metrics_registry.callback("process_threads", "Live threads in this process.", "gauge",
+                          lambda: {(): threading.active_count()})
+metrics_registry.callback("sse_subscribers", "Clients connected to /stream.", "gauge",
+                          lambda: {(): live_feed.stats()["subscribers"]})
+metrics_registry.callback("db_replica_healthy", "1 while a read replica is in rotation.", "gauge",
+                          lambda: {(r["name"],): int(r["healthy"]) for r in get_replica_stats() or []}, ("replica",))
+
+
+@app.before_request
+def start_request_timer() -> None:
+    if not METRICS_ENABLED:
+        return
+    request.environ["metrics.started"] = time.perf_counter()
+    # A /batch sub-request is already counted through its enclosing request
+    if not g.get("batch_subrequest"):
+        request.environ["metrics.in_flight"] = True
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+
+
+def observe_request(response: Response) -> None:
+    """Record one finished request; unmatched paths share one series so 404 scans can't blow up cardinality."""
+    started = request.environ.get("metrics.started")
+    if started is None:
+        return
+    endpoint = request.endpoint or "unmatched"
+    HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, request.method, str(response.status_code))
+
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    observe_request(response)
+    return response
+
+
+@app.teardown_request
+def finish_request_timer(exc: Optional[BaseException]) -> None:
+    if request.environ.pop("metrics.in_flight", False):
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+
+
+# gzip / brotli negotiation (registered before the commit hook so it runs after it)
+COMPRESS_RESPONSES: bool = getenv("COMPRESS_RESPONSES", "True").lower() in ("true", "1")
+compressor = Compressor(
+    min_bytes=int(getenv("COMPRESS_MIN_BYTES", "1024")),
+    gzip_level=int(getenv("COMPRESS_GZIP_LEVEL", "6")),
+    brotli_quality=int(getenv("COMPRESS_BROTLI_QUALITY", "5")),
+    cache_bytes=int(getenv("COMPRESS_CACHE_BYTES", str(32 * 1024 * 1024))),
+)
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Compress eligible bodies for clients that accept it (see src/compression.py)."""
+    if not COMPRESS_RESPONSES:
+        return response
+    return compressor(response, request.accept_encodings)
+
+
+# Read-your-writes: after a client writes, its reads stay on the primary for
+# DB_READ_YOUR_WRITES_SECONDS (replica lag window), tracked in a short-lived cookie
+READ_PRIMARY_COOKIE = "db_read_primary"
+
+
+@app.before_request
+def route_reads_to_primary() -> None:
+    if request.cookies.get(READ_PRIMARY_COOKIE):
+        g.db_read_primary = True
+
+
+@app.after_request
+def mark_recent_write(response: Response) -> Response:
+    """Runs after commit_db_session: only a write that committed opens the window."""
+    if g.get("db_wrote") and response.status_code < 400 and get_replica_set() is not None and DB_READ_YOUR_WRITES_SECONDS > 0:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=max(1, int(DB_READ_YOUR_WRITES_SECONDS)),
+            secure=app.config["JWT_COOKIE_SECURE"],
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def flag_failed_request(sender: Flask, exception: BaseException, **extra: Any) -> None:
+    """got_request_exception: the view raised, so its partial writes must not be committed."""
+    g.db_request_failed = True
+
+
+got_request_exception.connect(flag_failed_request, app)
+
+
+@app.after_request
+def commit_db_session(response: Response) -> Response:
+    """
+    Commit the request's DB transaction (see db.RequestSession) before the response
+    goes out, so a failed commit is reported instead of a success that never landed.
+    Without PROPAGATE_EXCEPTIONS Flask runs this hook even after an unhandled error
+    (the 500 response); the transaction is rolled back then, as in debug mode.
+    """
+    if g.get("db_request_failed"):
+        rollback_request_session()
+        return response
+    if not commit_request_session():
+        return make_response(jsonify({"error": "Database commit failed"}), 500)
+    return response
+
+
+@app.teardown_request
+def release_db_session(exc: Optional[BaseException]) -> None:
+    """Return the request's connection; an uncommitted transaction (unhandled error) is rolled back."""
+    # /batch sub-requests share g, and so the session, with the enclosing request
+    if g.get("batch_subrequest"):
+        return
+    close_request_session()
+
+
+@app.errorhandler(HasherBusyError)
+def hasher_busy(exc: HasherBusyError) -> Tuple[Response, int]:
+    """The password-hashing queue stayed full (login storm or bulk import): shed load with a 503."""
+    resp = jsonify({"error": "Too many password operations in progress, try again shortly"})
+    resp.headers["Retry-After"] = "2"
+    return resp, 503
 
 
 # Variables
@@ -118,6 +441,38 @@ DEV_ENV: bool = str(app.config.get("DEV_ENV", "False")).lower() == "true"
 # Route return type
 FlaskReturn = Union[Response, Tuple[Response, int]]
 
+# Keyset pagination limits for list routes
+PAGE_DEFAULT_LIMIT: int = int(getenv("PAGE_DEFAULT_LIMIT", "50"))
+PAGE_MAX_LIMIT: int = int(getenv("PAGE_MAX_LIMIT", "500"))
+
+# Rows serialised per chunk when a list route streams (?stream=json|ndjson)
+STREAM_CHUNK_ROWS: int = int(getenv("STREAM_CHUNK_ROWS", "200"))
+
+# Upper bound on rows accepted by one bulk registration request. Every row is hashed
+# (~0.2-0.5 s per hash at the default PBKDF2 cost), at most PASSWORD_HASH_BULK_SLOTS at
+# a time, so expect rows x hash time / workers: 500 rows on 4 workers is ~30-60 s
+BULK_REGISTER_MAX_ROWS: int = int(getenv("BULK_REGISTER_MAX_ROWS", "500"))
+
+# /batch: max sub-requests per call, and the caller headers each sub-request inherits
+BATCH_MAX_REQUESTS: int = int(getenv("BATCH_MAX_REQUESTS", "50"))
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+BATCH_FORWARD_HEADERS = ("Cookie", "Authorization", "X-CSRF-TOKEN", "Accept", "Accept-Language", "User-Agent")
+
+# Items per section on /dashboard
+DASHBOARD_NOTICES: int = int(getenv("DASHBOARD_NOTICES", "5"))
+DASHBOARD_EVENTS: int = int(getenv("DASHBOARD_EVENTS", "5"))
+DASHBOARD_JOBS: int = int(getenv("DASHBOARD_JOBS", "5"))
+
+# Upper bound on slots checked by one /schedules/validate call
+SCHEDULE_VALIDATE_MAX_ROWS: int = int(getenv("SCHEDULE_VALIDATE_MAX_ROWS", "2000"))
+
+# /stream: keep-alive comment interval, connection lifetime (clients resume with
+# Last-Event-ID), and the reconnect delay suggested to EventSource
+SSE_HEARTBEAT_SECONDS: float = float(getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_SECONDS: float = float(getenv("SSE_MAX_SECONDS", "300"))
+SSE_RETRY_MS: int = int(getenv("SSE_RETRY_MS", "3000"))
+SSE_EVENTS = ("notice", "event", "job")
+
 
 # -------------------------
 # Helper: derive role from login_id prefix
@@ -136,6 +491,132 @@ def role_from_login(login_id: str) -> str:
     return "unknown"
 
 
+# -------------------------
+# Helper: keyset pagination (?limit=&after=)
+# -------------------------
+def page_args(key_types: Tuple[type, ...]) -> Optional[Tuple[int, Optional[Tuple[Any, ...]]]]:
+    """
+    Parse ?limit= and ?after= for list routes.
+    Returns None when neither is given (the route keeps its full-list response),
+    else (limit, after) where after is the decoded sort key typed by key_types.
+    Raises ValueError on bad input.
+    """
+    if "limit" not in request.args and "after" not in request.args:
+        return None
+
+    limit_raw = request.args.get("limit")
+    try:
+        limit = int(limit_raw) if limit_raw else PAGE_DEFAULT_LIMIT
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, PAGE_MAX_LIMIT)
+
+    after_raw = request.args.get("after")
+    if not after_raw:
+        return limit, None
+    values = decode_cursor(after_raw)
+    if len(values) != len(key_types):
+        raise ValueError("Invalid cursor")
+    try:
+        after = tuple(t(v) for t, v in zip(key_types, values))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return limit, after
+
+
+def page_response(rows: List[Dict[str, Any]], limit: int, key_fields: Tuple[str, ...]) -> Response:
+    """
+    Build { items, next_cursor } from rows fetched with limit + 1.
+    next_cursor is null on the last page.
+    """
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(*(items[-1][f] for f in key_fields))
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+# -------------------------
+# Helper: streaming exports (?stream=json|ndjson)
+# -------------------------
+def stream_collection(name: str) -> FlaskReturn:
+    """
+    Stream a whole collection while it is read from an unbuffered cursor.
+    ?stream=json sends one JSON array, ?stream=ndjson one object per line.
+    Peak memory is one chunk of STREAM_CHUNK_ROWS rows regardless of table size.
+    A database error mid-stream aborts the response (the chunked body is never
+    terminated), so clients cannot mistake a truncated export for a complete one.
+    """
+    fmt = request.args.get("stream")
+    if fmt not in ("json", "ndjson"):
+        return jsonify({"error": "stream must be 'json' or 'ndjson'"}), 400
+    dumps = app.json.dumps
+
+    def chunks() -> Iterator[List[str]]:
+        buf: List[str] = []
+        for row in iter_collection(name):
+            buf.append(dumps(row))
+            if len(buf) >= STREAM_CHUNK_ROWS:
+                yield buf
+                buf = []
+        if buf:
+            yield buf
+
+    def generate_ndjson() -> Iterator[str]:
+        for buf in chunks():
+            yield "\n".join(buf) + "\n"
+
+    def generate_json() -> Iterator[str]:
+        sep = "["
+        for buf in chunks():
+            yield sep + ",".join(buf)
+            sep = ","
+        yield "[]" if sep == "[" else "]"
+
+    if fmt == "ndjson":
+        return Response(generate_ndjson(), mimetype="application/x-ndjson"), 200
+    return Response(generate_json(), mimetype="application/json"), 200
+
+# -------------------------
+# Helper: conditional GET (ETag / If-None-Match)
+# -------------------------
+def conditional_get(collection: str) -> Callable[[Callable[..., FlaskReturn]], Callable[..., FlaskReturn]]:
+    """
+    Decorator for public list routes backed by a versioned collection (see
+    db.VERSIONED_COLLECTIONS). The strong ETag combines the collection version with
+    the query string, so a matching If-None-Match gets a 304 before any rows are read.
+    The version is read before the rows: a write landing in between only makes the
+    tag older than the body, which the next request corrects.
+    """
+    def decorator(view: Callable[..., FlaskReturn]) -> Callable[..., FlaskReturn]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> FlaskReturn:
+            version = get_collection_version(collection)
+            if version is None:
+                return view(*args, **kwargs)
+
+            query_hash = hashlib.sha1(request.query_string).hexdigest()[:12]
+            etag = f"{collection}-{version}-{query_hash}"
+            # The client may hold a compressed representation (see compress_response)
+            matched = next((tag for tag in etag_variants(etag) if request.if_none_match.contains(tag)), None)
+            if matched is not None:
+                resp = Response(status=304)
+                resp.set_etag(matched)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+                resp.set_etag(etag)
+            resp.headers["Cache-Control"] = "no-cache"
+            return resp
+
+        return wrapper
+
+    return decorator
+
+
 # -------------------------
 # AUTH: login / refresh / logout / me
 # -------------------------
@@ -153,6 +634,7 @@ def route_login() -> FlaskReturn:
     if not login_id or not password:
         return jsonify({"error": "login_id and password are required"}), 400
 
+    # A saturated hasher raises HasherBusyError (503, see hasher_busy)
     user = verify_user(login_id, password)
     if not user:
         return jsonify({"error": "Invalid login_id or password"}), 401
@@ -245,7 +727,8 @@ def route_me() -> FlaskReturn:
     if not identity:
         return jsonify({"error": "Not authenticated"}), 401
 
-    user_row = get_user_by_login_id(identity)
+    with replica_reads():
+        user_row = get_user_by_login_id(identity)
     if not user_row:
         return jsonify({"error": "User not found"}), 404
 
@@ -377,7 +860,21 @@ def route_delete_subject(subject_id: int) -> FlaskReturn:
 # -------------------------
 @app.get("/teachers/all")
 def route_get_teachers() -> FlaskReturn:
-    """Return all teachers."""
+    """
+    Return all teachers.
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("teachers")
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_teachers_page(limit, after[0] if after else None), limit, ("teacher_id",)), 200
+
     rows: List[Dict[str, Any]] = get_all_teachers()
     return jsonify(rows), 200
 
@@ -452,7 +949,21 @@ def route_delete_teacher(teacher_id: int) -> FlaskReturn:
 # -------------------------
 @app.get("/students/all")
 def route_get_students() -> FlaskReturn:
-    """Return all students."""
+    """
+    Return all students.
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("students")
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_students_page(limit, after[0] if after else None), limit, ("student_id",)), 200
+
     rows: List[Dict[str, Any]] = get_all_students()
     return jsonify(rows), 200
 
@@ -580,22 +1091,113 @@ def route_get_teachers_for_subject(subject_id: int) -> FlaskReturn:
     return jsonify(rows), 200
 
 
+# -------------------------
+# Helper: schedule conflicts
+# -------------------------
+def schedule_slot_error(
+    teacher_id: Optional[int],
+    location: Optional[str],
+    start_time: Any,
+    end_time: Any,
+    exclude_id: Optional[int] = None,
+) -> Optional[FlaskReturn]:
+    """
+    Validate a slot and check it against the schedule index. Returns the error
+    response to send (400 bad times, 409 double-booking), or None if the slot looks free.
+    This is only the fast path: add_schedule / update_schedule re-check under a lock and
+    raise ScheduleConflictError, so an unavailable or stale index does not let a clash through.
+    """
+    try:
+        start = parse_slot_time(start_time)
+        end = parse_slot_time(end_time)
+    except ValueError:
+        return jsonify({"error": "start_time and end_time must be 'YYYY-MM-DD HH:MM:SS' datetimes"}), 400
+    if end <= start:
+        return jsonify({"error": "end_time must be after start_time"}), 400
+
+    conflicts = schedule_index.conflicts(teacher_id, location, start, end, exclude_id=exclude_id)
+    if conflicts:
+        return jsonify({"error": "Schedule conflict", "conflicts": conflicts}), 409
+    return None
+
+
 # -------------------------
 # SCHEDULE ROUTES
 # -------------------------
 @app.get("/schedules/all")
+@conditional_get("schedules")
 def route_get_schedules() -> FlaskReturn:
-    """Return all schedules (public)."""
+    """
+    Return all schedules (public).
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("schedules")
+
+    try:
+        page = page_args((str, int))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_schedules_page(limit, (after[0], after[1]) if after else None), limit, ("start_time", "schedule_id")), 200
+
     rows: List[Dict[str, Any]] = get_all_schedules()
     return jsonify(rows), 200
 
 
+@app.get("/schedules")
+@conditional_get("schedules")
+def route_query_schedules() -> FlaskReturn:
+    """
+    Filtered timetable (public), ordered by start_time.
+    Query: from, to (datetimes; a bare YYYY-MM-DD 'to' includes that whole day),
+    teacher_id, subject_id, program_id, semester, location.
+    Matches schedules that start in [from, to). ?limit= / ?after= page the result.
+    """
+    args = request.args
+    try:
+        date_from = parse_slot_time(args["from"]) if args.get("from") else None
+        date_to = parse_slot_time(args["to"]) if args.get("to") else None
+    except ValueError:
+        return jsonify({"error": "from and to must be 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS'"}), 400
+    if date_to is not None and len(args["to"].strip()) == 10:
+        date_to += timedelta(days=1)
+
+    int_filters: Dict[str, Optional[int]] = {}
+    for name in ("teacher_id", "subject_id", "program_id", "semester"):
+        raw = args.get(name)
+        try:
+            int_filters[name] = int(raw) if raw else None
+        except ValueError:
+            return jsonify({"error": f"{name} must be an integer"}), 400
+
+    try:
+        page = page_args((str, int))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    limit, after = page if page is not None else (None, None)
+
+    rows = query_schedules(
+        date_from=date_from.strftime("%Y-%m-%d %H:%M:%S") if date_from else None,
+        date_to=date_to.strftime("%Y-%m-%d %H:%M:%S") if date_to else None,
+        location=args.get("location") or None,
+        limit=limit,
+        after=(after[0], after[1]) if after else None,
+        **int_filters,
+    )
+    if limit is not None:
+        return page_response(rows, limit, ("start_time", "schedule_id")), 200
+    return jsonify(rows), 200
+
+
 @app.post("/schedule/add")
 @jwt_required()
 def route_add_schedule() -> FlaskReturn:
     """
     Add schedule entry.
     Expects JSON: { subject_id, teacher_id?, title?, location?, start_time, end_time }
+    Returns 409 with the clashing slots if the teacher or the location is already booked.
     Protected: teacher/admin
     """
     claims = get_jwt()
@@ -619,7 +1221,14 @@ def route_add_schedule() -> FlaskReturn:
     except (ValueError, TypeError):
         return jsonify({"error": "subject_id and teacher_id must be integers"}), 400
 
-    inserted_id: int = add_schedule(subject_id_i, teacher_id_i, title or "", location or "", start_time, end_time)
+    slot_error = schedule_slot_error(teacher_id_i, location, start_time, end_time)
+    if slot_error is not None:
+        return slot_error
+
+    try:
+        inserted_id: int = add_schedule(subject_id_i, teacher_id_i, title or "", location or "", start_time, end_time)
+    except ScheduleConflictError as exc:
+        return jsonify({"error": "Schedule conflict", "conflicts": exc.conflicts}), 409
     if inserted_id == -1:
         return jsonify({"error": "Failed to add schedule"}), 500
 
@@ -632,6 +1241,7 @@ def route_update_schedule(schedule_id: int) -> FlaskReturn:
     """
     Update schedule entry.
     Expects JSON: { subject_id?, teacher_id?, title?, location?, start_time?, end_time? }
+    Returns 409 if the resulting slot double-books the teacher or the location.
     Protected: teacher/admin
     """
     claims = get_jwt()
@@ -652,10 +1262,95 @@ def route_update_schedule(schedule_id: int) -> FlaskReturn:
     except (ValueError, TypeError):
         return jsonify({"error": "subject_id and teacher_id must be integers"}), 400
 
-    affected: int = update_schedule(schedule_id, subject_id_i, teacher_id_i, title, location, start_time, end_time)
+    current = schedule_index.get(schedule_id)
+    if current is not None and any(v is not None for v in (teacher_id_i, location, start_time, end_time)):
+        # Fields left out keep their stored value (the UPDATE uses COALESCE)
+        slot_error = schedule_slot_error(
+            teacher_id_i if teacher_id_i is not None else current["teacher_id"],
+            location if location is not None else current["location"],
+            start_time if start_time is not None else current["start"],
+            end_time if end_time is not None else current["end"],
+            exclude_id=schedule_id,
+        )
+        if slot_error is not None:
+            return slot_error
+
+    try:
+        affected: int = update_schedule(schedule_id, subject_id_i, teacher_id_i, title, location, start_time, end_time)
+    except ScheduleConflictError as exc:
+        return jsonify({"error": "Schedule conflict", "conflicts": exc.conflicts}), 409
     return jsonify({"message": "Schedule updated", "affected_rows": affected}), 200
 
 
+@app.post("/schedules/validate")
+@jwt_required()
+def route_validate_schedules() -> FlaskReturn:
+    """
+    Check a proposed timetable (e.g. a whole week) for double-booking in one call,
+    against the stored schedules and between the proposed slots themselves.
+    Body: JSON array (or { schedules: [...] }) of { teacher_id?, location?, start_time,
+    end_time, schedule_id? }, or CSV with those headers. schedule_id marks a slot that
+    moves an existing schedule. Nothing is written.
+    Returns { ok, checked, conflicts: [...], errors: [...] }; entries carry the slot's index.
+    Protected: teacher/admin
+    """
+    claims = get_jwt()
+    if claims.get("role") not in ("admin", "teacher"):
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        raw_rows = bulk_rows_from_request("schedules")
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if len(raw_rows) > SCHEDULE_VALIDATE_MAX_ROWS:
+        return jsonify({"error": f"At most {SCHEDULE_VALIDATE_MAX_ROWS} slots per request"}), 413
+
+    proposals: List[Dict[str, Any]] = []
+    positions: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    for i, raw in enumerate(raw_rows):
+        if not isinstance(raw, dict):
+            errors.append({"index": i, "error": "Expected an object"})
+            continue
+        try:
+            teacher_raw, schedule_raw = raw.get("teacher_id"), raw.get("schedule_id")
+            teacher_id = int(teacher_raw) if teacher_raw not in (None, "") else None
+            schedule_id = int(schedule_raw) if schedule_raw not in (None, "") else None
+        except (ValueError, TypeError):
+            errors.append({"index": i, "error": "teacher_id and schedule_id must be integers"})
+            continue
+        try:
+            start = parse_slot_time(raw.get("start_time"))
+            end = parse_slot_time(raw.get("end_time"))
+        except ValueError:
+            errors.append({"index": i, "error": "start_time and end_time must be 'YYYY-MM-DD HH:MM:SS' datetimes"})
+            continue
+        if end <= start:
+            errors.append({"index": i, "error": "end_time must be after start_time"})
+            continue
+        proposals.append({"teacher_id": teacher_id, "location": raw.get("location"), "start": start, "end": end, "schedule_id": schedule_id})
+        positions.append(i)
+
+    found = schedule_index.validate(proposals)
+    if found is None:
+        return jsonify({"error": "Schedule index unavailable"}), 503
+
+    # Map indexes within `proposals` back to positions in the request body
+    conflicts = []
+    for c in found:
+        c["index"] = positions[c["index"]]
+        if "with_index" in c:
+            c["with_index"] = positions[c["with_index"]]
+        conflicts.append(c)
+
+    return jsonify({
+        "ok": not conflicts and not errors,
+        "checked": len(raw_rows),
+        "conflicts": conflicts,
+        "errors": errors,
+    }), 200
+
+
 @app.delete("/schedule/delete/<int:schedule_id>")
 @jwt_required()
 def route_delete_schedule(schedule_id: int) -> FlaskReturn:
@@ -701,8 +1396,23 @@ def route_add_notice() -> FlaskReturn:
 
 
 @app.get("/notice/all")
+@conditional_get("notices")
 def route_get_notices() -> FlaskReturn:
-    """Get all notices (public)."""
+    """
+    Return all notices (public).
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("notices")
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_notices_page(limit, after[0] if after else None), limit, ("notice_id",)), 200
+
     rows: List[Dict[str, Any]] = get_all_notices()
     return jsonify(rows), 200
 
@@ -774,7 +1484,23 @@ def route_add_event() -> FlaskReturn:
 
 
 @app.get("/event/all")
+@conditional_get("events")
 def route_get_events() -> FlaskReturn:
+    """
+    Return all events (public).
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("events")
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_events_page(limit, after[0] if after else None), limit, ("event_id",)), 200
+
     rows: List[Dict[str, Any]] = get_all_events()
     return jsonify(rows), 200
 
@@ -841,7 +1567,23 @@ def route_add_job() -> FlaskReturn:
 
 
 @app.get("/job/all")
+@conditional_get("job_updates")
 def route_get_jobs() -> FlaskReturn:
+    """
+    Return all jobs (public).
+    ?limit= / ?after= return one keyset page; ?stream=json|ndjson streams the full list.
+    """
+    if request.args.get("stream"):
+        return stream_collection("jobs")
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if page is not None:
+        limit, after = page
+        return page_response(get_jobs_page(limit, after[0] if after else None), limit, ("job_id",)), 200
+
     rows: List[Dict[str, Any]] = get_all_jobs()
     return jsonify(rows), 200
 
@@ -877,6 +1619,98 @@ def route_delete_job(job_id: int) -> FlaskReturn:
     return jsonify({"message": "Job deleted", "affected_rows": affected}), 200
 
 
+# -------------------------
+# DASHBOARD
+# -------------------------
+@app.get("/dashboard")
+def route_dashboard() -> FlaskReturn:
+    """
+    Landing page data in one response (public): recent notices, upcoming events,
+    latest jobs, programs and counts. Served from a short-lived cache that writes
+    to the underlying tables invalidate.
+    """
+    data = get_dashboard(DASHBOARD_NOTICES, DASHBOARD_EVENTS, DASHBOARD_JOBS)
+    if data is None:
+        return jsonify({"error": "Failed to load dashboard"}), 500
+    return jsonify(data), 200
+
+
+# -------------------------
+# SEARCH
+# -------------------------
+@app.get("/search")
+def route_search() -> FlaskReturn:
+    """
+    Full-text search over notices, events and job updates (public), ranked by BM25.
+    Query: q, type (comma-separated subset of notice,event,job), limit, after.
+    Returns { items: [{ type, id, score, title, snippet, ... }], next_cursor, total, took_ms }.
+    """
+    started = time.perf_counter()
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+
+    kinds = None
+    if request.args.get("type"):
+        kinds = [k.strip() for k in request.args["type"].split(",") if k.strip()]
+        unknown = [k for k in kinds if k not in search_index.kinds]
+        if unknown:
+            return jsonify({"error": f"type must be one of {', '.join(search_index.kinds)}"}), 400
+
+    try:
+        page = page_args((int,))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    limit, after = page if page is not None else (PAGE_DEFAULT_LIMIT, None)
+    offset = max(0, after[0]) if after else 0
+
+    result = search_index.search(query, kinds, offset=offset, limit=limit)
+    if result is None:
+        return jsonify({"error": "Search index unavailable"}), 503
+    total, hits = result
+
+    next_cursor = encode_cursor(offset + limit) if offset + limit < total else None
+    return jsonify({
+        "items": hits,
+        "next_cursor": next_cursor,
+        "total": total,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    }), 200
+
+
+# -------------------------
+# LIVE UPDATES (Server-Sent Events)
+# -------------------------
+@app.get("/stream")
+def route_stream() -> FlaskReturn:
+    """
+    Push notice / event / job changes as they are committed (public), instead of
+    polling the list routes. Query: types (comma-separated subset of notice,event,job).
+    Each SSE event is named after its type with data { action, id, item }; item is the
+    row as /notice/<id> etc. return it, null on delete. A reconnect sending Last-Event-ID
+    (or ?last_event_id=) gets what it missed; "reset" means that is no longer possible
+    and the lists should be fetched again once.
+    """
+    events = set(SSE_EVENTS)
+    if request.args.get("types"):
+        events = {t.strip() for t in request.args["types"].split(",") if t.strip()}
+        if not events <= set(SSE_EVENTS):
+            return jsonify({"error": f"types must be a subset of {','.join(SSE_EVENTS)}"}), 400
+    if live_feed.full():
+        resp = jsonify({"error": "Too many live subscribers, retry later"})
+        resp.headers["Retry-After"] = str(max(1, SSE_RETRY_MS // 1000))
+        return resp, 503
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    sub = Subscription(live_feed, last_event_id, events, SSE_RETRY_MS)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if ASYNC_BODY_KEY in request.environ:
+        # Served by the ASGI bridge: the stream waits on the event loop, not on a thread
+        request.environ[ASYNC_BODY_KEY] = sse_stream_async(sub, SSE_HEARTBEAT_SECONDS, SSE_MAX_SECONDS)
+        return Response("", mimetype="text/event-stream", headers=headers), 200
+    return Response(sse_stream(sub, SSE_HEARTBEAT_SECONDS, SSE_MAX_SECONDS), mimetype="text/event-stream", headers=headers), 200
+
+
 # -------------------------
 # AUTH: Register helpers (optional convenience routes)
 # -------------------------
@@ -950,6 +1784,297 @@ def route_register_teacher() -> FlaskReturn:
     return jsonify({"message": "Teacher registered", "teacher_id": inserted_id, "login_id": login_id}), 201
 
 
+# -------------------------
+# AUTH: Bulk registration (JSON array or CSV)
+# -------------------------
+def csv_rows(text: str) -> List[Dict[str, Any]]:
+    """Parse CSV text with a header row into dicts; blank cells become None."""
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {(k or "").strip(): (v.strip() or None) if isinstance(v, str) else None for k, v in row.items()}
+        for row in reader
+    ]
+
+
+def bulk_rows_from_request(list_key: str) -> List[Any]:
+    """
+    Read the rows of a bulk import from the request. Accepts a JSON array,
+    { <list_key>: [...] }, a text/csv body, or a CSV file in form field "file".
+    Raises ValueError when the payload cannot be read.
+    """
+    upload = request.files.get("file")
+    try:
+        if upload is not None:
+            return csv_rows(upload.read().decode("utf-8-sig"))
+        if request.mimetype in ("text/csv", "application/csv"):
+            return csv_rows(request.get_data(as_text=True))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ValueError(f"Could not read CSV: {exc}")
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(list_key)
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a JSON array, {{ \"{list_key}\": [...] }} or a CSV upload")
+    return data
+
+
+def bulk_register(
+    list_key: str,
+    prefix: str,
+    id_field: str,
+    optional_fields: Tuple[str, ...],
+    int_fields: Tuple[str, ...],
+    existing_emails: Callable[[List[str]], Optional[List[str]]],
+    insert_rows: Callable[[List[Dict[str, Any]]], Optional[Dict[str, int]]],
+) -> FlaskReturn:
+    """
+    Shared body of the bulk registration routes: validate every row, drop emails
+    that already exist, allocate all login ids at once and insert the rest in one
+    transaction. Responds with a per-row result list (row numbers are 1-based).
+    """
+    try:
+        rows = bulk_rows_from_request(list_key)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not rows:
+        return jsonify({"error": "No rows to register"}), 400
+    if len(rows) > BULK_REGISTER_MAX_ROWS:
+        return jsonify({"error": f"At most {BULK_REGISTER_MAX_ROWS} rows per request"}), 413
+
+    results: List[Dict[str, Any]] = [{"row": i, "status": "pending"} for i in range(1, len(rows) + 1)]
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    seen_emails: Dict[str, int] = {}
+
+    for index, raw in enumerate(rows):
+        if not isinstance(raw, dict):
+            results[index].update(status="error", error="Row must be an object")
+            continue
+        name = raw.get("name")
+        email = raw.get("email")
+        password = raw.get("password")
+        if not name or not email or not password:
+            results[index].update(status="error", error="Missing required fields")
+            continue
+        email_key = str(email).strip().lower()
+        if email_key in seen_emails:
+            results[index].update(status="error", error=f"Duplicate email (same as row {seen_emails[email_key]})")
+            continue
+
+        record: Dict[str, Any] = {"name": name, "email": email, "password": password}
+        try:
+            for field in optional_fields:
+                value = raw.get(field)
+                record[field] = int(value) if field in int_fields and value is not None else value
+        except (ValueError, TypeError):
+            results[index].update(status="error", error=f"{' and '.join(int_fields)} must be integers")
+            continue
+
+        seen_emails[email_key] = index + 1
+        valid.append((index, record))
+
+    existing = existing_emails([r["email"] for _, r in valid])
+    if existing is None:
+        return jsonify({"error": "Failed to check existing emails"}), 500
+    taken = {e.lower() for e in existing}
+    to_insert: List[Tuple[int, Dict[str, Any]]] = []
+    for index, record in valid:
+        if str(record["email"]).strip().lower() in taken:
+            results[index].update(status="error", error="Email already registered")
+        else:
+            to_insert.append((index, record))
+
+    if to_insert:
+        login_ids = generate_login_ids(prefix, len(to_insert))
+        if not login_ids:
+            return jsonify({"error": "Failed to generate login ids"}), 500
+        for (_, record), login_id in zip(to_insert, login_ids):
+            record["login_id"] = login_id
+
+        inserted = insert_rows([record for _, record in to_insert])
+        if inserted is None:
+            return jsonify({"error": "Bulk insert failed, no rows were registered"}), 500
+        for index, record in to_insert:
+            results[index].update(status="created", login_id=record["login_id"], **{id_field: inserted.get(record["login_id"])})
+
+    created = sum(1 for r in results if r["status"] == "created")
+    return jsonify({
+        "message": f"{created} of {len(rows)} registered",
+        "created": created,
+        "failed": len(rows) - created,
+        "results": results,
+    }), (201 if created else 400)
+
+
+@app.post("/auth/register/students/bulk")
+@jwt_required()
+def route_register_students_bulk() -> FlaskReturn:
+    """
+    Admin-only bulk student registration with auto-generated login_ids.
+    Body: JSON array (or { students: [...] }) of { name, email, password, roll_no?, semester?, program_id? },
+    or CSV with those column headers (text/csv body or multipart field "file").
+    """
+    claims = get_jwt()
+    if claims.get("role") != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+
+    return bulk_register(
+        "students", "83", "student_id",
+        ("roll_no", "semester", "program_id"), ("semester", "program_id"),
+        get_existing_student_emails, add_students_bulk,
+    )
+
+
+@app.post("/auth/register/teachers/bulk")
+@jwt_required()
+def route_register_teachers_bulk() -> FlaskReturn:
+    """
+    Admin-only bulk teacher registration with auto-generated login_ids.
+    Body: JSON array (or { teachers: [...] }) of { name, email, password, subject? },
+    or CSV with those column headers (text/csv body or multipart field "file").
+    """
+    claims = get_jwt()
+    if claims.get("role") != "admin":
+        return jsonify({"error": "Forbidden"}), 403
+
+    return bulk_register(
+        "teachers", "70", "teacher_id",
+        ("subject",), (),
+        get_existing_teacher_emails, add_teachers_bulk,
+    )
+
+
+# -------------------------
+# BATCH (several API calls in one round-trip)
+# -------------------------
+def run_subrequest(item: Any) -> Dict[str, Any]:
+    """
+    Dispatch one /batch entry to its route in-process and return { status, body }.
+    The sub-request carries the caller's auth cookie and CSRF header, so each route's
+    own jwt_required and role checks apply exactly as for a standalone call. Only
+    before_request hooks run; after_request hooks (commit, CORS) belong to /batch itself,
+    so the sub-request's metrics are recorded here.
+    """
+    if not isinstance(item, dict):
+        return {"status": 400, "body": {"error": "Expected an object"}}
+    method = str(item.get("method") or "GET").upper()
+    path = item.get("path")
+    if method not in BATCH_METHODS or not isinstance(path, str) or not path.startswith("/"):
+        return {"status": 400, "body": {"error": f"method must be one of {', '.join(BATCH_METHODS)} and path must start with /"}}
+    if path.split("?", 1)[0].rstrip("/") == "/batch":
+        return {"status": 400, "body": {"error": "/batch cannot be nested"}}
+    if path.split("?", 1)[0].rstrip("/") == "/stream":
+        return {"status": 400, "body": {"error": "/stream cannot be batched"}}
+
+    headers = {name: request.headers[name] for name in BATCH_FORWARD_HEADERS if name in request.headers}
+    if isinstance(item.get("headers"), dict):
+        headers.update({str(k): str(v) for k, v in item["headers"].items()})
+    builder = EnvironBuilder(
+        path=path,
+        method=method,
+        base_url=request.host_url,
+        headers=headers,
+        json=item.get("body"),
+        environ_base={"REMOTE_ADDR": request.remote_addr},
+    )
+
+    g.batch_subrequest = True
+    try:
+        with app.request_context(builder.get_environ()):
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = app.dispatch_request()
+                resp = app.make_response(rv)
+            except Exception as exc:
+                try:
+                    # HTTP errors and registered handlers (e.g. JWT errors) answer as usual
+                    resp = app.make_response(app.handle_user_exception(exc))
+                except Exception as unhandled:
+                    print("[ERROR] batch sub-request:", unhandled)
+                    # Same as a standalone request: an unhandled error leaves nothing behind
+                    rollback_request_session()
+                    resp = make_response(jsonify({"error": "Internal server error"}), 500)
+            observe_request(resp)
+            body = resp.get_json(silent=True) if resp.is_json else resp.get_data(as_text=True)
+            return {"status": resp.status_code, "body": body}
+    finally:
+        g.batch_subrequest = False
+        builder.close()
+
+
+@app.post("/batch")
+@jwt_required()
+def route_batch() -> FlaskReturn:
+    """
+    Run up to BATCH_MAX_REQUESTS API calls in one HTTP round-trip.
+    Body: { requests: [{ method, path, body?, headers? }], transaction?: bool } or a bare array.
+    Sub-requests run in order and share this request's DB connection.
+    transaction=false (default): each sub-request commits on its own, as if sent separately.
+    transaction=true: all of them commit together; the first one answering >= 400 rolls
+    everything back and the rest are not run (status 424).
+    Returns { results: [{ status, body }], committed? } in request order.
+    Protected: any logged-in user; each sub-request enforces its own role checks.
+    """
+    data = request.get_json(silent=True)
+    transaction = False
+    if isinstance(data, dict):
+        transaction = bool(data.get("transaction"))
+        data = data.get("requests")
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Expected a non-empty JSON array or { requests: [...] }"}), 400
+    if len(data) > BATCH_MAX_REQUESTS:
+        return jsonify({"error": f"At most {BATCH_MAX_REQUESTS} requests per batch"}), 413
+
+    results: List[Dict[str, Any]] = []
+    failed_at: Optional[int] = None
+    for i, item in enumerate(data):
+        if failed_at is not None:
+            results.append({"status": 424, "body": {"error": f"Not run: request {failed_at} failed"}})
+            continue
+        result = run_subrequest(item)
+        if transaction:
+            if result["status"] >= 400:
+                rollback_request_session()
+                failed_at = i
+        elif not checkpoint_request_session():
+            result = {"status": 500, "body": {"error": "Database commit failed"}}
+        results.append(result)
+
+    body: Dict[str, Any] = {"results": results}
+    if transaction:
+        body["committed"] = failed_at is None
+    return jsonify(body), 200
+
+
+@app.get("/metrics")
+def route_metrics() -> FlaskReturn:
+    """
+    Prometheus scrape endpoint: request latency per endpoint/status, requests in flight,
+    db.py helper latency and errors, pool wait time and occupancy, cache hit ratios.
+    Counters are per process; with several workers, scrape each one.
+    """
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Not found"}), 404
+    if METRICS_TOKEN and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"):
+        return jsonify({"error": "Unauthorized"}), 401
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+# ASGI mode: `uvicorn app:asgi_app` (or SERVER_MODE="asgi" with python app.py). Slow clients
+# are read from and written to on the event loop; only ASGI_THREADS requests run app code at once.
+SERVER_MODE: str = getenv("SERVER_MODE", "wsgi").lower()
+asgi_app = WSGIBridge(
+    app,
+    threads=int(getenv("ASGI_THREADS", "0")) or DB_POOL_MAX_SIZE,
+    max_body=int(getenv("ASGI_MAX_BODY_BYTES", str(16 * 1024 * 1024))),
+)
+
+
 # Run the script
 if __name__ == "__main__":
-    app.run(host=HOST, port=PORT, debug=DEV_ENV)
+    if SERVER_MODE == "asgi":
+        import uvicorn  # optional: pip install uvicorn
+        uvicorn.run(asgi_app, host=HOST or "127.0.0.1", port=PORT, log_level="info" if DEV_ENV else "warning")
+    else:
+        app.run(host=HOST, port=PORT, debug=DEV_ENV)
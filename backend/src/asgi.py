@@ -0,0 +1,267 @@
+"""
+@author Anish
+@description ASGI front for the Flask app: connections live on an event loop, only the handler runs on a thread
+@date 17/10/2026
+@returns nothing
+
+Under app.run() (or any sync WSGI server) a thread is tied up for as long as its
+client takes to send the request and read the response; on a slow mobile network
+that is most of the request's life. WSGIBridge moves that part onto an asyncio
+event loop: the body is read and the response written without a thread, and the
+Flask app (blocking pymysql calls included) runs on a bounded thread pool only
+once the whole request is in memory.
+
+    uvicorn app:asgi_app --host 0.0.0.0 --port 8080
+"""
+
+from __future__ import annotations
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import io
+import sys
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Headers = List[Tuple[str, str]]
+
+# A view may put an async iterator of str/bytes under this environ key (present only
+# when served through WSGIBridge); it then replaces the WSGI body and is iterated on
+# the event loop, so a long-lived stream (see /stream) holds no handler thread.
+ASYNC_BODY_KEY = "wsgi_bridge.async_body"
+
+
+class _Disconnected(Exception):
+    """The client went away before its request body arrived."""
+
+
+class _Started:
+    """
+    What the app passed to start_response, plus anything it pushed through the
+    legacy write() callable. Written data is buffered and sent ahead of the next
+    chunk of the response iterable, as PEP 3333 orders it.
+    """
+
+    __slots__ = ("status", "headers", "written")
+
+    def __init__(self) -> None:
+        self.status = 500
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.written: List[bytes] = []
+
+    def __call__(self, status: str, headers: Headers, exc_info: Any = None) -> Callable[[bytes], None]:
+        if exc_info is not None and self.headers:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(" ", 1)[0])
+        self.headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        return self.write
+
+    def write(self, data: bytes) -> None:
+        if data:
+            self.written.append(bytes(data))
+
+    def take_written(self) -> List[bytes]:
+        written, self.written = self.written, []
+        return written
+
+
+class _Body:
+    """The WSGI response iterable plus the chunks already pulled from it."""
+
+    __slots__ = ("started", "iterable", "iterator", "chunks", "done")
+
+    def __init__(self, started: _Started, iterable: Iterable[bytes]) -> None:
+        self.started = started
+        self.iterable = iterable
+        self.iterator: Optional[Iterator[bytes]] = None
+        self.chunks: List[bytes] = []
+        self.done = False
+
+
+class WSGIBridge:
+    """
+    ASGI application serving a WSGI app.
+
+    threads:   handler threads, i.e. requests running app code at once; more than the
+               DB pool size only adds threads waiting for a connection
+    max_body:  request bodies larger than this get a 413 without reaching the app
+
+    A response with a Content-Length is produced in one go on its thread; one without
+    (a streamed export) is pulled a chunk per thread hop, so a slow reader holds no
+    thread between chunks. All the hops of one request share a contextvars.Context.
+    A view can also hand over an async body through ASYNC_BODY_KEY.
+    """
+
+    def __init__(self, wsgi_app: Callable[..., Iterable[bytes]], threads: int = 10, max_body: int = 16 * 1024 * 1024) -> None:
+        self.wsgi_app = wsgi_app
+        self.threads = threads
+        self.max_body = max_body
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="asgi-handler")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"WSGIBridge cannot serve {scope['type']!r} connections")
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # -------------------------
+    # HTTP
+    # -------------------------
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            body = await self._read_body(receive)
+        except _Disconnected:
+            return
+        if body is None:
+            await send({"type": "http.response.start", "status": 413, "headers": [(b"content-type", b"text/plain")]})
+            await send({"type": "http.response.body", "body": b"Request body too large"})
+            return
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        started = _Started()
+        environ = self._environ(scope, body)
+        response: _Body = await loop.run_in_executor(self.executor, context.run, self._start, environ, started)
+        async_body: Optional[AsyncIterator[Any]] = environ.get(ASYNC_BODY_KEY)
+        # Servers drop writes to a closed connection silently; watch for the disconnect
+        # so a long stream stops instead of running on for nobody
+        disconnected = asyncio.Event()
+        watcher = asyncio.ensure_future(self._watch_disconnect(receive, disconnected))
+        try:
+            if async_body is not None:
+                await loop.run_in_executor(self.executor, context.run, self._close, response)
+                headers = [(name, value) for name, value in started.headers if name != b"content-length"]
+                await send({"type": "http.response.start", "status": started.status, "headers": headers})
+                try:
+                    async for chunk in async_body:
+                        if disconnected.is_set():
+                            break
+                        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+                        await send({"type": "http.response.body", "body": data, "more_body": True})
+                finally:
+                    await async_body.aclose()  # type: ignore[attr-defined]
+            else:
+                await send({"type": "http.response.start", "status": started.status, "headers": started.headers})
+                for chunk in response.chunks:
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                while not response.done and not disconnected.is_set():
+                    chunk = await loop.run_in_executor(self.executor, context.run, self._next_chunk, response)
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            watcher.cancel()
+            # close() runs the app's cleanup (e.g. releasing a streaming cursor's connection)
+            if async_body is None:
+                await loop.run_in_executor(self.executor, context.run, self._close, response)
+
+    @staticmethod
+    async def _watch_disconnect(receive: Receive, disconnected: asyncio.Event) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+                return
+
+    async def _read_body(self, receive: Receive) -> Optional[bytes]:
+        """The whole request body, or None when it is larger than max_body."""
+        parts: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _Disconnected()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            parts.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(parts)
+
+    def _start(self, environ: Dict[str, Any], started: _Started) -> _Body:
+        """Handler thread: run the app; drain the body now unless it is streamed."""
+        response = _Body(started, self.wsgi_app(environ, started))
+        response.chunks = started.take_written()
+        if any(name == b"content-length" for name, _ in started.headers):
+            for chunk in response.iterable:
+                response.chunks.extend(started.take_written())
+                response.chunks.append(chunk)
+            response.chunks.extend(started.take_written())
+            response.done = True
+        return response
+
+    @staticmethod
+    def _next_chunk(response: _Body) -> bytes:
+        if response.iterator is None:
+            response.iterator = iter(response.iterable)
+        try:
+            chunk = next(response.iterator)
+        except StopIteration:
+            response.done = True
+            chunk = b""
+        # Anything written while the iterable ran goes out ahead of its chunk
+        written = response.started.take_written()
+        return b"".join(written) + chunk if written else chunk
+
+    @staticmethod
+    def _close(response: _Body) -> None:
+        close = getattr(response.iterable, "close", None)
+        if close is not None:
+            close()
+
+    @staticmethod
+    def _environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        root_path = scope.get("root_path", "")
+        path = scope["path"]
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        environ: Dict[str, Any] = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+            "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+            ASYNC_BODY_KEY: None,
+        }
+        for raw_name, raw_value in scope.get("headers", []):
+            name = raw_name.decode("latin-1").upper().replace("-", "_")
+            value = raw_value.decode("latin-1")
+            if name == "CONTENT_LENGTH":
+                continue
+            key = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+            if key in environ:
+                value = environ[key] + ("; " if key == "HTTP_COOKIE" else ",") + value
+            environ[key] = value
+        return environ
@@ -0,0 +1,116 @@
+"""
+@author Anish
+@description Size-bounded TTL cache with table-tag invalidation for db.py readers
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+from collections import OrderedDict
+from functools import wraps
+import threading
+import time
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """
+    LRU cache whose entries also expire after `ttl` seconds.
+
+    Entries are tagged with the tables they were read from; invalidate(table)
+    drops every entry carrying that tag. A per-tag generation counter stops a
+    reader that raced with a write from storing the pre-write result.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at, tags, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Tuple[str, ...], Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        tags: Tuple[str, ...],
+        loader: Callable[[], T],
+        store_if: Callable[[T], bool] = lambda value: True,
+    ) -> T:
+        """Return the cached value for key, or call loader() and cache its result."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            generations = tuple(self._generations.get(t, 0) for t in tags)
+
+        value = loader()
+        if not store_if(value) or self.ttl <= 0 or self.maxsize <= 0:
+            return value
+
+        with self._lock:
+            # A write to one of our tables landed while we were loading: don't cache
+            if generations != tuple(self._generations.get(t, 0) for t in tags):
+                return value
+            self._entries[key] = (time.monotonic() + self.ttl, tags, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, tag: str) -> None:
+        """Drop every entry read from `tag` and bump its generation."""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [k for k, (_, tags, _) in self._entries.items() if tag in tags]
+            for k in stale:
+                del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for tag in self._generations:
+                self._generations[tag] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+def cached(cache: TTLCache, tags: Iterable[str], store_if: Optional[Callable[[Any], bool]] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator: read-through `cache` keyed on the function name and arguments.
+    Callers share the cached object, so they must not mutate the result.
+    """
+    tag_tuple = tuple(tags)
+    keep = store_if or (lambda value: True)
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_load(key, tag_tuple, lambda: fn(*args, **kwargs), keep)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,150 @@
+"""
+@author Anish
+@description gzip / brotli response compression with a cache of precompressed bodies
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import gzip
+import threading
+
+try:  # optional: pip install brotli
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+from werkzeug.datastructures import MIMEAccept
+from flask import Response
+
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html")
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodings we can produce, best first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def etag_variants(etag: str) -> Tuple[str, ...]:
+    """The identity ETag plus the per-encoding ETags compress_response may send for it."""
+    return (etag,) + tuple(f"{etag}-{enc}" for enc in available_encodings())
+
+
+def choose_encoding(accept: MIMEAccept) -> Optional[str]:
+    """Pick the best encoding the client accepts (honouring q=0), or None."""
+    best: Optional[str] = None
+    best_q = 0.0
+    for enc in available_encodings():
+        q = accept.quality(enc)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 keeps the output deterministic for the same input
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+class PrecompressedCache:
+    """
+    LRU of compressed bodies keyed by (ETag, encoding), bounded by total bytes.
+    An ETag changes with the collection version, so stale bodies are never served;
+    they simply age out.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((etag, encoding))
+            self.hits += 1
+            return body
+
+    def put(self, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop((etag, encoding), None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[(etag, encoding)] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+class Compressor:
+    """
+    Compresses eligible responses in place:
+    - 200 responses, not streamed, not already encoded
+    - a compressible mimetype and at least `min_bytes` long
+    - an encoding the client accepts (br preferred when the brotli package is installed)
+    Responses carrying an ETag (the versioned public collections) are served from
+    the precompressed cache; their ETag gets an -<encoding> suffix so each
+    representation has its own strong validator.
+    """
+
+    def __init__(self, min_bytes: int = 1024, gzip_level: int = 6, brotli_quality: int = 5, cache_bytes: int = 32 * 1024 * 1024) -> None:
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = PrecompressedCache(cache_bytes)
+
+    def __call__(self, response: Response, accept: MIMEAccept) -> Response:
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add("Accept-Encoding")
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_bytes:
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            body = self.cache.get(etag, encoding)
+            if body is None:
+                body = compress(data, encoding, self.gzip_level, self.brotli_quality)
+                self.cache.put(etag, encoding, body)
+            response.set_etag(f"{etag}-{encoding}")
+        else:
+            body = compress(data, encoding, self.gzip_level, self.brotli_quality)
+
+        response.set_data(body)
+        response.headers["Content-Encoding"] = encoding
+        return response
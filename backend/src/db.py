@@ -6,12 +6,27 @@
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
 from os import getenv
 from dotenv import load_dotenv
 from datetime import datetime 
+from contextlib import contextmanager
+from functools import wraps
+import hmac
+import inspect
+import threading
+import time
 import pymysql
 import pymysql.cursors
+from flask import g, has_request_context
+from pymysql.constants import SERVER_STATUS
+from src.pool import ConnectionPool, PooledConnection, PoolTimeoutError
+from src.replicas import Replica, ReplicaSet
+from src.cache import TTLCache, cached
+from src.passwords import password_hasher, is_hashed, needs_rehash, HasherBusyError
+from src.metrics import registry
+from src.sqlite_backend import SQLiteCursor, connect as sqlite_connect
+from src.schedule_index import parse_slot_time
 
 load_dotenv()
 
@@ -21,38 +36,747 @@ DB_NAME: str = getenv("DB_NAME", "college_db")
 DB_USER: str = getenv("DB_USER", "root")
 DB_PASSWORD: str = getenv("DB_PASSWORD", "")
 
+# "mysql" (default) or "sqlite": an embedded database file, no server needed (see src/sqlite_backend.py)
+DB_ENGINE: str = getenv("DB_ENGINE", "mysql").lower()
+SQLITE_PATH: str = getenv("SQLITE_PATH", "college.db")
+SQLITE_BUSY_TIMEOUT: float = float(getenv("SQLITE_BUSY_TIMEOUT", "5"))
+
+# Pool sizing (see src/pool.py)
+DB_POOL_MIN_SIZE: int = int(getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE: int = int(getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_IDLE_TIMEOUT: float = float(getenv("DB_POOL_IDLE_TIMEOUT", "300"))
+DB_POOL_ACQUIRE_TIMEOUT: float = float(getenv("DB_POOL_ACQUIRE_TIMEOUT", "10"))
+DB_POOL_PING_INTERVAL: float = float(getenv("DB_POOL_PING_INTERVAL", "0"))
+
+# One connection + one transaction per Flask request (see "Request session" below)
+DB_REQUEST_SESSION: bool = getenv("DB_REQUEST_SESSION", "True").lower() in ("true", "1")
+
+# Slow-query log (0 disables): statements slower than this are printed with their
+# helper, duration and row count; EXPLAIN output is added when DB_SLOW_QUERY_EXPLAIN is on
+DB_SLOW_QUERY_MS: float = float(getenv("DB_SLOW_QUERY_MS", "0"))
+DB_SLOW_QUERY_EXPLAIN: bool = getenv("DB_SLOW_QUERY_EXPLAIN", "False").lower() in ("true", "1")
+DB_SLOW_QUERY_EXPLAIN_INTERVAL: float = float(getenv("DB_SLOW_QUERY_EXPLAIN_INTERVAL", "60"))
+
+# Read replicas (MySQL only): "host[:port],host[:port]" sharing the primary's user, password
+# and database; empty keeps every read on the primary (see "Read replicas" below)
+DB_REPLICA_HOSTS: str = getenv("DB_REPLICA_HOSTS", "")
+DB_REPLICA_CHECK_INTERVAL: float = float(getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+DB_REPLICA_MAX_LAG_SECONDS: float = float(getenv("DB_REPLICA_MAX_LAG_SECONDS", "0"))
+DB_REPLICA_ACQUIRE_TIMEOUT: float = float(getenv("DB_REPLICA_ACQUIRE_TIMEOUT", "1"))
+DB_READ_YOUR_WRITES_SECONDS: float = float(getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
 
 # -------------------------
-# Connection helper
+# Instrumentation
 # -------------------------
-def get_connection() -> pymysql.connections.Connection:
+# Every public helper is timed under its own name (the wrapping happens at the end
+# of this module). Helpers swallow their exceptions and return a sentinel, so a
+# failure is detected where it happens instead: a statement raising in the cursor,
+# or no connection to be had. It is counted once per failed helper call.
+DB_FUNCTION_SECONDS = registry.histogram(
+    "db_function_duration_seconds", "Wall time of db.py helper calls, cache hits included.", ("function",)
+)
+DB_FUNCTION_ERRORS = registry.counter("db_function_errors_total", "db.py helper calls that hit a database error.", ("function",))
+DB_POOL_ACQUIRE_SECONDS = registry.histogram("db_pool_acquire_seconds", "Time spent borrowing a connection from the pool.")
+DB_SLOW_QUERIES = registry.counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS.", ("function",))
+DB_READ_ROUTING = registry.counter("db_read_routing_total", "Replica-eligible reads by where they were served.", ("target",))
+
+_calls = threading.local()
+
+
+class _CallFrame:
+    __slots__ = ("name", "failed")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.failed = False
+
+
+def _mark_failed() -> None:
+    """Flag the helper running on this thread as failed."""
+    frame: Optional[_CallFrame] = getattr(_calls, "frame", None)
+    if frame is not None:
+        frame.failed = True
+
+
+def instrumented(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator: record the duration and failure of each call to a db.py helper."""
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        outer = getattr(_calls, "frame", None)
+        frame = _calls.frame = _CallFrame(name)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            frame.failed = True
+            raise
+        finally:
+            DB_FUNCTION_SECONDS.observe(time.perf_counter() - started, name)
+            if frame.failed:
+                DB_FUNCTION_ERRORS.inc(name)
+            _calls.frame = outer
+
+    return wrapper
+
+
+def _current_function() -> str:
+    frame: Optional[_CallFrame] = getattr(_calls, "frame", None)
+    return frame.name if frame is not None else "?"
+
+
+# Profiler hook: listener(function, sql, seconds, rows) after every statement.
+# `sql` is the statement as written in the helper, placeholders and all; the
+# arguments are never passed on (they include password hashes).
+QueryListener = Callable[[str, str, float, int], None]
+_query_listeners: List[QueryListener] = []
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+_explained_at: Dict[str, float] = {}
+_explained_lock = threading.Lock()
+
+
+def add_query_listener(listener: QueryListener) -> None:
+    """Register a callback run after each statement a db.py helper executes."""
+    _query_listeners.append(listener)
+
+
+def _due_for_explain(sql: str) -> bool:
+    """EXPLAIN a given statement at most once per DB_SLOW_QUERY_EXPLAIN_INTERVAL."""
+    now = time.monotonic()
+    with _explained_lock:
+        last = _explained_at.get(sql)
+        if last is not None and now - last < DB_SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        if len(_explained_at) >= 1024:
+            _explained_at.clear()
+        _explained_at[sql] = now
+        return True
+
+
+class _InstrumentedMixin:
     """
-    Return a new pymysql Connection using DictCursor so fetches produce dicts.
-    Caller is responsible for closing the connection.
+    Cursor mixin that flags the running helper as failed when a statement raises and,
+    when profiling is on (DB_SLOW_QUERY_MS or a query listener), times every statement.
+
+    executemany() is timed once, as its template. pymysql runs it as execute() calls
+    with the rows already interpolated (bytes), which are neither timed nor reported.
+    Profiling never fails a statement that succeeded.
     """
+
+    connection: Any
+    rowcount: int
+    _in_executemany = False
+
+    def execute(self, query: str, args: Any = None) -> int:
+        if self._in_executemany or not isinstance(query, str) or (DB_SLOW_QUERY_MS <= 0 and not _query_listeners):
+            try:
+                return super().execute(query, args)  # type: ignore[misc]
+            except Exception:
+                _mark_failed()
+                raise
+
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, args)  # type: ignore[misc]
+        except Exception:
+            _mark_failed()
+            raise
+        self._profile(query, args, time.perf_counter() - started)
+        return result
+
+    def executemany(self, query: str, args: Any) -> int:
+        profiled = isinstance(query, str) and (DB_SLOW_QUERY_MS > 0 or bool(_query_listeners))
+        started = time.perf_counter()
+        self._in_executemany = True
+        try:
+            result = super().executemany(query, args)  # type: ignore[misc]
+        except Exception:
+            _mark_failed()
+            raise
+        finally:
+            self._in_executemany = False
+        if profiled and args:
+            # EXPLAIN, if it runs, gets the first row's arguments
+            self._profile(query, args[0], time.perf_counter() - started)
+        return result
+
+    def _profile(self, query: str, args: Any, elapsed: float) -> None:
+        function = _current_function()
+        rows = max(self.rowcount, 0)
+        for listener in list(_query_listeners):
+            try:
+                listener(function, query, elapsed, rows)
+            except Exception as exc:
+                print("[ERROR] query listener:", exc)
+        if DB_SLOW_QUERY_MS > 0 and elapsed * 1000 >= DB_SLOW_QUERY_MS:
+            try:
+                self._log_slow(function, query, args, elapsed, rows)
+            except Exception as exc:
+                print("[ERROR] slow query log:", exc)
+
+    def _log_slow(self, function: str, query: str, args: Any, elapsed: float, rows: int) -> None:
+        DB_SLOW_QUERIES.inc(function)
+        sql = " ".join(query.split())
+        print(f"[SLOW] {function}: {elapsed * 1000:.1f} ms, {rows} rows: {sql[:1000]}")
+        if not DB_SLOW_QUERY_EXPLAIN or not sql.upper().startswith(EXPLAINABLE) or not _due_for_explain(sql):
+            return
+        try:
+            # Our result is already buffered, so the connection is free for a plain cursor
+            with self.connection.cursor(pymysql.cursors.DictCursor) as cur:
+                cur.execute(("EXPLAIN QUERY PLAN " if DB_ENGINE == "sqlite" else "EXPLAIN ") + query, args)
+                for row in cur.fetchall():
+                    print("[SLOW]   EXPLAIN", function + ":", row)
+        except Exception as exc:
+            print("[ERROR] explain:", exc)
+
+
+class _InstrumentedCursor(_InstrumentedMixin, pymysql.cursors.DictCursor):
+    pass
+
+
+class _InstrumentedSQLiteCursor(_InstrumentedMixin, SQLiteCursor):
+    pass
+
+
+# -------------------------
+# Connection helper
+# -------------------------
+def _open_connection(host: Optional[str] = None, port: Optional[int] = None) -> pymysql.connections.Connection:
+    """Open a brand-new connection (used by the pools to grow); host/port default to the primary."""
+    if DB_ENGINE == "sqlite":
+        return cast(pymysql.connections.Connection, sqlite_connect(SQLITE_PATH, _InstrumentedSQLiteCursor, SQLITE_BUSY_TIMEOUT))
     return pymysql.connect(
-        host=DB_HOST,
-        port=DB_PORT,
+        host=host or DB_HOST,
+        port=port or DB_PORT,
         user=DB_USER,
         password=DB_PASSWORD,
         database=DB_NAME,
-        cursorclass=pymysql.cursors.DictCursor,
+        cursorclass=_InstrumentedCursor,
         autocommit=False,
     )
 
 
+def _reset_connection(conn: pymysql.connections.Connection) -> None:
+    """
+    Put a returned connection back into its default state.
+    A plain SELECT under autocommit=False still opens an InnoDB snapshot, so any
+    open transaction is rolled back to stop the next borrower reading stale data.
+    """
+    if conn.get_autocommit():
+        conn.autocommit(False)
+    if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+        conn.rollback()
+
+
+def _check_connection(conn: pymysql.connections.Connection) -> None:
+    """Health check on borrow: raises if the server went away."""
+    conn.ping(reconnect=False)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _open_connection,
+                    reset=_reset_connection,
+                    check=_check_connection,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                    acquire_timeout=DB_POOL_ACQUIRE_TIMEOUT,
+                    ping_interval=DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+
+def get_pool_stats() -> Optional[Dict[str, int]]:
+    """Occupancy of the pool, or None while nothing has borrowed from it yet."""
+    return _pool.stats() if _pool is not None else None
+
+
+def _acquire() -> PooledConnection:
+    """Borrow from the pool, recording how long the wait took."""
+    started = time.perf_counter()
+    try:
+        return get_pool().acquire()
+    except Exception:
+        _mark_failed()
+        raise
+    finally:
+        DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+
+
+def get_connection() -> pymysql.connections.Connection:
+    """
+    Borrow a pymysql Connection (DictCursor, autocommit off).
+    Inside a Flask request this is a handle on the request session's connection;
+    elsewhere it comes straight from the pool. Either way the caller commits or
+    rolls back its own work and calls close() when done.
+    Inside replica_reads() it may instead come from a read replica's pool.
+    """
+    if getattr(_routing, "depth", 0):
+        replica_conn = _replica_connection()
+        if replica_conn is not None:
+            return replica_conn
+    session = _request_session(create=True)
+    if session is not None:
+        return cast(pymysql.connections.Connection, session.handle())
+    return _standalone_connection()
+
+
+def _standalone_connection() -> pymysql.connections.Connection:
+    """
+    Borrow a pool connection that is never shared with the request session.
+    For work that must commit on its own (id_counter blocks, batched purges)
+    or outlive the request (unbuffered streaming).
+    """
+    return cast(pymysql.connections.Connection, _acquire())
+
+
+# -------------------------
+# Read replicas
+# -------------------------
+# Helpers decorated with @replica_read (and code run inside `with replica_reads():`)
+# may be served by a replica, round-robin over the healthy ones. Everything else,
+# writes, generate_login_id and token revocation included, stays on the primary.
+# Reads go back to the primary when:
+#   - no replica is configured or healthy (or its pool is exhausted)
+#   - the request already wrote (g.db_wrote), or the client wrote within the last
+#     DB_READ_YOUR_WRITES_SECONDS (app.py keeps that in a cookie -> g.db_read_primary)
+# A request sticks to the replica it first used, so an ETag and the body it
+# describes come from the same server.
+_routing = threading.local()
+_replicas: Optional[ReplicaSet] = None
+_replicas_lock = threading.Lock()
+
+
+def _parse_replica_hosts(text: str) -> List[Tuple[str, int]]:
+    hosts: List[Tuple[str, int]] = []
+    for part in text.split(","):
+        host, _, port = part.strip().partition(":")
+        if host:
+            hosts.append((host, int(port or DB_PORT)))
+    return hosts
+
+
+def _replica_lag(conn: pymysql.connections.Connection) -> Optional[float]:
+    """Seconds the replica is behind its source; None when replication is not running."""
+    with conn.cursor() as cur:
+        try:
+            cur.execute("SHOW REPLICA STATUS")
+        except pymysql.err.MySQLError:
+            # MySQL < 8.0.22 / MariaDB
+            cur.execute("SHOW SLAVE STATUS")
+        row = cast(Optional[Dict[str, Any]], cur.fetchone())
+    if not row:
+        return None
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return float(lag) if lag is not None else None
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    """The configured replicas (created on first use), or None when reads all go to the primary."""
+    global _replicas
+    if not DB_REPLICA_HOSTS or DB_ENGINE == "sqlite":
+        return None
+    if _replicas is None:
+        with _replicas_lock:
+            if _replicas is None:
+                replicas = []
+                for host, port in _parse_replica_hosts(DB_REPLICA_HOSTS):
+                    pool = ConnectionPool(
+                        lambda host=host, port=port: _open_connection(host, port),
+                        reset=_reset_connection,
+                        check=_check_connection,
+                        min_size=0,
+                        max_size=DB_POOL_MAX_SIZE,
+                        idle_timeout=DB_POOL_IDLE_TIMEOUT,
+                        acquire_timeout=DB_REPLICA_ACQUIRE_TIMEOUT,
+                        ping_interval=DB_POOL_PING_INTERVAL,
+                    )
+                    replicas.append(Replica(f"{host}:{port}", pool))
+                _replicas = ReplicaSet(
+                    replicas,
+                    lag=_replica_lag,
+                    check_interval=DB_REPLICA_CHECK_INTERVAL,
+                    max_lag=DB_REPLICA_MAX_LAG_SECONDS,
+                )
+    return _replicas
+
+
+def get_replica_stats() -> Optional[List[Dict[str, Any]]]:
+    """Health, lag and pool occupancy per replica, or None when none is configured."""
+    return _replicas.stats() if _replicas is not None else None
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Let the helpers called inside this block read from a replica."""
+    _routing.depth = getattr(_routing, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _routing.depth -= 1
+
+
+def replica_read(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator: a pure reader that may be served by a replica."""
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with replica_reads():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _primary_required() -> bool:
+    """Read-your-writes: this request, or this client recently, wrote through the primary."""
+    if not has_request_context():
+        return False
+    return bool(g.get("db_read_primary") or g.get("db_wrote")) or _session_has_writes()
+
+
+def _replica_connection() -> Optional[pymysql.connections.Connection]:
+    """A replica connection for the current read, or None to use the primary."""
+    replicas = get_replica_set()
+    if replicas is None:
+        return None
+    if _primary_required():
+        DB_READ_ROUTING.inc("primary")
+        return None
+    in_request = has_request_context()
+    replica: Optional[Replica] = g.get("db_replica") if in_request else None
+    if replica is None or not replica.healthy:
+        replica = replicas.pick()
+        if replica is None:
+            DB_READ_ROUTING.inc("primary")
+            return None
+        if in_request:
+            g.db_replica = replica
+    started = time.perf_counter()
+    try:
+        conn = replica.pool.acquire()
+    except PoolTimeoutError:
+        DB_READ_ROUTING.inc("primary")
+        return None
+    except Exception as exc:
+        print(f"[ERROR] replica {replica.name}:", exc)
+        replicas.mark_down(replica)
+        DB_READ_ROUTING.inc("primary")
+        return None
+    finally:
+        DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started)
+    DB_READ_ROUTING.inc(replica.name)
+    return cast(pymysql.connections.Connection, conn)
+
+
+# -------------------------
+# Request session
+# -------------------------
+# A request such as /auth/refresh calls several helpers; each used to borrow its own
+# connection and commit its own transaction. Inside a request they now share one
+# connection and one transaction kept on flask.g, without changing the helpers:
+#   commit()   only records that the session holds writes
+#   rollback() undoes just the failing helper's statements (a SAVEPOINT is taken
+#              when earlier helpers already wrote), else the open transaction
+#   close()    does nothing; the connection stays with the request
+# app.py commits in after_request (so a failed commit becomes a 500), unless the view
+# raised an unhandled exception, and releases the connection in teardown, which rolls
+# back whatever was not committed.
+# If a savepoint cannot be rolled back, the whole transaction is, and the session is
+# marked broken: the earlier helpers' writes are gone, so the commit reports failure.
+# Change notifications are queued and fired only after the commit succeeded.
+Notification = Tuple[str, str, Any, Optional[Dict[str, Any]]]
+
+
+class RequestSession:
+    """The connection, transaction state and queued notifications of one request."""
+
+    def __init__(self) -> None:
+        self.conn: Optional[PooledConnection] = None
+        self.written = False
+        self.pending: List[Notification] = []
+        self.broken = False
+        self._savepoints = 0
+
+    def handle(self) -> "_SessionConnection":
+        """A connection-like handle for one helper call, borrowing lazily on first use."""
+        if self.conn is None:
+            self.conn = _acquire()
+        savepoint: Optional[str] = None
+        if self.written:
+            self._savepoints += 1
+            savepoint = f"db_helper_{self._savepoints}"
+            with self.conn.cursor() as cur:
+                cur.execute(f"SAVEPOINT {savepoint}")
+        return _SessionConnection(self, savepoint)
+
+    def commit(self) -> List[Notification]:
+        """Commit the open transaction (raises on failure); returns the notifications now due."""
+        if self.broken:
+            self.broken = False
+            raise RuntimeError("the request's transaction was rolled back after a failed savepoint rollback")
+        if self.written and self.conn is not None:
+            self.conn.commit()
+        due, self.pending = self.pending, []
+        self.written = False
+        return due
+
+    def rollback(self) -> None:
+        """Undo the whole open transaction and forget its notifications; a connection that cannot roll back is dropped."""
+        if self.conn is not None:
+            try:
+                self.conn.rollback()
+            except Exception as exc:
+                print("[ERROR] request session rollback:", exc)
+                self.conn.discard()
+                self.conn = None
+        self.written = False
+        self.pending.clear()
+
+    def release(self) -> None:
+        """Return the connection to the pool; the pool's reset rolls back anything uncommitted."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class _SessionConnection:
+    """What get_connection() hands a helper inside a request (see RequestSession)."""
+
+    __slots__ = ("_session", "_savepoint")
+
+    def __init__(self, session: RequestSession, savepoint: Optional[str]) -> None:
+        self._session = session
+        self._savepoint = savepoint
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session.conn, name)
+
+    def commit(self) -> None:
+        self._session.written = True
+        self._savepoint = None
+        g.db_wrote = True
+
+    def rollback(self) -> None:
+        session = self._session
+        savepoint, self._savepoint = self._savepoint, None
+        if savepoint is not None and session.conn is not None:
+            try:
+                with session.conn.cursor() as cur:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                return
+            except Exception as exc:
+                print("[ERROR] rollback to savepoint:", exc)
+                session.broken = True
+        session.rollback()
+
+    def close(self) -> None:
+        pass
+
+
+def _request_session(create: bool = False) -> Optional[RequestSession]:
+    """The current request's session (created on demand), or None outside a request."""
+    if not DB_REQUEST_SESSION or not has_request_context():
+        return None
+    session = g.get("db_session")
+    if session is None and create and not g.get("db_session_done", False):
+        session = g.db_session = RequestSession()
+    return session
+
+
+def commit_request_session() -> bool:
+    """
+    Commit the request's transaction, release its connection, then fire the queued
+    change notifications. Helpers called later in the same request (e.g. from other
+    after_request hooks) go back to standalone connections.
+    Returns False if the commit failed; everything was rolled back in that case.
+    """
+    if not has_request_context():
+        return True
+    session: Optional[RequestSession] = g.pop("db_session", None)
+    g.db_session_done = True
+    if session is None:
+        return True
+    try:
+        due = _commit_session(session)
+    finally:
+        session.release()
+    if due is None:
+        return False
+    for table, action, key, row in due:
+        _fire_listeners(table, action, key, row)
+    return True
+
+
+def checkpoint_request_session() -> bool:
+    """
+    Commit what the request has written so far but keep its session (and connection)
+    for the helpers that follow, e.g. between independent /batch sub-requests.
+    Returns False if the commit failed; that work was rolled back.
+    """
+    session = _request_session()
+    if session is None:
+        return True
+    due = _commit_session(session)
+    if due is None:
+        return False
+    for table, action, key, row in due:
+        _fire_listeners(table, action, key, row)
+    return True
+
+
+def rollback_request_session() -> None:
+    """Undo everything the request has written since its last commit."""
+    session = _request_session()
+    if session is not None:
+        session.rollback()
+
+
+def _commit_session(session: RequestSession) -> Optional[List[Notification]]:
+    """Commit, or roll back and return None if the commit failed."""
+    try:
+        return session.commit()
+    except Exception as exc:
+        print("[ERROR] commit_request_session:", exc)
+        try:
+            session.rollback()
+        except Exception:
+            if session.conn is not None:
+                session.conn.discard()
+                session.conn = None
+        return None
+
+
+def close_request_session() -> None:
+    """Teardown: release the connection of a session that was never committed (rolls it back)."""
+    if not has_request_context():
+        return
+    session: Optional[RequestSession] = g.pop("db_session", None)
+    g.db_session_done = True
+    if session is not None:
+        session.pending.clear()
+        session.release()
+
+
+def _session_has_writes() -> bool:
+    session = _request_session()
+    return session is not None and session.written
+
+
+# -------------------------
+# Change listeners
+# -------------------------
+# listener(table, action, key, row): action is "insert" | "update" | "delete",
+# key is the primary key of the affected row, row carries the written values when known.
+ChangeListener = Callable[[str, str, Any, Optional[Dict[str, Any]]], None]
+_change_listeners: Dict[str, List[ChangeListener]] = {}
+
+
+def add_change_listener(table: str, listener: ChangeListener) -> None:
+    """Register a callback fired after a committed write to `table` in this process."""
+    _change_listeners.setdefault(table, []).append(listener)
+
+
+def _notify_change(table: str, action: str, key: Any, row: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Fire listeners for a committed write. Listener errors never fail the write.
+    Inside a request session the write is not committed yet, so it is queued instead.
+    """
+    if has_request_context():
+        g.db_wrote = True
+    session = _request_session()
+    if session is not None and session.conn is not None:
+        session.pending.append((table, action, key, row))
+        return
+    _fire_listeners(table, action, key, row)
+
+
+def _fire_listeners(table: str, action: str, key: Any, row: Optional[Dict[str, Any]]) -> None:
+    for listener in list(_change_listeners.get(table, ())):
+        try:
+            listener(table, action, key, row)
+        except Exception as exc:
+            print(f"[ERROR] change listener ({table}):", exc)
+
+
+# -------------------------
+# Reference data cache
+# -------------------------
+# Public, rarely-changing lists (programs, subjects, teachers) are served from memory.
+# Writes in this process invalidate immediately; other processes catch up within the TTL.
+# Readers cache only non-empty results ([] is also what they return on a DB error), and
+# never rows read inside a request session holding uncommitted writes.
+REFERENCE_CACHE_TTL: float = float(getenv("REFERENCE_CACHE_TTL", "300"))
+REFERENCE_CACHE_MAX_ENTRIES: int = int(getenv("REFERENCE_CACHE_MAX_ENTRIES", "256"))
+reference_cache = TTLCache(maxsize=REFERENCE_CACHE_MAX_ENTRIES, ttl=REFERENCE_CACHE_TTL)
+
+
+def _cacheable(value: Any) -> bool:
+    return bool(value) and not _session_has_writes()
+
+
+for _table in ("programs", "subjects", "teachers"):
+    add_change_listener(_table, lambda table, action, key, row: reference_cache.invalidate(table))
+
+
+# -------------------------
+# Dashboard cache
+# -------------------------
+# The assembled /dashboard payload; any write to a table it reads drops it.
+# The short TTL also moves "upcoming" events along as their dates pass.
+DASHBOARD_CACHE_TTL: float = float(getenv("DASHBOARD_CACHE_TTL", "30"))
+DASHBOARD_TABLES = ("notices", "events", "job_updates", "programs", "students", "teachers")
+dashboard_cache = TTLCache(maxsize=16, ttl=DASHBOARD_CACHE_TTL)
+
+for _table in DASHBOARD_TABLES:
+    add_change_listener(_table, lambda table, action, key, row: dashboard_cache.invalidate(table))
+
+
+# -------------------------
+# Collection versions (ETags)
+# -------------------------
+# Every write to these tables bumps a row in collection_versions in the same
+# transaction (see _bump_collection_version), so list routes can answer
+# If-None-Match from one primary-key lookup, across all workers, and the tag
+# commits or rolls back together with the rows it describes.
+VERSIONED_COLLECTIONS = ("notices", "events", "job_updates", "schedules")
+
+
 # -------------------------
 # ID generator (login_id)
 # -------------------------
-def generate_login_id(prefix: str) -> Optional[str]:
+# Numbers reserved per id_counter round-trip (hi/lo). Unused numbers of a block
+# are skipped if the process exits, so login ids are unique but not gap-free.
+LOGIN_ID_BLOCK_SIZE: int = max(1, int(getenv("LOGIN_ID_BLOCK_SIZE", "50")))
+LOGIN_ID_MAX_NO: int = 999999  # 6-digit suffix
+
+# prefix -> [next number to hand out, last number reserved]
+_login_id_blocks: Dict[str, List[int]] = {}
+_login_id_lock = threading.Lock()
+
+
+def _reserve_login_numbers(prefix: str, needed: int, preferred: int) -> Optional[Tuple[int, int]]:
     """
-    Generate a new login id using id_counter table.
-    prefix must be '65' (admin), '70' (teacher), or '83' (student).
-    Returns the new login_id string (prefix + zero-padded number) or None on error.
+    Reserve consecutive numbers for prefix in one id_counter transaction: `preferred`
+    of them, cut down to what is left below LOGIN_ID_MAX_NO but never below `needed`.
+    Returns (first reserved number, how many were reserved) or None on error
+    (including fewer than `needed` numbers left).
     """
     conn: Optional[pymysql.connections.Connection] = None
     try:
-        conn = get_connection()
+        conn = _standalone_connection()
         with conn.cursor() as cur:
             # Lock the row for this prefix
             cur.execute("SELECT last_no FROM id_counter WHERE prefix=%s FOR UPDATE", (prefix,))
@@ -79,18 +803,19 @@ def generate_login_id(prefix: str) -> Optional[str]:
                 except (ValueError, TypeError):
                     last_no = 0
 
-            next_no = last_no + 1
+            if last_no + needed > LOGIN_ID_MAX_NO:
+                raise ValueError(f"login id space exhausted for prefix {prefix}")
+            # Near the end of the space, a smaller block beats refusing the request
+            count = max(needed, min(preferred, LOGIN_ID_MAX_NO - last_no))
 
-            cur.execute("UPDATE id_counter SET last_no=%s WHERE prefix=%s", (next_no, prefix))
+            cur.execute("UPDATE id_counter SET last_no=%s WHERE prefix=%s", (last_no + count, prefix))
             conn.commit()
-
-            login_id = f"{prefix}{str(next_no).zfill(6)}"
-            return login_id
+            return last_no + 1, count
 
     except Exception as exc:
         if conn:
             conn.rollback()
-        print("[ERROR] generate_login_id:", exc)
+        print("[ERROR] _reserve_login_numbers:", exc)
         return None
 
     finally:
@@ -98,11 +823,53 @@ def generate_login_id(prefix: str) -> Optional[str]:
             conn.close()
 
 
+def generate_login_ids(prefix: str, n: int) -> Optional[List[str]]:
+    """
+    Generate n new login ids (prefix + zero-padded 6-digit number).
+    Ids come from a per-process block reserved in id_counter, so most calls never
+    touch the database; a bulk request reserves everything it needs in one transaction.
+    Returns the ids in ascending order, or None on error.
+    """
+    if n <= 0:
+        return []
+
+    with _login_id_lock:
+        block = _login_id_blocks.get(prefix)
+        numbers: List[int] = []
+        if block is not None:
+            take = min(n, block[1] - block[0] + 1)
+            numbers = list(range(block[0], block[0] + take))
+
+        missing = n - len(numbers)
+        if missing > 0:
+            reserved = _reserve_login_numbers(prefix, missing, max(missing, LOGIN_ID_BLOCK_SIZE))
+            if reserved is None:
+                return None
+            first, reserve = reserved
+            numbers.extend(range(first, first + missing))
+            _login_id_blocks[prefix] = [first + missing, first + reserve - 1]
+        elif block is not None:
+            block[0] += len(numbers)
+
+    return [f"{prefix}{str(no).zfill(6)}" for no in numbers]
+
+
+def generate_login_id(prefix: str) -> Optional[str]:
+    """
+    Generate a new login id using id_counter table.
+    prefix must be '65' (admin), '70' (teacher), or '83' (student).
+    Returns the new login_id string (prefix + zero-padded number) or None on error.
+    """
+    ids = generate_login_ids(prefix, 1)
+    return ids[0] if ids else None
+
+
 
 # ============================================================
 # PROGRAMS (formerly courses)
 # ============================================================
 
+@cached(reference_cache, ("programs",), store_if=_cacheable)
 def get_all_programs() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -130,7 +897,9 @@ def add_program(code: str, name: str, duration: str, level: str, description: Op
                 (code, name, duration, level, description),
             )
             conn.commit()
-            return int(cur.lastrowid or -1)
+            new_id = int(cur.lastrowid or -1)
+            _notify_change("programs", "insert", new_id)
+            return new_id
         
     except Exception as exc:
         if conn:
@@ -151,6 +920,8 @@ def delete_program(program_id: int) -> int:
             cur.execute("DELETE FROM programs WHERE program_id=%s", (program_id,))
             affected = cur.rowcount
             conn.commit()
+            if affected:
+                _notify_change("programs", "delete", program_id)
             return affected
         
     except Exception as exc:
@@ -168,6 +939,7 @@ def delete_program(program_id: int) -> int:
 # SUBJECTS
 # ============================================================
 
+@cached(reference_cache, ("subjects", "programs"), store_if=_cacheable)
 def get_all_subjects() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -185,6 +957,7 @@ def get_all_subjects() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@cached(reference_cache, ("subjects", "programs"), store_if=_cacheable)
 def get_subjects_by_program(program_id: int) -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -215,7 +988,9 @@ def add_subject(program_id: int, code: str, name: str, semester: int) -> int:
                 (program_id, code, name, semester),
             )
             conn.commit()
-            return int(cur.lastrowid or -1)
+            new_id = int(cur.lastrowid or -1)
+            _notify_change("subjects", "insert", new_id)
+            return new_id
         
     except Exception as exc:
         if conn:
@@ -236,6 +1011,8 @@ def delete_subject(subject_id: int) -> int:
             cur.execute("DELETE FROM subjects WHERE subject_id=%s", (subject_id,))
             affected = cur.rowcount
             conn.commit()
+            if affected:
+                _notify_change("subjects", "delete", subject_id)
             return affected
         
     except Exception as exc:
@@ -273,12 +1050,18 @@ def get_admin_by_login(login_id: str) -> Optional[Dict[str, Any]]:
 def add_admin(login_id: str, name: str, email: str, password: str) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        password = password_hasher.hash_if_plain(password)
         conn = get_connection()
         with conn.cursor() as cur:
             cur.execute("INSERT INTO admins (login_id, name, email, password) VALUES (%s, %s, %s, %s)", (login_id, name, email, password))
             conn.commit()
             return int(cur.lastrowid or -1)
         
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -294,6 +1077,7 @@ def add_admin(login_id: str, name: str, email: str, password: str) -> int:
 # TEACHERS
 # ============================================================
 
+@cached(reference_cache, ("teachers",), store_if=_cacheable)
 def get_all_teachers() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -311,6 +1095,31 @@ def get_all_teachers() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_teachers_page(limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of teachers ordered by teacher_id DESC, starting below `after`.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute("SELECT teacher_id, login_id, name, email, subject FROM teachers ORDER BY teacher_id DESC LIMIT %s", (limit + 1,))
+            else:
+                cur.execute("SELECT teacher_id, login_id, name, email, subject FROM teachers WHERE teacher_id < %s ORDER BY teacher_id DESC LIMIT %s", (after, limit + 1))
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_teachers_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
 def get_teacher_by_login(login_id: str) -> Optional[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -331,6 +1140,7 @@ def get_teacher_by_login(login_id: str) -> Optional[Dict[str, Any]]:
 def add_teacher(login_id: str, name: str, email: str, password: str, subject: Optional[str]) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        password = password_hasher.hash_if_plain(password)
         conn = get_connection()
         with conn.cursor() as cur:
             cur.execute(
@@ -338,8 +1148,15 @@ def add_teacher(login_id: str, name: str, email: str, password: str, subject: Op
                 (login_id, name, email, password, subject),
             )
             conn.commit()
-            return int(cur.lastrowid or -1)
+            new_id = int(cur.lastrowid or -1)
+            _notify_change("teachers", "insert", new_id)
+            return new_id
         
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -351,9 +1168,76 @@ def add_teacher(login_id: str, name: str, email: str, password: str, subject: Op
             conn.close()
 
 
+def get_existing_teacher_emails(emails: List[str]) -> Optional[List[str]]:
+    """Return which of `emails` already belong to a teacher (None on error)."""
+    if not emails:
+        return []
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            placeholders = ", ".join(["%s"] * len(emails))
+            cur.execute(f"SELECT email FROM teachers WHERE email IN ({placeholders})", tuple(emails))
+            return [cast(Dict[str, Any], r)["email"] for r in cur.fetchall()]
+        
+    except Exception as exc:
+        print("[ERROR] get_existing_teacher_emails:", exc)
+        return None
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+def add_teachers_bulk(rows: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """
+    Insert many teachers with one executemany in a single transaction.
+    rows: dicts with login_id, name, email, password, subject.
+    Returns {login_id: teacher_id} for the inserted rows, or None if the batch was rolled back.
+    Raises HasherBusyError when no password-hashing slot frees up in time.
+    """
+    if not rows:
+        return {}
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        hashed = password_hasher.hash_many([r["password"] for r in rows])
+        rows = [dict(r, password=h) for r, h in zip(rows, hashed)]
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO teachers (login_id, name, email, password, subject) VALUES (%s, %s, %s, %s, %s)",
+                [(r["login_id"], r["name"], r["email"], r["password"], r.get("subject")) for r in rows],
+            )
+            login_ids = [r["login_id"] for r in rows]
+            placeholders = ", ".join(["%s"] * len(login_ids))
+            cur.execute(f"SELECT teacher_id, login_id FROM teachers WHERE login_id IN ({placeholders})", tuple(login_ids))
+            inserted = {r["login_id"]: int(r["teacher_id"]) for r in cast(List[Dict[str, Any]], cur.fetchall())}
+            conn.commit()
+            for teacher_id in inserted.values():
+                _notify_change("teachers", "insert", teacher_id)
+            return inserted
+        
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
+    except Exception as exc:
+        if conn:
+            conn.rollback()
+        print("[ERROR] add_teachers_bulk:", exc)
+        return None
+    
+    finally:
+        if conn:
+            conn.close()
+
+
 def update_teacher(teacher_id: int, name: Optional[str], email: Optional[str], password: Optional[str], subject: Optional[str]) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        if password is not None:
+            password = password_hasher.hash_if_plain(password)
         conn = get_connection()
         with conn.cursor() as cur:
             sql = """
@@ -365,9 +1249,17 @@ def update_teacher(teacher_id: int, name: Optional[str], email: Optional[str], p
                 WHERE teacher_id=%s
             """
             cur.execute(sql, (name, email, password, subject, teacher_id))
+            affected = cur.rowcount
             conn.commit()
-            return cur.rowcount
+            if affected:
+                _notify_change("teachers", "update", teacher_id)
+            return affected
         
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -387,6 +1279,8 @@ def delete_teacher(teacher_id: int) -> int:
             cur.execute("DELETE FROM teachers WHERE teacher_id=%s", (teacher_id,))
             affected = cur.rowcount
             conn.commit()
+            if affected:
+                _notify_change("teachers", "delete", teacher_id)
             return affected
         
     except Exception as exc:
@@ -404,6 +1298,7 @@ def delete_teacher(teacher_id: int) -> int:
 # STUDENTS
 # ============================================================
 
+@replica_read
 def get_all_students() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -421,6 +1316,31 @@ def get_all_students() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_students_page(limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of students ordered by student_id DESC, starting below `after`.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute("SELECT student_id, login_id, name, email, roll_no, semester, program_id FROM students ORDER BY student_id DESC LIMIT %s", (limit + 1,))
+            else:
+                cur.execute("SELECT student_id, login_id, name, email, roll_no, semester, program_id FROM students WHERE student_id < %s ORDER BY student_id DESC LIMIT %s", (after, limit + 1))
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_students_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
 def get_student_by_login(login_id: str) -> Optional[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -441,6 +1361,7 @@ def get_student_by_login(login_id: str) -> Optional[Dict[str, Any]]:
 def add_student(login_id: str, name: str, email: str, password: str, roll_no: Optional[str], semester: Optional[int], program_id: Optional[int]) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        password = password_hasher.hash_if_plain(password)
         conn = get_connection()
         with conn.cursor() as cur:
             cur.execute(
@@ -448,8 +1369,15 @@ def add_student(login_id: str, name: str, email: str, password: str, roll_no: Op
                 (login_id, name, email, password, roll_no, semester, program_id),
             )
             conn.commit()
-            return int(cur.lastrowid or -1)
+            new_id = int(cur.lastrowid or -1)
+            _notify_change("students", "insert", new_id)
+            return new_id
         
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -461,9 +1389,79 @@ def add_student(login_id: str, name: str, email: str, password: str, roll_no: Op
             conn.close()
 
 
+def get_existing_student_emails(emails: List[str]) -> Optional[List[str]]:
+    """Return which of `emails` already belong to a student (None on error)."""
+    if not emails:
+        return []
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            placeholders = ", ".join(["%s"] * len(emails))
+            cur.execute(f"SELECT email FROM students WHERE email IN ({placeholders})", tuple(emails))
+            return [cast(Dict[str, Any], r)["email"] for r in cur.fetchall()]
+        
+    except Exception as exc:
+        print("[ERROR] get_existing_student_emails:", exc)
+        return None
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+def add_students_bulk(rows: List[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """
+    Insert many students with one executemany in a single transaction.
+    rows: dicts with login_id, name, email, password, roll_no, semester, program_id.
+    Returns {login_id: student_id} for the inserted rows, or None if the batch was rolled back.
+    Raises HasherBusyError when no password-hashing slot frees up in time.
+    """
+    if not rows:
+        return {}
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        hashed = password_hasher.hash_many([r["password"] for r in rows])
+        rows = [dict(r, password=h) for r, h in zip(rows, hashed)]
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO students (login_id, name, email, password, roll_no, semester, program_id) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [
+                    (r["login_id"], r["name"], r["email"], r["password"], r.get("roll_no"), r.get("semester"), r.get("program_id"))
+                    for r in rows
+                ],
+            )
+            login_ids = [r["login_id"] for r in rows]
+            placeholders = ", ".join(["%s"] * len(login_ids))
+            cur.execute(f"SELECT student_id, login_id FROM students WHERE login_id IN ({placeholders})", tuple(login_ids))
+            inserted = {r["login_id"]: int(r["student_id"]) for r in cast(List[Dict[str, Any]], cur.fetchall())}
+            conn.commit()
+            for student_id in inserted.values():
+                _notify_change("students", "insert", student_id)
+            return inserted
+        
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
+    except Exception as exc:
+        if conn:
+            conn.rollback()
+        print("[ERROR] add_students_bulk:", exc)
+        return None
+    
+    finally:
+        if conn:
+            conn.close()
+
+
 def update_student(student_id: int, name: Optional[str], email: Optional[str], password: Optional[str], roll_no: Optional[str], semester: Optional[int], program_id: Optional[int]) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        if password is not None:
+            password = password_hasher.hash_if_plain(password)
         conn = get_connection()
         with conn.cursor() as cur:
             sql = """
@@ -477,9 +1475,17 @@ def update_student(student_id: int, name: Optional[str], email: Optional[str], p
                 WHERE student_id=%s
             """
             cur.execute(sql, (name, email, password, roll_no, semester, program_id, student_id))
+            affected = cur.rowcount
             conn.commit()
-            return cur.rowcount
+            if affected:
+                _notify_change("students", "update", student_id)
+            return affected
         
+    except HasherBusyError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -499,6 +1505,8 @@ def delete_student(student_id: int) -> int:
             cur.execute("DELETE FROM students WHERE student_id=%s", (student_id,))
             affected = cur.rowcount
             conn.commit()
+            if affected:
+                _notify_change("students", "delete", student_id)
             return affected
         
     except Exception as exc:
@@ -536,6 +1544,7 @@ def assign_teacher_to_subject(teacher_id: int, subject_id: int) -> int:
             conn.close()
 
 
+@replica_read
 def get_teachers_for_subject(subject_id: int) -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -563,6 +1572,7 @@ def get_teachers_for_subject(subject_id: int) -> List[Dict[str, Any]]:
 # SCHEDULES
 # ============================================================
 
+@replica_read
 def get_all_schedules() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -580,18 +1590,233 @@ def get_all_schedules() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_schedules_page(limit: int, after: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of schedules ordered by (start_time, schedule_id) DESC.
+    `after` is the (start_time, schedule_id) of the last row of the previous page.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute(
+                    "SELECT schedule_id, subject_id, teacher_id, title, location, start_time, end_time FROM schedules "
+                    "ORDER BY start_time DESC, schedule_id DESC LIMIT %s",
+                    (limit + 1,),
+                )
+            else:
+                after_start, after_id = after
+                cur.execute(
+                    "SELECT schedule_id, subject_id, teacher_id, title, location, start_time, end_time FROM schedules "
+                    "WHERE start_time < %s OR (start_time = %s AND schedule_id < %s) "
+                    "ORDER BY start_time DESC, schedule_id DESC LIMIT %s",
+                    (after_start, after_start, after_id, limit + 1),
+                )
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_schedules_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+@replica_read
+def query_schedules(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    teacher_id: Optional[int] = None,
+    subject_id: Optional[int] = None,
+    program_id: Optional[int] = None,
+    semester: Optional[int] = None,
+    location: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[str, int]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Schedules starting in [date_from, date_to), ordered by (start_time, schedule_id) ASC,
+    narrowed by any of the other filters. program_id / semester join subjects.
+    Every filter is a range or equality on an indexed column (see temp/test.sql),
+    so a week view reads only that week's rows.
+    With limit, returns one keyset page (limit + 1 rows) after the (start_time,
+    schedule_id) of the previous page's last row.
+    """
+    where: List[str] = []
+    params: List[Any] = []
+    if date_from is not None:
+        where.append("sc.start_time >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        where.append("sc.start_time < %s")
+        params.append(date_to)
+    if teacher_id is not None:
+        where.append("sc.teacher_id = %s")
+        params.append(teacher_id)
+    if subject_id is not None:
+        where.append("sc.subject_id = %s")
+        params.append(subject_id)
+    if location is not None:
+        where.append("sc.location = %s")
+        params.append(location)
+    if program_id is not None:
+        where.append("s.program_id = %s")
+        params.append(program_id)
+    if semester is not None:
+        where.append("s.semester = %s")
+        params.append(semester)
+    if after is not None:
+        after_start, after_id = after
+        where.append("(sc.start_time > %s OR (sc.start_time = %s AND sc.schedule_id > %s))")
+        params.extend([after_start, after_start, after_id])
+
+    sql = "SELECT sc.schedule_id, sc.subject_id, sc.teacher_id, sc.title, sc.location, sc.start_time, sc.end_time FROM schedules sc"
+    if program_id is not None or semester is not None:
+        sql += " JOIN subjects s ON s.subject_id = sc.subject_id"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY sc.start_time, sc.schedule_id"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(limit + 1)
+
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cast(List[Dict[str, Any]], cur.fetchall())
+
+    except Exception as exc:
+        print("[ERROR] query_schedules:", exc)
+        return []
+
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_schedule(schedule_id: int) -> Optional[Dict[str, Any]]:
+    """Return one schedule row by id, or None if it does not exist (or on error)."""
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT schedule_id, subject_id, teacher_id, title, location, start_time, end_time FROM schedules WHERE schedule_id=%s LIMIT 1",
+                (schedule_id,),
+            )
+            return cast(Optional[Dict[str, Any]], cur.fetchone())
+
+    except Exception as exc:
+        print("[ERROR] get_schedule:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_schedule_slots() -> Optional[List[Dict[str, Any]]]:
+    """
+    Return (schedule_id, subject_id, teacher_id, location, start_time, end_time) of every
+    schedule, for the conflict index. Returns None on error so a failed load is not
+    mistaken for an empty timetable.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT schedule_id, subject_id, teacher_id, location, start_time, end_time FROM schedules")
+            return cast(List[Dict[str, Any]], cur.fetchall())
+
+    except Exception as exc:
+        print("[ERROR] get_schedule_slots:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
+class ScheduleConflictError(Exception):
+    """A schedule write would double-book a teacher or a location; `conflicts` lists the clashing slots."""
+
+    def __init__(self, conflicts: List[Dict[str, Any]]) -> None:
+        super().__init__("Schedule conflict")
+        self.conflicts = conflicts
+
+
+def _locked_schedule_conflicts(
+    cur: Any,
+    teacher_id: Optional[int],
+    location: Optional[str],
+    start: datetime,
+    end: datetime,
+    exclude_id: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Slots overlapping [start, end) for the teacher or the location, read with FOR UPDATE
+    so the range stays locked until the caller's transaction ends: a concurrent booking
+    of the same teacher or room (from any worker) waits here and then sees this one.
+    This is what decides a double-booking; the in-memory ScheduleIndex is only the fast path.
+    Locations match by the column's collation (case-insensitive on MySQL). Two writers
+    racing for the same free range can deadlock on InnoDB's gap locks; the one rolled
+    back fails like any other database error.
+    """
+    checks: List[Tuple[str, str, Any]] = []
+    if teacher_id is not None:
+        checks.append(("teacher", "teacher_id", teacher_id))
+    room = " ".join(str(location or "").split())
+    if room:
+        checks.append(("location", "location", room))
+
+    conflicts: List[Dict[str, Any]] = []
+    for kind, column, value in checks:
+        cur.execute(
+            f"SELECT schedule_id, teacher_id, location, start_time, end_time FROM schedules "
+            f"WHERE {column}=%s AND start_time < %s AND end_time > %s AND schedule_id <> %s "
+            f"ORDER BY start_time FOR UPDATE",
+            (value, end, start, exclude_id or 0),
+        )
+        for row in cast(List[Dict[str, Any]], cur.fetchall()):
+            conflicts.append({"type": kind, **row})
+    return conflicts
+
+
 def add_schedule(subject_id: int, teacher_id: Optional[int], title: str, location: str, start_time: str, end_time: str) -> int:
+    """
+    Insert a schedule unless it double-books the teacher or the location (checked in the
+    same transaction). Raises ScheduleConflictError on a clash; returns -1 on other errors.
+    """
     conn: Optional[pymysql.connections.Connection] = None
     try:
+        start = parse_slot_time(start_time)
+        end = parse_slot_time(end_time)
         conn = get_connection()
         with conn.cursor() as cur:
+            conflicts = _locked_schedule_conflicts(cur, teacher_id, location, start, end, None)
+            if conflicts:
+                raise ScheduleConflictError(conflicts)
             cur.execute(
                 "INSERT INTO schedules (subject_id, teacher_id, title, location, start_time, end_time) VALUES (%s, %s, %s, %s, %s, %s)",
-                (subject_id, teacher_id, title, location, start_time, end_time),
+                (subject_id, teacher_id, title, location, start, end),
             )
+            new_id = int(cur.lastrowid or -1)
+            _bump_collection_version(cur, "schedules")
             conn.commit()
-            return int(cur.lastrowid or -1)
-        
+            _notify_change("schedules", "insert", new_id)
+            return new_id
+
+    except ScheduleConflictError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -612,10 +1837,39 @@ def update_schedule(
     start_time: Optional[str],
     end_time: Optional[str]
 ) -> int:
+    """
+    Update the given fields of a schedule (None keeps the stored value). The row is locked
+    and the resulting slot re-checked for double-booking in the same transaction.
+    Raises ScheduleConflictError on a clash; returns the affected row count (0 on error).
+    """
     conn: Optional[pymysql.connections.Connection] = None
     try:
         conn = get_connection()
         with conn.cursor() as cur:
+            cur.execute(
+                "SELECT teacher_id, location, start_time, end_time FROM schedules WHERE schedule_id=%s FOR UPDATE",
+                (schedule_id,),
+            )
+            current = cast(Optional[Dict[str, Any]], cur.fetchone())
+            if current is None:
+                conn.rollback()
+                return 0
+
+            start = parse_slot_time(start_time if start_time is not None else current["start_time"])
+            end = parse_slot_time(end_time if end_time is not None else current["end_time"])
+            if end <= start:
+                raise ValueError("end_time must be after start_time")
+            conflicts = _locked_schedule_conflicts(
+                cur,
+                teacher_id if teacher_id is not None else current["teacher_id"],
+                location if location is not None else current["location"],
+                start,
+                end,
+                schedule_id,
+            )
+            if conflicts:
+                raise ScheduleConflictError(conflicts)
+
             sql = """
                 UPDATE schedules
                 SET
@@ -623,14 +1877,24 @@ def update_schedule(
                     teacher_id = COALESCE(%s, teacher_id),
                     title = COALESCE(%s, title),
                     location = COALESCE(%s, location),
-                    start_time = COALESCE(%s, start_time),
-                    end_time = COALESCE(%s, end_time)
+                    start_time = %s,
+                    end_time = %s
                 WHERE schedule_id=%s
             """
-            cur.execute(sql, (subject_id, teacher_id, title, location, start_time, end_time, schedule_id))
+            cur.execute(sql, (subject_id, teacher_id, title, location, start, end, schedule_id))
+            affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "schedules")
             conn.commit()
-            return cur.rowcount
-        
+            if affected:
+                _notify_change("schedules", "update", schedule_id)
+            return affected
+
+    except ScheduleConflictError:
+        if conn:
+            conn.rollback()
+        raise
+
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -649,7 +1913,11 @@ def delete_schedule(schedule_id: int) -> int:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM schedules WHERE schedule_id=%s", (schedule_id,))
             affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "schedules")
             conn.commit()
+            if affected:
+                _notify_change("schedules", "delete", schedule_id)
             return affected
         
     except Exception as exc:
@@ -667,6 +1935,7 @@ def delete_schedule(schedule_id: int) -> int:
 # NOTICES
 # ======================
 
+@replica_read
 def get_all_notices() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -684,6 +1953,49 @@ def get_all_notices() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_notices_page(limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of notices ordered by notice_id DESC, starting below `after`.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute("SELECT notice_id, title, content, created_at, posted_by FROM notices ORDER BY notice_id DESC LIMIT %s", (limit + 1,))
+            else:
+                cur.execute("SELECT notice_id, title, content, created_at, posted_by FROM notices WHERE notice_id < %s ORDER BY notice_id DESC LIMIT %s", (after, limit + 1))
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_notices_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_notice(notice_id: int) -> Optional[Dict[str, Any]]:
+    """Return one notices row by id, or None if it does not exist (or on error)."""
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT notice_id, title, content, created_at, posted_by FROM notices WHERE notice_id=%s LIMIT 1", (notice_id,))
+            return cast(Optional[Dict[str, Any]], cur.fetchone())
+
+    except Exception as exc:
+        print("[ERROR] get_notice:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
 def add_notice(title: str, content: str, posted_by: str, created_at: Optional[str] = None) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -693,8 +2005,11 @@ def add_notice(title: str, content: str, posted_by: str, created_at: Optional[st
                 cur.execute("INSERT INTO notices (title, content, created_at, posted_by) VALUES (%s, %s, %s, %s)", (title, content, created_at, posted_by))
             else:
                 cur.execute("INSERT INTO notices (title, content, posted_by) VALUES (%s, %s, %s)", (title, content, posted_by))
+            new_id = int(cur.lastrowid or -1)
+            _bump_collection_version(cur, "notices")
             conn.commit()
-            return int(cur.lastrowid or -1)
+            _notify_change("notices", "insert", new_id)
+            return new_id
         
     except Exception as exc:
         if conn:
@@ -721,8 +2036,13 @@ def update_notice(notice_id: int, title: Optional[str], content: Optional[str],
                 WHERE notice_id=%s
             """
             cur.execute(sql, (title, content, posted_by, created_at, notice_id))
+            affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "notices")
             conn.commit()
-            return cur.rowcount
+            if affected:
+                _notify_change("notices", "update", notice_id)
+            return affected
         
     except Exception as exc:
         if conn:
@@ -742,7 +2062,11 @@ def delete_notice(notice_id: int) -> int:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM notices WHERE notice_id=%s", (notice_id,))
             affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "notices")
             conn.commit()
+            if affected:
+                _notify_change("notices", "delete", notice_id)
             return affected
         
     except Exception as exc:
@@ -760,6 +2084,7 @@ def delete_notice(notice_id: int) -> int:
 # EVENTS
 # ======================
 
+@replica_read
 def get_all_events() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -777,14 +2102,60 @@ def get_all_events() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_events_page(limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of events ordered by event_id DESC, starting below `after`.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute("SELECT event_id, title, content, last_date, posted_by, created_at FROM events ORDER BY event_id DESC LIMIT %s", (limit + 1,))
+            else:
+                cur.execute("SELECT event_id, title, content, last_date, posted_by, created_at FROM events WHERE event_id < %s ORDER BY event_id DESC LIMIT %s", (after, limit + 1))
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_events_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_event(event_id: int) -> Optional[Dict[str, Any]]:
+    """Return one events row by id, or None if it does not exist (or on error)."""
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT event_id, title, content, last_date, posted_by, created_at FROM events WHERE event_id=%s LIMIT 1", (event_id,))
+            return cast(Optional[Dict[str, Any]], cur.fetchone())
+
+    except Exception as exc:
+        print("[ERROR] get_event:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
 def add_event(title: str, content: str, last_date: str, posted_by: str) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
         conn = get_connection()
         with conn.cursor() as cur:
             cur.execute("INSERT INTO events (title, content, last_date, posted_by) VALUES (%s, %s, %s, %s)", (title, content, last_date, posted_by))
+            new_id = int(cur.lastrowid or -1)
+            _bump_collection_version(cur, "events")
             conn.commit()
-            return int(cur.lastrowid or -1)
+            _notify_change("events", "insert", new_id)
+            return new_id
         
     except Exception as exc:
         if conn:
@@ -811,8 +2182,13 @@ def update_event(event_id: int, title: Optional[str], content: Optional[str], la
                 WHERE event_id=%s
             """
             cur.execute(sql, (title, content, last_date, posted_by, event_id))
+            affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "events")
             conn.commit()
-            return cur.rowcount
+            if affected:
+                _notify_change("events", "update", event_id)
+            return affected
         
     except Exception as exc:
         if conn:
@@ -832,7 +2208,11 @@ def delete_event(event_id: int) -> int:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM events WHERE event_id=%s", (event_id,))
             affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "events")
             conn.commit()
+            if affected:
+                _notify_change("events", "delete", event_id)
             return affected
         
     except Exception as exc:
@@ -850,6 +2230,7 @@ def delete_event(event_id: int) -> int:
 # JOBS
 # ======================
 
+@replica_read
 def get_all_jobs() -> List[Dict[str, Any]]:
     conn: Optional[pymysql.connections.Connection] = None
     try:
@@ -867,14 +2248,60 @@ def get_all_jobs() -> List[Dict[str, Any]]:
             conn.close()
 
 
+@replica_read
+def get_jobs_page(limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keyset page of job_updates ordered by job_id DESC, starting below `after`.
+    Fetches limit + 1 rows so the caller can tell whether another page exists.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            if after is None:
+                cur.execute("SELECT job_id, title, description, company, apply_link, posted_by, created_at FROM job_updates ORDER BY job_id DESC LIMIT %s", (limit + 1,))
+            else:
+                cur.execute("SELECT job_id, title, description, company, apply_link, posted_by, created_at FROM job_updates WHERE job_id < %s ORDER BY job_id DESC LIMIT %s", (after, limit + 1))
+            return cast(List[Dict[str, Any]], cur.fetchall())
+        
+    except Exception as exc:
+        print("[ERROR] get_jobs_page:", exc)
+        return []
+    
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_job(job_id: int) -> Optional[Dict[str, Any]]:
+    """Return one job_updates row by id, or None if it does not exist (or on error)."""
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT job_id, title, description, company, apply_link, posted_by, created_at FROM job_updates WHERE job_id=%s LIMIT 1", (job_id,))
+            return cast(Optional[Dict[str, Any]], cur.fetchone())
+
+    except Exception as exc:
+        print("[ERROR] get_job:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
 def add_job(title: str, description: str, company: str, apply_link: str, posted_by: str) -> int:
     conn: Optional[pymysql.connections.Connection] = None
     try:
         conn = get_connection()
         with conn.cursor() as cur:
             cur.execute("INSERT INTO job_updates (title, description, company, apply_link, posted_by) VALUES (%s, %s, %s, %s, %s)", (title, description, company, apply_link, posted_by))
+            new_id = int(cur.lastrowid or -1)
+            _bump_collection_version(cur, "job_updates")
             conn.commit()
-            return int(cur.lastrowid or -1)
+            _notify_change("job_updates", "insert", new_id)
+            return new_id
         
     except Exception as exc:
         if conn:
@@ -902,8 +2329,13 @@ def update_job(job_id: int, title: Optional[str], description: Optional[str], co
                 WHERE job_id=%s
             """
             cur.execute(sql, (title, description, company, apply_link, posted_by, job_id))
+            affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "job_updates")
             conn.commit()
-            return cur.rowcount
+            if affected:
+                _notify_change("job_updates", "update", job_id)
+            return affected
         
     except Exception as exc:
         if conn:
@@ -923,7 +2355,11 @@ def delete_job(job_id: int) -> int:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM job_updates WHERE job_id=%s", (job_id,))
             affected = cur.rowcount
+            if affected:
+                _bump_collection_version(cur, "job_updates")
             conn.commit()
+            if affected:
+                _notify_change("job_updates", "delete", job_id)
             return affected
         
     except Exception as exc:
@@ -974,14 +2410,54 @@ def get_user_by_login_id(login_id: str) -> Optional[Dict[str, Any]]:
 def verify_user(login_id: str, password: str) -> Optional[Dict[str, Any]]:
     """
     Verify a login_id and password. Returns full row dict if OK, else None.
-    Passwords are plain-text in this simple setup (replace with bcrypt in production).
+    Hashes are checked in the password process pool (may raise HasherBusyError).
+    Legacy plain-text rows, and hashes made with outdated cost settings, are
+    re-hashed and stored on a successful login.
     """
     user = get_user_by_login_id(login_id)
     if not user:
         return None
-    if user.get("password") == password:
-        return user
-    return None
+    stored = str(user.get("password") or "")
+
+    if is_hashed(stored):
+        if not password_hasher.verify(password, stored):
+            return None
+        upgrade = needs_rehash(stored)
+    else:
+        if not stored or not hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8")):
+            return None
+        upgrade = True
+
+    if upgrade:
+        try:
+            set_password_hash(login_id, password_hasher.hash(password))
+        except Exception as exc:
+            # The login itself succeeded; the upgrade is retried next time
+            print("[ERROR] verify_user rehash:", exc)
+    return user
+
+
+def set_password_hash(login_id: str, encoded: str) -> int:
+    """Store an already-encoded password hash for the user identified by login_id."""
+    table = {"65": "admins", "70": "teachers", "83": "students"}.get(login_id[:2])
+    if table is None:
+        return 0
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(f"UPDATE {table} SET password=%s WHERE login_id=%s", (encoded, login_id))
+            affected = cur.rowcount
+            conn.commit()
+            return affected
+    except Exception as exc:
+        if conn:
+            conn.rollback()
+        print("[ERROR] set_password_hash:", exc)
+        return 0
+    finally:
+        if conn:
+            conn.close()
 
 
 def add_token_to_blocklist(jti: str, expires_at: Optional[str] = None) -> bool:
@@ -999,7 +2475,8 @@ def add_token_to_blocklist(jti: str, expires_at: Optional[str] = None) -> bool:
                 (jti, expires_at),
             )
             conn.commit()
-            return True
+        _notify_change("token_blocklist", "insert", jti, {"jti": jti, "expires_at": expires_at})
+        return True
     except Exception as exc:
         if conn:
             conn.rollback()
@@ -1028,4 +2505,245 @@ def is_token_revoked(jti: str) -> bool:
         return True
     finally:
         if conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+
+def purge_expired_tokens(batch_size: int = 1000, max_batches: Optional[int] = None, pause: float = 0.0) -> Dict[str, Any]:
+    """
+    Delete blocklist rows whose expires_at (UTC) has passed, batch_size rows per
+    transaction so row locks and undo stay small. Stops when a batch comes back
+    short or after max_batches. pause sleeps between batches to yield to traffic.
+    Returns { purged, batches, seconds, ok }.
+    """
+    started = time.perf_counter()
+    purged = 0
+    batches = 0
+    ok = True
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = _standalone_connection()
+        with conn.cursor() as cur:
+            while max_batches is None or batches < max_batches:
+                cur.execute(
+                    "DELETE FROM token_blocklist WHERE expires_at < UTC_TIMESTAMP() ORDER BY expires_at LIMIT %s",
+                    (batch_size,),
+                )
+                deleted = cur.rowcount
+                conn.commit()
+                purged += deleted
+                batches += 1
+                if deleted < batch_size:
+                    break
+                if pause > 0:
+                    time.sleep(pause)
+    except Exception as exc:
+        ok = False
+        if conn:
+            conn.rollback()
+        print("[ERROR] purge_expired_tokens:", exc)
+    finally:
+        if conn:
+            conn.close()
+
+    return {"purged": purged, "batches": batches, "seconds": round(time.perf_counter() - started, 3), "ok": ok}
+
+
+def get_active_revoked_tokens() -> Optional[List[Dict[str, Any]]]:
+    """
+    Return every blocklisted jti that has not expired yet (expires_at is stored in UTC).
+    Returns None on error so callers can tell a failure from an empty blocklist.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT jti, expires_at FROM token_blocklist WHERE expires_at IS NULL OR expires_at > UTC_TIMESTAMP()")
+            return cast(List[Dict[str, Any]], cur.fetchall())
+    except Exception as exc:
+        print("[ERROR] get_active_revoked_tokens:", exc)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+# ============================================================
+# DASHBOARD
+# ============================================================
+
+@cached(dashboard_cache, DASHBOARD_TABLES, store_if=_cacheable)
+def get_dashboard(notices: int = 5, events: int = 5, jobs: int = 5) -> Optional[Dict[str, Any]]:
+    """
+    Everything the landing page shows, read over one connection:
+    recent notices, upcoming events (last_date not passed), latest jobs,
+    all programs and student/teacher/program counts.
+    Returns None on error.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT notice_id, title, content, created_at, posted_by FROM notices ORDER BY notice_id DESC LIMIT %s",
+                (notices,),
+            )
+            recent_notices = cur.fetchall()
+            cur.execute(
+                "SELECT event_id, title, content, last_date, posted_by, created_at FROM events "
+                "WHERE last_date >= NOW() ORDER BY last_date LIMIT %s",
+                (events,),
+            )
+            upcoming_events = cur.fetchall()
+            cur.execute(
+                "SELECT job_id, title, description, company, apply_link, posted_by, created_at FROM job_updates ORDER BY job_id DESC LIMIT %s",
+                (jobs,),
+            )
+            latest_jobs = cur.fetchall()
+            cur.execute("SELECT program_id, code, name, duration, level, description FROM programs ORDER BY program_id DESC")
+            programs = cur.fetchall()
+            cur.execute(
+                "SELECT (SELECT COUNT(*) FROM students) AS students, (SELECT COUNT(*) FROM teachers) AS teachers"
+            )
+            counts = cast(Dict[str, Any], cur.fetchone() or {})
+            return {
+                "notices": recent_notices,
+                "events": upcoming_events,
+                "jobs": latest_jobs,
+                "programs": programs,
+                "counts": {
+                    "students": int(counts.get("students") or 0),
+                    "teachers": int(counts.get("teachers") or 0),
+                    "programs": len(programs),
+                },
+            }
+
+    except Exception as exc:
+        print("[ERROR] get_dashboard:", exc)
+        return None
+
+    finally:
+        if conn:
+            conn.close()
+
+
+# ============================================================
+# COLLECTION VERSIONS
+# ============================================================
+
+@replica_read
+def get_collection_version(name: str) -> Optional[int]:
+    """Return the current version counter of a collection, or None if unknown/unavailable."""
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute("SELECT version FROM collection_versions WHERE name=%s LIMIT 1", (name,))
+            row = cast(Optional[Dict[str, Any]], cur.fetchone())
+            return int(row["version"]) if row else None
+    except Exception as exc:
+        print("[ERROR] get_collection_version:", exc)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def _bump_collection_version(cur: Any, name: str) -> None:
+    """
+    Increment a collection's version counter (creating it on first write) on the
+    caller's cursor, inside the transaction that changes the collection's rows.
+    Errors propagate so the write rolls back rather than committing under an old tag.
+    """
+    cur.execute(
+        "INSERT INTO collection_versions (name, version) VALUES (%s, 1) ON DUPLICATE KEY UPDATE version = version + 1",
+        (name,),
+    )
+
+
+# ============================================================
+# STREAMING (unbuffered exports)
+# ============================================================
+
+# Same columns and order as the matching get_all_* helpers
+STREAM_QUERIES: Dict[str, str] = {
+    "teachers": "SELECT teacher_id, login_id, name, email, subject FROM teachers ORDER BY teacher_id DESC",
+    "students": "SELECT student_id, login_id, name, email, roll_no, semester, program_id FROM students ORDER BY student_id DESC",
+    "schedules": "SELECT schedule_id, subject_id, teacher_id, title, location, start_time, end_time FROM schedules ORDER BY start_time DESC",
+    "notices": "SELECT notice_id, title, content, created_at, posted_by FROM notices ORDER BY notice_id DESC",
+    "events": "SELECT event_id, title, content, last_date, posted_by, created_at FROM events ORDER BY event_id DESC",
+    "jobs": "SELECT job_id, title, description, company, apply_link, posted_by, created_at FROM job_updates ORDER BY job_id DESC",
+}
+STREAM_FETCH_SIZE: int = int(getenv("STREAM_FETCH_SIZE", "500"))
+
+
+def get_collection_rows(name: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Buffered read of a whole collection (see STREAM_QUERIES) for in-memory indexes.
+    Returns None on error so a failed load is not mistaken for an empty table.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cur:
+            cur.execute(STREAM_QUERIES[name])
+            return cast(List[Dict[str, Any]], cur.fetchall())
+    except Exception as exc:
+        print("[ERROR] get_collection_rows:", exc)
+        return None
+    finally:
+        if conn:
+            conn.close()
+
+
+def iter_collection(name: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every row of a collection (see STREAM_QUERIES) through an unbuffered
+    server-side cursor, so memory stays flat however large the table is.
+    The connection is held until the generator is exhausted or closed; if the
+    consumer stops early the connection is dropped instead of draining the result.
+    Errors are logged and re-raised: a streamed response must be cut off, not end as
+    if the collection were complete.
+    """
+    conn: Optional[pymysql.connections.Connection] = None
+    finished = False
+    try:
+        conn = _standalone_connection()
+        cur = conn.cursor(pymysql.cursors.SSDictCursor)
+        cur.execute(STREAM_QUERIES[name])
+        while True:
+            rows = cur.fetchmany(STREAM_FETCH_SIZE)
+            if not rows:
+                break
+            yield from cast(List[Dict[str, Any]], rows)
+        cur.close()
+        finished = True
+    except Exception as exc:
+        print("[ERROR] iter_collection:", exc)
+        raise
+    finally:
+        if conn:
+            if finished:
+                conn.close()
+            else:
+                # Unread rows are still on the wire: closing the cursor would drain them
+                cast(PooledConnection, conn).discard()
+
+
+# -------------------------
+# Instrumentation (see the top of this module)
+# -------------------------
+_NOT_INSTRUMENTED = frozenset({
+    "get_pool", "get_pool_stats", "get_connection", "instrumented", "add_change_listener", "add_query_listener",
+    "get_replica_set", "get_replica_stats", "replica_reads", "replica_read",
+    "commit_request_session", "checkpoint_request_session", "rollback_request_session", "close_request_session",
+})
+
+for _name, _fn in list(globals().items()):
+    if (
+        inspect.isfunction(_fn)
+        and _fn.__module__ == __name__
+        and not _name.startswith("_")
+        and _name not in _NOT_INSTRUMENTED
+        and not inspect.isgeneratorfunction(_fn)
+    ):
+        globals()[_name] = instrumented(_fn)
@@ -0,0 +1,86 @@
+"""
+@author Anish
+@description Flask JSON provider: orjson when installed, ISO-8601 datetimes and numeric Decimals either way
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any
+from datetime import date, datetime, time
+from decimal import Decimal
+import dataclasses
+import uuid
+
+try:  # optional: pip install orjson
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+from flask.json.provider import DefaultJSONProvider
+
+
+def _default(o: Any) -> Any:
+    """
+    Types neither encoder handles natively. datetime/date/time come out as ISO-8601
+    (naive values stay naive: MySQL DATETIMEs carry no zone), Decimal as a number.
+    """
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, Decimal):
+        return float(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in for Flask's DefaultJSONProvider (jsonify, request.get_json, app.json.dumps).
+    With orjson installed, serialising a list of DB rows is several times faster and
+    responses are built straight from the encoded bytes. Without it the stdlib encoder
+    is used with the same ISO-8601 / Decimal rules, so output does not depend on
+    whether the optional package is present.
+    Keys keep their SELECT column order (sort_keys is off).
+    """
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+    def _orjson_options(self, indent: bool = False) -> int:
+        assert orjson is not None
+        # orjson's native datetime/date/time output matches isoformat() in _default
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=_default, option=self._orjson_options(indent))
+        if indent:
+            body += b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,45 @@
+"""
+@author Anish
+@description Background maintenance jobs (token_blocklist purge)
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, Optional
+import threading
+from src.db import purge_expired_tokens
+
+
+def run_token_purge(batch_size: int = 1000, max_batches: Optional[int] = None, pause: float = 0.0) -> Dict[str, Any]:
+    """Purge expired blocklist rows once and log how many went and how long it took."""
+    report = purge_expired_tokens(batch_size=batch_size, max_batches=max_batches, pause=pause)
+    status = "INFO" if report["ok"] else "ERROR"
+    print(f"[{status}] token purge: {report['purged']} rows in {report['batches']} batches, {report['seconds']}s")
+    return report
+
+
+class TokenPurger(threading.Thread):
+    """
+    Daemon thread that purges expired blocklist rows every `interval` seconds.
+    Several workers running it at once is harmless: each batch deletes whatever
+    is still expired and the rest find nothing to do.
+    """
+
+    def __init__(self, interval: float, batch_size: int = 1000, pause: float = 0.05) -> None:
+        super().__init__(name="token-purger", daemon=True)
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.last_report = run_token_purge(self.batch_size, pause=self.pause)
+            except Exception as exc:
+                print("[ERROR] TokenPurger:", exc)
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,255 @@
+"""
+@author Anish
+@description Password hashing (PBKDF2 / scrypt) run in a bounded process pool off the request threads
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from os import getenv
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+
+PASSWORD_HASH_ALGORITHM: str = getenv("PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256")
+PASSWORD_PBKDF2_ITERATIONS: int = int(getenv("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+PASSWORD_SCRYPT_N: int = int(getenv("PASSWORD_SCRYPT_N", "16384"))
+PASSWORD_SCRYPT_R: int = int(getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P: int = int(getenv("PASSWORD_SCRYPT_P", "1"))
+# 0 workers hashes on the calling thread (no process pool)
+PASSWORD_HASH_WORKERS: int = int(getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_QUEUE: int = int(getenv("PASSWORD_HASH_QUEUE", str(max(1, PASSWORD_HASH_WORKERS) * 8)))
+PASSWORD_HASH_TIMEOUT: float = float(getenv("PASSWORD_HASH_TIMEOUT", "10"))
+# Queue slots bulk imports may hold at once; the rest stay free for logins. The default
+# (one per worker) keeps bulk throughput while a login waits behind at most one job per worker
+PASSWORD_HASH_BULK_SLOTS: int = int(getenv("PASSWORD_HASH_BULK_SLOTS", str(max(1, PASSWORD_HASH_WORKERS))))
+
+ALGORITHMS = ("pbkdf2_sha256", "scrypt")
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing queue stays full for longer than the timeout."""
+
+
+# -------------------------
+# Encoding (pure functions, picklable for worker processes)
+# -------------------------
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def current_params(algorithm: Optional[str] = None) -> Tuple[Any, ...]:
+    """Cost parameters configured for an algorithm."""
+    algorithm = algorithm or PASSWORD_HASH_ALGORITHM
+    if algorithm == "pbkdf2_sha256":
+        return (PASSWORD_PBKDF2_ITERATIONS,)
+    if algorithm == "scrypt":
+        return (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+
+
+def hash_password_sync(password: str, algorithm: str, params: Tuple[Any, ...]) -> str:
+    """
+    Hash on the calling thread. Formats:
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    """
+    salt = os.urandom(16)
+    secret = password.encode("utf-8")
+    if algorithm == "pbkdf2_sha256":
+        (iterations,) = params
+        digest = hashlib.pbkdf2_hmac("sha256", secret, salt, int(iterations))
+    elif algorithm == "scrypt":
+        n, r, p = params
+        digest = hashlib.scrypt(secret, salt=salt, n=int(n), r=int(r), p=int(p), maxmem=256 * 1024 * 1024, dklen=32)
+    else:
+        raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+    return "$".join([algorithm, *(str(v) for v in params), _b64(salt), _b64(digest)])
+
+
+def verify_password_sync(password: str, encoded: str) -> bool:
+    """Check a password against an encoded hash on the calling thread."""
+    parts = encoded.split("$")
+    secret = password.encode("utf-8")
+    try:
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = _unb64(parts[3])
+            digest = hashlib.pbkdf2_hmac("sha256", secret, _unb64(parts[2]), int(parts[1]))
+        elif parts[0] == "scrypt" and len(parts) == 6:
+            expected = _unb64(parts[5])
+            digest = hashlib.scrypt(
+                secret, salt=_unb64(parts[4]), n=int(parts[1]), r=int(parts[2]), p=int(parts[3]),
+                maxmem=256 * 1024 * 1024, dklen=len(expected),
+            )
+        else:
+            return False
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+
+def is_hashed(stored: Optional[str]) -> bool:
+    """True if a stored password value is one of our encoded hashes (else legacy plain text)."""
+    if not stored:
+        return False
+    algorithm = stored.split("$", 1)[0]
+    return algorithm in ALGORITHMS and stored.count("$") >= 3
+
+
+def needs_rehash(encoded: str) -> bool:
+    """True if a hash was made with another algorithm or other cost parameters than configured now."""
+    parts = encoded.split("$")
+    if parts[0] != PASSWORD_HASH_ALGORITHM:
+        return True
+    params = tuple(str(v) for v in current_params())
+    return tuple(parts[1:1 + len(params)]) != params
+
+
+def _warmup() -> bool:
+    return True
+
+
+# -------------------------
+# Process pool front-end
+# -------------------------
+class PasswordHasher:
+    """
+    Runs KDF work in a process pool so a login storm burns worker processes'
+    CPU instead of holding the GIL in Flask threads. At most `queue_size` jobs
+    may be pending; callers wait up to `timeout` for a slot, then get HasherBusyError
+    so the route can shed load with a 503 rather than queueing forever.
+
+    hash_many (bulk imports) may hold at most `bulk_slots` of those slots, always
+    leaving at least one for interactive logins and single-user writes, so a large
+    import slows down instead of locking everyone out.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        queue_size: int = PASSWORD_HASH_QUEUE,
+        timeout: float = PASSWORD_HASH_TIMEOUT,
+        bulk_slots: int = PASSWORD_HASH_BULK_SLOTS,
+    ) -> None:
+        # Inside a pool worker (e.g. app.py re-imported under spawn) never start another pool
+        if multiprocessing.parent_process() is not None:
+            workers = 0
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self.bulk_slots = max(1, min(bulk_slots, queue_size - 1))
+        self._bulk_slots = threading.BoundedSemaphore(self.bulk_slots)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Start the worker processes now. Call this early, before the app starts
+        other threads, because workers are forked from the current process.
+        """
+        if self.workers > 0:
+            self._run(_warmup)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password_sync, password, PASSWORD_HASH_ALGORITHM, current_params())
+
+    def hash_if_plain(self, password: str) -> str:
+        """Hash a password unless it is already an encoded hash (e.g. migrated data)."""
+        return password if is_hashed(password) else self.hash(password)
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """
+        Hash a batch (bulk imports) with at most bulk_slots jobs in flight; takes about
+        len(passwords) x one hash / min(workers, bulk_slots). Raises HasherBusyError if
+        no bulk slot frees up within the timeout.
+        """
+        if self.workers <= 0:
+            return [self.hash_if_plain(p) for p in passwords]
+        params = current_params()
+        futures: List[Optional[Future]] = []
+        try:
+            for p in passwords:
+                if is_hashed(p):
+                    futures.append(None)
+                    continue
+                if not self._bulk_slots.acquire(timeout=self.timeout):
+                    raise HasherBusyError("Password hashing queue is full")
+                try:
+                    future = self._submit(hash_password_sync, p, PASSWORD_HASH_ALGORITHM, params)
+                except Exception:
+                    self._bulk_slots.release()
+                    raise
+                future.add_done_callback(lambda _f: self._bulk_slots.release())
+                futures.append(future)
+        except Exception:
+            # Don't leave the rest of a failed batch occupying the workers
+            for f in futures:
+                if f is not None:
+                    f.cancel()
+            raise
+        return [p if f is None else self._result(f) for p, f in zip(passwords, futures)]
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return bool(self._run(verify_password_sync, password, encoded))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "bulk_slots": self.bulk_slots, "algorithm": PASSWORD_HASH_ALGORITHM, "params": current_params()}
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # fork where available: spawn would re-import app.py in every worker
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                )
+            return self._executor
+
+    def _submit(self, fn: Any, *args: Any) -> Future:
+        """Queue a job, waiting up to timeout for a free slot."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusyError("Password hashing queue is full")
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            self.shutdown()
+            raise
+        future.add_done_callback(lambda _f: self._slots.release())
+        return future
+
+    def _result(self, future: Future) -> Any:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # A worker died: rebuild the pool on next use
+            self.shutdown()
+            raise
+
+    def _run(self, fn: Any, *args: Any) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+        return self._result(self._submit(fn, *args))
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,257 @@
+"""
+@author Anish
+@description Thread-safe bounded connection pool used behind db.get_connection()
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from collections import deque
+import os
+import threading
+import time
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be borrowed within the acquire timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw DB-API connection borrowed from a ConnectionPool.
+    Every attribute is forwarded to the raw connection, except close() which
+    hands the connection back to the pool instead of closing the socket.
+    This keeps the existing `conn.close()` calls in db.py working unchanged.
+    """
+
+    __slots__ = ("_raw", "_pool", "_released")
+
+    def __init__(self, raw: Any, pool: "ConnectionPool") -> None:
+        self._raw = raw
+        self._pool = pool
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        if self._released:
+            raise RuntimeError("Connection was already returned to the pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def raw(self) -> Any:
+        """The underlying driver connection."""
+        return self._raw
+
+    def close(self) -> None:
+        """Return the connection to the pool (safe to call more than once)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw)
+
+    def discard(self) -> None:
+        """Drop the connection instead of returning it (e.g. after a protocol error)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw, discard=True)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    connect:      factory returning a new raw connection
+    reset:        called on every return; must leave the connection with no open
+                  transaction and default session state (raise to discard it)
+    check:        health check run on borrow (raise to discard and reconnect)
+    min_size:     idle connections kept open even past idle_timeout
+    max_size:     hard cap on open connections (idle + borrowed)
+    idle_timeout: seconds an idle connection may sit unused before it is closed
+    acquire_timeout: seconds to wait for a free slot before PoolTimeoutError
+    ping_interval: only health-check connections idle for at least this many seconds
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        reset: Optional[Callable[[Any], None]] = None,
+        check: Optional[Callable[[Any], None]] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        acquire_timeout: float = 10.0,
+        ping_interval: float = 0.0,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._connect = connect
+        self._reset = reset
+        self._check = check
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.ping_interval = ping_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._pid = os.getpid()
+
+    # -------------------------
+    # Borrow / return
+    # -------------------------
+    def acquire(self) -> PooledConnection:
+        """Borrow a connection, waiting up to acquire_timeout if the pool is exhausted."""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            raw, idle_since = self._take_slot(deadline)
+            if raw is None:
+                # We reserved a slot for a brand-new connection
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._free_slot()
+                    raise
+                return PooledConnection(raw, self)
+
+            if self._check is not None and time.monotonic() - idle_since >= self.ping_interval:
+                try:
+                    self._check(raw)
+                except Exception:
+                    # Stale socket (server restart, wait_timeout...) — drop it and retry
+                    self._close_raw(raw)
+                    self._free_slot()
+                    continue
+            return PooledConnection(raw, self)
+
+    def release(self, raw: Any, discard: bool = False) -> None:
+        """Give a connection back; it is reset first and closed if that fails."""
+        if not discard and self._reset is not None and os.getpid() == self._pid:
+            try:
+                self._reset(raw)
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if os.getpid() != self._pid:
+                # Borrowed before a fork: the socket belongs to the parent, just forget it
+                return
+            if discard or self._closed:
+                keep = False
+            else:
+                keep = True
+                self._idle.append((raw, time.monotonic()))
+            if not keep:
+                self._size -= 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_raw(raw)
+
+    # -------------------------
+    # Housekeeping
+    # -------------------------
+    def close_all(self) -> None:
+        """Close every idle connection and refuse to keep borrowed ones on return."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._close_raw(raw)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of pool occupancy."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                "max_size": self.max_size,
+            }
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _take_slot(self, deadline: float) -> Tuple[Optional[Any], float]:
+        """
+        Under the lock, either pop an idle connection or reserve capacity for a
+        new one (returns (None, 0.0)). Blocks while the pool is at max_size.
+        """
+        expired = []
+        try:
+            with self._cond:
+                self._check_fork()
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                expired = self._prune_idle()
+
+                while True:
+                    if self._idle:
+                        # LIFO keeps the warmest connections busy and lets the rest expire
+                        raw, idle_since = self._idle.pop()
+                        return raw, idle_since
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, 0.0
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"Timed out after {self.acquire_timeout}s waiting for a DB connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+        finally:
+            for raw in expired:
+                self._close_raw(raw)
+
+    def _prune_idle(self) -> list:
+        """Remove idle connections past idle_timeout, keeping min_size. Caller holds the lock."""
+        expired = []
+        if self.idle_timeout <= 0:
+            return expired
+        cutoff = time.monotonic() - self.idle_timeout
+        # Oldest connections sit at the left end of the deque
+        while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+            raw, _ = self._idle.popleft()
+            self._size -= 1
+            expired.append(raw)
+        return expired
+
+    def _free_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _check_fork(self) -> None:
+        """A forked worker must not share sockets with its parent. Caller holds the lock."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._idle.clear()
+            self._size = 0
+
+    @staticmethod
+    def _close_raw(raw: Any) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
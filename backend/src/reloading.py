@@ -0,0 +1,111 @@
+"""
+@author Anish
+@description Base class for in-memory indexes rebuilt from the database on a background thread
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Hashable, Optional, Set
+import threading
+import time
+
+
+class ReloadingIndex:
+    """
+    Keeps an in-memory index loaded from the database and fresh across workers.
+
+    A subclass provides:
+      _read()          everything the index is built from, or None on error; runs with
+                       no lock held, so it may also build the new structures
+      _install(data)   swap `data` in (called with the lock held)
+      _replay(key)     re-read one entry written while a load was reading
+    and calls _note_write(key) under the lock before applying a one-entry change.
+
+    The first use starts a load and every `sync_interval` seconds after that another
+    one, always on a background thread: readers keep the current index until the new
+    one is installed. After a failed load the next try waits `retry_interval` (or
+    sync_interval if shorter) instead of starting on every request.
+    """
+
+    retry_interval: float = 5.0
+    thread_name = "index-sync"
+
+    def __init__(self, sync_interval: float) -> None:
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._loading: Optional[threading.Thread] = None
+        self._attempted_at: Optional[float] = None
+        # keys written while a load was reading, replayed once it is installed
+        self._touched_during_load: Optional[Set[Hashable]] = None
+
+    def _read(self) -> Optional[Any]:
+        raise NotImplementedError
+
+    def _install(self, data: Any) -> None:
+        raise NotImplementedError
+
+    def _replay(self, key: Hashable) -> None:
+        raise NotImplementedError
+
+    def load(self) -> bool:
+        """Rebuild now, on the calling thread. Returns False (keeping the old index) if the read failed."""
+        with self._load_lock:
+            with self._lock:
+                self._touched_during_load = set()
+            try:
+                data = self._read()
+            except Exception as exc:
+                print(f"[ERROR] {type(self).__name__}.load:", exc)
+                data = None
+
+            with self._lock:
+                touched = self._touched_during_load or set()
+                self._touched_during_load = None
+                if data is None:
+                    return False
+                self._install(data)
+                self._loaded_at = time.monotonic()
+
+        # The snapshot may predate writes that landed while it was read
+        for key in touched:
+            self._replay(key)
+        return True
+
+    def _note_write(self, key: Hashable) -> bool:
+        """Caller holds the lock. Remember `key` for replay if a load is reading; False while nothing is loaded."""
+        if self._touched_during_load is not None:
+            self._touched_during_load.add(key)
+        return self._loaded_at is not None
+
+    def _ensure_loaded(self, wait: bool = False) -> bool:
+        """
+        Start a background load when the index is missing or stale. Returns True once
+        an index is loaded; before that False, unless wait=True blocks for the first load.
+        """
+        now = time.monotonic()
+        with self._lock:
+            loaded_at = self._loaded_at
+            due = self._attempted_at is None or now - self._attempted_at >= (
+                self.sync_interval if loaded_at is not None else min(self.sync_interval, self.retry_interval)
+            )
+            if due and self._loading is None:
+                self._attempted_at = now
+                self._loading = threading.Thread(target=self._load_in_background, name=self.thread_name, daemon=True)
+                self._loading.start()
+            loading = self._loading
+        if loaded_at is not None:
+            return True
+        if wait and loading is not None:
+            loading.join()
+        with self._lock:
+            return self._loaded_at is not None
+
+    def _load_in_background(self) -> None:
+        try:
+            self.load()
+        finally:
+            with self._lock:
+                self._loading = None
@@ -0,0 +1,118 @@
+"""
+@author Anish
+@description Read-replica set: round-robin over healthy replicas with background health checks
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import time
+
+from src.pool import ConnectionPool
+
+
+class Replica:
+    """One read replica and its own connection pool."""
+
+    def __init__(self, name: str, pool: ConnectionPool) -> None:
+        self.name = name
+        self.pool = pool
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+
+
+class ReplicaSet:
+    """
+    Hands out replicas round-robin, skipping unhealthy ones; pick() returns None
+    when none is usable so the caller reads from the primary instead.
+
+    A replica is unhealthy when it can't be reached (reported by the caller through
+    mark_down, or found by a check) or, with max_lag > 0, when `lag(conn)` says it is
+    further behind the primary than that. Checks run every `check_interval` seconds
+    on a short-lived background thread started by pick(), so readers never wait on them.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        lag: Optional[Callable[[Any], Optional[float]]] = None,
+        check_interval: float = 5.0,
+        max_lag: float = 0.0,
+    ) -> None:
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._lag = lag
+        self._lock = threading.Lock()
+        self._next = 0
+        self._checking = False
+        self._checked_at = time.monotonic()
+
+    def pick(self) -> Optional[Replica]:
+        self._maybe_check()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[self._next]
+                self._next = (self._next + 1) % len(self.replicas)
+                if replica.healthy:
+                    return replica
+        return None
+
+    def mark_down(self, replica: Replica) -> None:
+        """Take a replica out of rotation until the next check finds it reachable."""
+        replica.healthy = False
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": r.name, "healthy": r.healthy, "lag_seconds": r.lag, "pool": r.pool.stats()}
+            for r in self.replicas
+        ]
+
+    # -------------------------
+    # Health checks
+    # -------------------------
+    def _maybe_check(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._checking or now - self._checked_at < self.check_interval:
+                return
+            self._checking = True
+            self._checked_at = now
+        threading.Thread(target=self._check_all, name="replica-health", daemon=True).start()
+
+    def _check_all(self) -> None:
+        try:
+            for replica in self.replicas:
+                self.check(replica)
+        finally:
+            with self._lock:
+                self._checking = False
+
+    def check(self, replica: Replica) -> bool:
+        """Ping the replica (and measure its lag when max_lag is set); updates replica.healthy."""
+        conn = None
+        try:
+            conn = replica.pool.acquire()
+            conn.ping(reconnect=False)
+            if self._lag is not None and self.max_lag > 0:
+                replica.lag = self._lag(conn)
+                healthy = replica.lag is not None and replica.lag <= self.max_lag
+            else:
+                healthy = True
+        except Exception as exc:
+            print(f"[ERROR] replica {replica.name} health check:", exc)
+            healthy = False
+            if conn is not None:
+                conn.discard()
+                conn = None
+        finally:
+            if conn is not None:
+                conn.close()
+        if healthy != replica.healthy:
+            print(f"[INFO] replica {replica.name} is {'back in rotation' if healthy else 'out of rotation'}")
+        replica.healthy = healthy
+        replica.checked_at = time.monotonic()
+        return healthy
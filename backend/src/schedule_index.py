@@ -0,0 +1,383 @@
+"""
+@author Anish
+@description In-memory interval index over schedules for teacher / room double-booking checks
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, cast
+from datetime import datetime
+import random
+
+from src.reloading import ReloadingIndex
+
+
+def parse_slot_time(value: Any) -> datetime:
+    """
+    Accept a DATETIME from pymysql or a 'YYYY-MM-DD HH:MM:SS' / ISO-8601 string.
+    Raises ValueError for anything else.
+    """
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, str) and value.strip():
+        return datetime.fromisoformat(value.strip()).replace(tzinfo=None)
+    raise ValueError(f"Invalid datetime: {value!r}")
+
+
+class _Node:
+    __slots__ = ("start", "end", "key", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: datetime, end: datetime, key: Hashable) -> None:
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = random.random()
+        self.max_end = end
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+    def update(self) -> None:
+        self.max_end = self.end
+        if self.left is not None and self.left.max_end > self.max_end:
+            self.max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > self.max_end:
+            self.max_end = self.right.max_end
+
+
+class IntervalTree:
+    """
+    Half-open intervals [start, end) stored in a treap ordered by start, each node
+    augmented with the largest end in its subtree. Insert/remove are O(log n)
+    expected and an overlap query is O(log n + k) for k hits. Back-to-back slots
+    (one ends when the next starts) do not overlap. Not thread-safe on its own.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[_Node] = None
+        self._spans: Dict[Hashable, Tuple[datetime, datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def insert(self, start: datetime, end: datetime, key: Hashable) -> None:
+        """Add an interval under key, replacing any interval already stored under it."""
+        if key in self._spans:
+            self.remove(key)
+        self._spans[key] = (start, end)
+        self._root = self._insert(self._root, _Node(start, end, key))
+
+    def remove(self, key: Hashable) -> bool:
+        span = self._spans.pop(key, None)
+        if span is None:
+            return False
+        self._root = self._remove(self._root, span[0], key)
+        return True
+
+    def overlapping(self, start: datetime, end: datetime, exclude: Optional[Hashable] = None) -> List[Hashable]:
+        """Keys of stored intervals overlapping [start, end), in start order."""
+        hits: List[Hashable] = []
+        self._collect(self._root, start, end, exclude, hits)
+        return hits
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    @staticmethod
+    def _order(start: datetime, key: Hashable) -> Tuple[datetime, str]:
+        # Keys may be ints or tuples; compare their repr to break ties on equal starts
+        return start, repr(key)
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if self._order(new.start, new.key) < self._order(node.start, node.key):
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def _remove(self, node: Optional[_Node], start: datetime, key: Hashable) -> Optional[_Node]:
+        if node is None:
+            return None
+        if node.key == key:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Rotate the higher-priority child up and keep sinking the node
+            if node.left.priority > node.right.priority:
+                node = self._rotate_right(node)
+                node.right = self._remove(node.right, start, key)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._remove(node.left, start, key)
+        elif self._order(start, key) < self._order(node.start, node.key):
+            node.left = self._remove(node.left, start, key)
+        else:
+            node.right = self._remove(node.right, start, key)
+        node.update()
+        return node
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        assert pivot is not None
+        node.left = pivot.right
+        pivot.right = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        assert pivot is not None
+        node.right = pivot.left
+        pivot.left = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    def _collect(self, node: Optional[_Node], start: datetime, end: datetime, exclude: Optional[Hashable], hits: List[Hashable]) -> None:
+        # Nothing in this subtree ends after `start`: no overlap possible
+        if node is None or node.max_end <= start:
+            return
+        self._collect(node.left, start, end, exclude, hits)
+        if node.start < end:
+            if node.end > start and node.key != exclude:
+                hits.append(node.key)
+            # Right subtree starts at or after node.start, so only worth it while < end
+            self._collect(node.right, start, end, exclude, hits)
+
+
+def _location_key(location: Any) -> Optional[str]:
+    """Rooms compare case- and whitespace-insensitively; blank means 'no room'."""
+    text = " ".join(str(location or "").split()).casefold()
+    return text or None
+
+
+class ScheduleIndex(ReloadingIndex):
+    """
+    One IntervalTree per teacher and one per location over every schedule row,
+    so a proposed slot is checked for double-booking without touching MySQL.
+
+    load():   bulk (re)build from `loader` (all rows); also re-run on a background
+              thread every `sync_interval` seconds to pick up other workers' writes
+    refresh(): re-read one row by id through `fetch_one` after a local write
+    conflicts(): O(log n + k) lookup of the slots a proposal collides with
+    """
+
+    thread_name = "schedule-index-sync"
+
+    def __init__(
+        self,
+        loader: Callable[[], Optional[List[Dict[str, Any]]]],
+        fetch_one: Callable[[int], Optional[Dict[str, Any]]],
+        sync_interval: float = 60.0,
+    ) -> None:
+        super().__init__(sync_interval)
+        self._loader = loader
+        self._fetch_one = fetch_one
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._by_teacher: Dict[int, IntervalTree] = {}
+        self._by_location: Dict[str, IntervalTree] = {}
+
+    # -------------------------
+    # Loading / keeping in sync
+    # -------------------------
+    def _read(self) -> Optional[List[Dict[str, Any]]]:
+        return self._loader()
+
+    def _install(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows.clear()
+        self._by_teacher.clear()
+        self._by_location.clear()
+        for row in rows:
+            self._add(row)
+
+    def _replay(self, schedule_id: Hashable) -> None:
+        self.refresh(cast(int, schedule_id))
+
+    def refresh(self, schedule_id: int) -> None:
+        """Re-read one schedule after it was inserted or updated (drops it if it is gone)."""
+        with self._lock:
+            if not self._note_write(schedule_id):
+                return
+        row = self._fetch_one(schedule_id)
+        with self._lock:
+            self._discard(schedule_id)
+            if row is not None:
+                self._add(row)
+
+    def remove(self, schedule_id: int) -> None:
+        with self._lock:
+            self._note_write(schedule_id)
+            self._discard(schedule_id)
+
+    def on_change(self, table: str, action: str, key: Any, row: Optional[Dict[str, Any]]) -> None:
+        """db change listener for the schedules table."""
+        if action == "delete":
+            self.remove(int(key))
+        else:
+            self.refresh(int(key))
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def get(self, schedule_id: int) -> Optional[Dict[str, Any]]:
+        if not self._ensure_loaded():
+            return None
+        with self._lock:
+            row = self._rows.get(schedule_id)
+            return dict(row) if row is not None else None
+
+    def conflicts(
+        self,
+        teacher_id: Optional[int],
+        location: Any,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Existing schedules that double-book the teacher or the room in [start, end).
+        Returns [{ type: "teacher" | "location", schedule_id, ... }], or None while the
+        index is not loaded yet (callers should not block writes on that).
+        """
+        if not self._ensure_loaded():
+            return None
+        with self._lock:
+            return list(self._find(self._by_teacher, self._by_location, self._rows, teacher_id, location, start, end, exclude_id))
+
+    def validate(self, proposals: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Check a batch of proposed slots (e.g. a whole week) against the stored
+        schedules and against each other. Each proposal has teacher_id, location,
+        start, end (datetimes) and optionally schedule_id when it moves an existing
+        row. Returns one conflict entry per collision, each tagged with the
+        proposal's `index`; None if the index is unavailable.
+        """
+        if not self._ensure_loaded(wait=True):
+            return None
+
+        # The batch gets its own trees so proposals collide with one another too
+        batch_teacher: Dict[int, IntervalTree] = {}
+        batch_location: Dict[str, IntervalTree] = {}
+        moved = {p["schedule_id"] for p in proposals if p.get("schedule_id") is not None}
+        found: List[Dict[str, Any]] = []
+
+        with self._lock:
+            for i, p in enumerate(proposals):
+                for hit in self._find(self._by_teacher, self._by_location, self._rows, p.get("teacher_id"), p.get("location"), p["start"], p["end"], p.get("schedule_id")):
+                    # A stored row that this batch also moves is judged at its new time instead
+                    if hit["schedule_id"] in moved:
+                        continue
+                    found.append({"index": i, **hit})
+
+            for i, p in enumerate(proposals):
+                teacher_id, room = p.get("teacher_id"), _location_key(p.get("location"))
+                if teacher_id is not None:
+                    tree = batch_teacher.setdefault(teacher_id, IntervalTree())
+                    found.extend({"index": i, "type": "teacher", "with_index": j} for j in tree.overlapping(p["start"], p["end"]))
+                    tree.insert(p["start"], p["end"], i)
+                if room is not None:
+                    tree = batch_location.setdefault(room, IntervalTree())
+                    found.extend({"index": i, "type": "location", "with_index": j} for j in tree.overlapping(p["start"], p["end"]))
+                    tree.insert(p["start"], p["end"], i)
+
+        found.sort(key=lambda c: c["index"])
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self._loaded_at is not None,
+                "schedules": len(self._rows),
+                "teachers": len(self._by_teacher),
+                "locations": len(self._by_location),
+            }
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    @staticmethod
+    def _find(
+        by_teacher: Dict[int, IntervalTree],
+        by_location: Dict[str, IntervalTree],
+        rows: Dict[int, Dict[str, Any]],
+        teacher_id: Optional[int],
+        location: Any,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Caller holds the lock."""
+        checks: List[Tuple[str, Optional[IntervalTree]]] = []
+        if teacher_id is not None:
+            checks.append(("teacher", by_teacher.get(teacher_id)))
+        room = _location_key(location)
+        if room is not None:
+            checks.append(("location", by_location.get(room)))
+        for kind, tree in checks:
+            if tree is None:
+                continue
+            for schedule_id in tree.overlapping(start, end, exclude=exclude_id):
+                row = rows[schedule_id]
+                yield {
+                    "type": kind,
+                    "schedule_id": schedule_id,
+                    "teacher_id": row.get("teacher_id"),
+                    "location": row.get("location"),
+                    "start_time": row["start"],
+                    "end_time": row["end"],
+                }
+
+    def _add(self, row: Dict[str, Any]) -> None:
+        """Caller holds the lock. Rows with unusable times are left out of the index."""
+        try:
+            start = parse_slot_time(row.get("start_time"))
+            end = parse_slot_time(row.get("end_time"))
+        except ValueError:
+            return
+        if end <= start:
+            return
+        schedule_id = int(row["schedule_id"])
+        entry = {
+            "schedule_id": schedule_id,
+            "subject_id": row.get("subject_id"),
+            "teacher_id": row.get("teacher_id"),
+            "location": row.get("location"),
+            "start": start,
+            "end": end,
+        }
+        self._rows[schedule_id] = entry
+        if entry["teacher_id"] is not None:
+            self._by_teacher.setdefault(int(entry["teacher_id"]), IntervalTree()).insert(start, end, schedule_id)
+        room = _location_key(entry["location"])
+        if room is not None:
+            self._by_location.setdefault(room, IntervalTree()).insert(start, end, schedule_id)
+
+    def _discard(self, schedule_id: int) -> None:
+        """Caller holds the lock."""
+        entry = self._rows.pop(schedule_id, None)
+        if entry is None:
+            return
+        if entry["teacher_id"] is not None:
+            tree = self._by_teacher.get(int(entry["teacher_id"]))
+            if tree is not None:
+                tree.remove(schedule_id)
+                if not len(tree):
+                    del self._by_teacher[int(entry["teacher_id"])]
+        room = _location_key(entry["location"])
+        if room is not None:
+            tree = self._by_location.get(room)
+            if tree is not None:
+                tree.remove(schedule_id)
+                if not len(tree):
+                    del self._by_location[room]
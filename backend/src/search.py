@@ -0,0 +1,381 @@
+"""
+@author Anish
+@description In-memory BM25 full-text index over notices, events and job updates
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, cast
+from functools import lru_cache
+import heapq
+import math
+import re
+
+from src.reloading import ReloadingIndex
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the "
+    "their there these this to was were will with".split()
+)
+
+
+# -------------------------
+# Porter stemmer (M.F. Porter, 1980)
+# -------------------------
+def _is_cons(word: str, i: int) -> bool:
+    ch = word[i]
+    if ch in "aeiou":
+        return False
+    if ch == "y":
+        return i == 0 or not _is_cons(word, i - 1)
+    return True
+
+
+def _measure(stem: str) -> int:
+    """m in [C](VC)^m[V]."""
+    m = 0
+    prev_vowel = False
+    for i in range(len(stem)):
+        cons = _is_cons(stem, i)
+        if cons and prev_vowel:
+            m += 1
+        prev_vowel = not cons
+    return m
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(not _is_cons(stem, i) for i in range(len(stem)))
+
+
+def _ends_double_cons(word: str) -> bool:
+    return len(word) >= 2 and word[-1] == word[-2] and _is_cons(word, len(word) - 1)
+
+
+def _ends_cvc(word: str) -> bool:
+    return (
+        len(word) >= 3
+        and _is_cons(word, len(word) - 3)
+        and not _is_cons(word, len(word) - 2)
+        and _is_cons(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+_STEP2 = sorted([
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"), ("izer", "ize"),
+    ("bli", "ble"), ("alli", "al"), ("entli", "ent"), ("eli", "e"), ("ousli", "ous"),
+    ("ization", "ize"), ("ation", "ate"), ("ator", "ate"), ("alism", "al"), ("iveness", "ive"),
+    ("fulness", "ful"), ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+    ("logi", "log"),
+], key=lambda pair: -len(pair[0]))
+_STEP3 = sorted([
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"), ("ical", "ic"), ("ful", ""), ("ness", ""),
+], key=lambda pair: -len(pair[0]))
+_STEP4 = sorted([
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment", "ent",
+    "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+], key=len, reverse=True)
+
+
+def _replace_suffix(word: str, rules: List[Tuple[str, str]], min_measure: int) -> str:
+    # Only the longest matching suffix is considered, as in the original algorithm
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            return stem + replacement if _measure(stem) > min_measure else word
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Porter-stem one lower-case word. Words of 1-2 letters and non-ASCII words are kept as is."""
+    if len(word) <= 2 or not word.isascii() or not word.isalpha():
+        return word
+
+    # Step 1a
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[: -len(suffix)]):
+                word = word[: -len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _ends_double_cons(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    # Steps 2-3
+    word = _replace_suffix(word, _STEP2, 0)
+    word = _replace_suffix(word, _STEP3, 0)
+
+    # Step 4
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            stem_ = word[: -len(suffix)]
+            if _measure(stem_) > 1 and (suffix != "ion" or stem_.endswith(("s", "t"))):
+                word = stem_
+            break
+
+    # Step 5
+    if word.endswith("e"):
+        m = _measure(word[:-1])
+        if m > 1 or (m == 1 and not _ends_cvc(word[:-1])):
+            word = word[:-1]
+    if word.endswith("ll") and _measure(word) > 1:
+        word = word[:-1]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """Lower-case, split on non-word characters, drop stop words, stem."""
+    return [stem(tok) for tok in _TOKEN_RE.findall((text or "").lower()) if tok not in STOP_WORDS]
+
+
+# -------------------------
+# Inverted index
+# -------------------------
+DocKey = Tuple[str, int]
+
+
+class InvertedIndex:
+    """
+    term -> {doc: term frequency}, with per-document lengths for BM25.
+    Title terms are counted `title_boost` times so a hit in the title outranks
+    the same word buried in the body. Not thread-safe on its own.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_boost: int = 2) -> None:
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+        self._postings: Dict[str, Dict[DocKey, int]] = {}
+        self._doc_terms: Dict[DocKey, Dict[str, int]] = {}
+        self._doc_len: Dict[DocKey, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, key: DocKey, title: str, body: str) -> None:
+        """Index (or re-index) one document."""
+        self.remove(key)
+        counts: Dict[str, int] = {}
+        for term in analyze(title):
+            counts[term] = counts.get(term, 0) + self.title_boost
+        for term in analyze(body):
+            counts[term] = counts.get(term, 0) + 1
+        length = sum(counts.values())
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[key] = tf
+        self._doc_terms[key] = counts
+        self._doc_len[key] = length
+        self._total_len += length
+
+    def remove(self, key: DocKey) -> bool:
+        counts = self._doc_terms.pop(key, None)
+        if counts is None:
+            return False
+        for term in counts:
+            docs = self._postings.get(term)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(key, 0)
+        return True
+
+    def search(self, terms: Iterable[str], kinds: Optional[Set[str]] = None) -> Dict[DocKey, float]:
+        """BM25 score of every document containing at least one of the terms."""
+        n = len(self._doc_len)
+        if n == 0:
+            return {}
+        avg_len = self._total_len / n or 1.0
+        scores: Dict[DocKey, float] = {}
+        for term in set(terms):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for key, tf in docs.items():
+                if kinds is not None and key[0] not in kinds:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[key] / avg_len)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+def make_snippet(text: str, terms: Set[str], width: int = 160) -> str:
+    """
+    A window of `text` around the first word whose stem is one of `terms`
+    (the start of the text if none matches), cut at word boundaries.
+    """
+    text = " ".join((text or "").split())
+    if len(text) <= width:
+        return text
+    start = 0
+    for match in _TOKEN_RE.finditer(text.lower()):
+        if stem(match.group()) in terms:
+            start = max(0, match.start() - width // 4)
+            break
+    end = min(len(text), start + width)
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < end else start
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+    return ("..." if start > 0 else "") + text[start:end] + ("..." if end < len(text) else "")
+
+
+class SearchIndex(ReloadingIndex):
+    """
+    Full-text search over the documents of several collections ("kinds").
+
+    `sources` maps a kind to (load_all, fetch_one, to_document):
+      load_all()     every row of the collection, or None on error
+      fetch_one(id)  one row, or None if it is gone
+      to_document(row) -> (id, title, body, extra fields returned with each hit)
+    The index is built on first use, patched per row from change listeners and
+    rebuilt on a background thread every `sync_interval` seconds to pick up other
+    workers' writes; searches keep using the old index until the new one is ready.
+    """
+
+    thread_name = "search-index-sync"
+
+    def __init__(
+        self,
+        sources: Dict[str, Tuple[Callable[[], Optional[List[Dict[str, Any]]]], Callable[[int], Optional[Dict[str, Any]]], Callable[[Dict[str, Any]], Tuple[int, str, str, Dict[str, Any]]]]],
+        sync_interval: float = 300.0,
+    ) -> None:
+        super().__init__(sync_interval)
+        self._sources = sources
+        self._index = InvertedIndex()
+        # doc -> (title, body, extra) for snippets and hit payloads
+        self._docs: Dict[DocKey, Tuple[str, str, Dict[str, Any]]] = {}
+
+    @property
+    def kinds(self) -> Tuple[str, ...]:
+        return tuple(self._sources)
+
+    # -------------------------
+    # Loading / keeping in sync
+    # -------------------------
+    def _read(self) -> Optional[Tuple[InvertedIndex, Dict[DocKey, Tuple[str, str, Dict[str, Any]]]]]:
+        """Read every collection and build the new index off the lock; None if any read failed."""
+        loaded: Dict[str, List[Dict[str, Any]]] = {}
+        for kind, (load_all, _, _) in self._sources.items():
+            rows = load_all()
+            if rows is None:
+                return None
+            loaded[kind] = rows
+
+        index = InvertedIndex()
+        docs: Dict[DocKey, Tuple[str, str, Dict[str, Any]]] = {}
+        for kind, rows in loaded.items():
+            to_document = self._sources[kind][2]
+            for row in rows:
+                doc_id, title, body, extra = to_document(row)
+                index.add((kind, doc_id), title, body)
+                docs[(kind, doc_id)] = (title, body, extra)
+        return index, docs
+
+    def _install(self, data: Tuple[InvertedIndex, Dict[DocKey, Tuple[str, str, Dict[str, Any]]]]) -> None:
+        self._index, self._docs = data
+
+    def _replay(self, key: Hashable) -> None:
+        kind, doc_id = cast(DocKey, key)
+        self.refresh(kind, doc_id)
+
+    def refresh(self, kind: str, doc_id: int) -> None:
+        """Re-read one document after an insert/update (drops it if it is gone)."""
+        with self._lock:
+            if not self._note_write((kind, doc_id)):
+                return
+        row = self._sources[kind][1](doc_id)
+        with self._lock:
+            if row is None:
+                self._remove((kind, doc_id))
+                return
+            _, title, body, extra = self._sources[kind][2](row)
+            self._index.add((kind, doc_id), title, body)
+            self._docs[(kind, doc_id)] = (title, body, extra)
+
+    def remove(self, kind: str, doc_id: int) -> None:
+        with self._lock:
+            self._note_write((kind, doc_id))
+            self._remove((kind, doc_id))
+
+    def listener(self, kind: str) -> Callable[[str, str, Any, Optional[Dict[str, Any]]], None]:
+        """A db change listener that keeps `kind` in sync."""
+        def on_change(table: str, action: str, key: Any, row: Optional[Dict[str, Any]]) -> None:
+            if action == "delete":
+                self.remove(kind, int(key))
+            else:
+                self.refresh(kind, int(key))
+        return on_change
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None, offset: int = 0, limit: int = 20) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Rank documents matching any query term by BM25.
+        Returns (total matches, hits[offset:offset + limit]) where each hit is
+        { type, id, score, title, snippet, ...extra }; None if the index is unavailable.
+        """
+        if not self._ensure_loaded(wait=True):
+            return None
+        terms = analyze(query)
+        if not terms:
+            return 0, []
+        wanted = set(kinds) if kinds is not None else None
+        with self._lock:
+            scores = self._index.search(terms, wanted)
+            # Ties break on newest id first so equal scores have a stable order
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda kv: (kv[1], kv[0][1]))[offset:]
+            docs = [(key, score, self._docs[key]) for key, score in top]
+
+        term_set = set(terms)
+        hits = [
+            {
+                "type": kind,
+                "id": doc_id,
+                "score": round(score, 4),
+                "title": title,
+                "snippet": make_snippet(body, term_set),
+                **extra,
+            }
+            for (kind, doc_id), score, (title, body, extra) in docs
+        ]
+        return len(scores), hits
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"loaded": self._loaded_at is not None, "documents": len(self._index)}
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _remove(self, key: DocKey) -> None:
+        """Caller holds the lock."""
+        self._index.remove(key)
+        self._docs.pop(key, None)
@@ -0,0 +1,350 @@
+"""
+@author Anish
+@description Embedded SQLite engine behind the pymysql interface db.py uses (DB_ENGINE="sqlite")
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime
+from functools import lru_cache
+import re
+import sqlite3
+import threading
+
+import pymysql.cursors
+from pymysql.constants import SERVER_STATUS
+
+# Same tables, keys and indexes as temp/test.sql (sections 1-15), in SQLite syntax.
+# Emails and login ids compare case-insensitively, like MySQL's default collation.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (
+    program_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code VARCHAR(30) UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    duration VARCHAR(50) NOT NULL,
+    level VARCHAR(50) NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS subjects (
+    subject_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    program_id INTEGER NOT NULL REFERENCES programs(program_id) ON DELETE CASCADE,
+    code VARCHAR(30) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    semester INT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS admins (
+    admin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login_id VARCHAR(20) COLLATE NOCASE UNIQUE NOT NULL,
+    name VARCHAR(255),
+    email VARCHAR(255) COLLATE NOCASE UNIQUE,
+    password VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS teachers (
+    teacher_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login_id VARCHAR(20) COLLATE NOCASE UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) COLLATE NOCASE UNIQUE NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    subject VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS students (
+    student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    login_id VARCHAR(20) COLLATE NOCASE UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    email VARCHAR(255) COLLATE NOCASE UNIQUE NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    roll_no VARCHAR(50),
+    semester INT,
+    program_id INTEGER REFERENCES programs(program_id) ON DELETE SET NULL
+);
+CREATE TABLE IF NOT EXISTS subject_teachers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    teacher_id INTEGER NOT NULL REFERENCES teachers(teacher_id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL REFERENCES subjects(subject_id) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS schedules (
+    schedule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject_id INTEGER NOT NULL REFERENCES subjects(subject_id) ON DELETE CASCADE,
+    teacher_id INTEGER REFERENCES teachers(teacher_id) ON DELETE SET NULL,
+    title VARCHAR(255),
+    location VARCHAR(255),
+    start_time DATETIME NOT NULL,
+    end_time DATETIME NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notices (
+    notice_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255),
+    content TEXT,
+    created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+    posted_by VARCHAR(20)
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255),
+    content TEXT,
+    last_date DATETIME,
+    posted_by VARCHAR(20),
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+CREATE TABLE IF NOT EXISTS job_updates (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255),
+    description TEXT,
+    company VARCHAR(255),
+    apply_link VARCHAR(500),
+    posted_by VARCHAR(20),
+    created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+CREATE TABLE IF NOT EXISTS id_counter (
+    prefix VARCHAR(5) PRIMARY KEY,
+    last_no INT NOT NULL
+);
+INSERT OR IGNORE INTO id_counter VALUES ('65', 0), ('70', 0), ('83', 0);
+CREATE TABLE IF NOT EXISTS collection_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO collection_versions VALUES ('notices', 0), ('events', 0), ('job_updates', 0), ('schedules', 0);
+CREATE TABLE IF NOT EXISTS token_blocklist (
+    jti VARCHAR(64) PRIMARY KEY,
+    expires_at DATETIME NULL
+);
+CREATE INDEX IF NOT EXISTS idx_token_blocklist_expires_at ON token_blocklist (expires_at);
+CREATE INDEX IF NOT EXISTS idx_schedules_start_time ON schedules (start_time);
+CREATE INDEX IF NOT EXISTS idx_schedules_teacher_start ON schedules (teacher_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_schedules_location_start ON schedules (location, start_time);
+CREATE INDEX IF NOT EXISTS idx_schedules_subject_start ON schedules (subject_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_subjects_program_semester ON subjects (program_id, semester);
+"""
+
+
+# -------------------------
+# Types
+# -------------------------
+# DATETIME columns come back as datetime objects, as they do from pymysql
+def _convert_datetime(raw: bytes) -> Any:
+    text = raw.decode("utf-8")
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _adapt_datetime(value: datetime) -> str:
+    # MySQL DATETIME has whole seconds; a fixed width keeps text comparisons ordered
+    return value.isoformat(" ", "seconds")
+
+
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+
+# -------------------------
+# SQL dialect
+# -------------------------
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+_UPSERT = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_REF = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+_DELETE_LIMIT = re.compile(
+    r"^\s*DELETE\s+FROM\s+(\w+)\s+WHERE\s+(.+?)\s+ORDER\s+BY\s+(.+?)\s+LIMIT\s+(\S+)\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_FUNCTIONS: Tuple[Tuple["re.Pattern[str]", str], ...] = (
+    (re.compile(r"\bUTC_TIMESTAMP\(\)", re.IGNORECASE), "datetime('now')"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+)
+
+
+@lru_cache(maxsize=1024)
+def translate(query: str, has_args: bool) -> Tuple[str, bool]:
+    """
+    Rewrite one statement from db.py's MySQL dialect. Returns (sql, locking) where
+    locking means the statement was a SELECT ... FOR UPDATE.
+    Only the constructs db.py uses are handled:
+    - %s placeholders (and %% when arguments are bound, as pymysql does)
+    - FOR UPDATE: dropped; the caller opens the transaction with BEGIN IMMEDIATE instead
+    - INSERT IGNORE, ON DUPLICATE KEY UPDATE ... VALUES(col)
+    - DELETE ... ORDER BY ... LIMIT n (not compiled into the stock SQLite)
+    - UTC_TIMESTAMP(), NOW()
+    """
+    sql = query
+    locking = bool(_FOR_UPDATE.search(sql))
+    if locking:
+        sql = _FOR_UPDATE.sub("", sql)
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    upsert = _UPSERT.search(sql)
+    if upsert:
+        head, tail = sql[:upsert.start()], sql[upsert.end():]
+        sql = head + "ON CONFLICT DO UPDATE SET" + _VALUES_REF.sub(r"excluded.\1", tail)
+    delete = _DELETE_LIMIT.match(sql)
+    if delete:
+        table, where, order, limit = delete.groups()
+        sql = f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} ORDER BY {order} LIMIT {limit})"
+    for pattern, replacement in _FUNCTIONS:
+        sql = pattern.sub(replacement, sql)
+    if has_args:
+        sql = sql.replace("%s", "?").replace("%%", "%")
+    return sql, locking
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+# -------------------------
+# Cursor / connection
+# -------------------------
+class SQLiteCursor:
+    """
+    What db.py expects from a pymysql DictCursor: dict rows, rowcount (the row count
+    for a SELECT too, because results are buffered), lastrowid, context manager.
+    Unbuffered cursors (pymysql's SSCursor family) stream rows instead.
+    """
+
+    def __init__(self, connection: "SQLiteConnection", buffered: bool = True) -> None:
+        self.connection = connection
+        self._cur = connection.raw.cursor()
+        self._buffered = buffered
+        self._rows: List[Dict[str, Any]] = []
+        self._pos = 0
+        self.rowcount = -1
+        self.lastrowid: Optional[int] = None
+        self.description: Any = None
+
+    def __enter__(self) -> "SQLiteCursor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def execute(self, query: str, args: Any = None) -> int:
+        sql, locking = translate(query, args is not None)
+        if locking and not self.connection.raw.in_transaction:
+            # Take the write lock now, as InnoDB's row lock would, so two
+            # read-then-update transactions cannot both read the old value
+            self._cur.execute("BEGIN IMMEDIATE")
+        self._cur.execute(sql, _params(args))
+        return self._after_execute()
+
+    def executemany(self, query: str, args: Sequence[Any]) -> int:
+        sql, _ = translate(query, True)
+        self._cur.executemany(sql, [_params(a) for a in args])
+        return self._after_execute()
+
+    def _after_execute(self) -> int:
+        self.description = self._cur.description
+        self.lastrowid = self._cur.lastrowid
+        self._rows, self._pos = [], 0
+        if self.description is not None and self._buffered:
+            self._rows = self._cur.fetchall()
+            self.rowcount = len(self._rows)
+        else:
+            self.rowcount = self._cur.rowcount
+        return max(self.rowcount, 0)
+
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        if not self._buffered:
+            return self._cur.fetchone()
+        if self._pos >= len(self._rows):
+            return None
+        self._pos += 1
+        return self._rows[self._pos - 1]
+
+    def fetchmany(self, size: int = 1) -> List[Dict[str, Any]]:
+        if not self._buffered:
+            return self._cur.fetchmany(size)
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        if not self._buffered:
+            return self._cur.fetchall()
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def close(self) -> None:
+        self._cur.close()
+
+
+def _params(args: Any) -> Sequence[Any]:
+    if args is None:
+        return ()
+    if isinstance(args, (list, tuple)):
+        return args
+    return (args,)
+
+
+class SQLiteConnection:
+    """
+    The slice of pymysql.Connection that db.py and the pool use. Transactions start
+    implicitly before the first write (BEGIN IMMEDIATE), like autocommit=False.
+    """
+
+    def __init__(self, raw: sqlite3.Connection, cursorclass: Optional[type] = None) -> None:
+        self.raw = raw
+        self.cursorclass = cursorclass or SQLiteCursor
+
+    def cursor(self, cursor: Optional[type] = None) -> SQLiteCursor:
+        cls = cursor or self.cursorclass
+        if issubclass(cls, SQLiteCursor):
+            return cls(self)
+        # A pymysql cursor class passed explicitly (db.py's streaming export)
+        return SQLiteCursor(self, buffered=not issubclass(cls, pymysql.cursors.SSCursor))
+
+    def commit(self) -> None:
+        self.raw.commit()
+
+    def rollback(self) -> None:
+        self.raw.rollback()
+
+    def close(self) -> None:
+        self.raw.close()
+
+    def ping(self, reconnect: bool = False) -> None:
+        self.raw.execute("SELECT 1").fetchone()
+
+    def get_autocommit(self) -> bool:
+        return self.raw.isolation_level is None
+
+    def autocommit(self, value: bool) -> None:
+        self.raw.isolation_level = None if value else "IMMEDIATE"
+
+    @property
+    def server_status(self) -> int:
+        return SERVER_STATUS.SERVER_STATUS_IN_TRANS if self.raw.in_transaction else 0
+
+
+_schema_lock = threading.Lock()
+_schema_ready: Dict[str, bool] = {}
+
+
+def connect(path: str, cursorclass: Optional[type] = None, busy_timeout: float = 5.0, init_schema: bool = True) -> SQLiteConnection:
+    """
+    Open `path` in WAL mode (readers never wait for the writer) and, on the first
+    connection to it, create any missing tables. `file:` URIs are accepted, e.g.
+    file:college?mode=memory&cache=shared for a throwaway shared in-memory database.
+    """
+    raw = sqlite3.connect(
+        path,
+        timeout=busy_timeout,
+        isolation_level="IMMEDIATE",
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,  # the pool hands a connection to one thread at a time
+        uri=path.startswith("file:"),
+    )
+    raw.row_factory = _dict_row
+    raw.execute("PRAGMA journal_mode=WAL")
+    raw.execute("PRAGMA synchronous=NORMAL")
+    raw.execute("PRAGMA foreign_keys=ON")
+    if init_schema:
+        with _schema_lock:
+            if not _schema_ready.get(path):
+                raw.executescript(SCHEMA)
+                _schema_ready[path] = True
+    return SQLiteConnection(raw, cursorclass)
@@ -0,0 +1,218 @@
+"""
+@author Anish
+@description Server-Sent Events feed of notice / event / job changes with Last-Event-ID resume
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+from collections import deque
+import asyncio
+import threading
+import time
+
+# (sequence number, event name, JSON data)
+Entry = Tuple[int, str, str]
+
+
+class ChangeFeed:
+    """
+    Bounded in-memory log of change events, shared by every /stream subscriber.
+
+    Each event gets the next sequence number; its SSE id is "<boot>-<seq>", where
+    boot identifies this process start. A client reconnecting with Last-Event-ID gets
+    every event it missed while they are still among the last `capacity` ones. If they
+    are not (evicted, or the id is from before a restart) it is sent a "reset" event
+    instead and should refetch the lists once.
+
+    Only writes made through this process are seen, like the other change listeners.
+    Subscribers wait on a Condition (threaded servers) or on an asyncio future (the
+    ASGI bridge), so an idle subscriber costs no CPU.
+    """
+
+    def __init__(self, capacity: int = 1000, max_subscribers: int = 100) -> None:
+        self.capacity = capacity
+        self.max_subscribers = max_subscribers
+        self.boot = format(int(time.time() * 1000), "x")
+        self._buffer: Deque[Entry] = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = set()
+        self._subscribers = 0
+
+    # -------------------------
+    # Publishing
+    # -------------------------
+    def publish(self, event: str, data: str) -> int:
+        """Append an event and wake every subscriber; returns its sequence number."""
+        with self._cond:
+            self._seq += 1
+            self._buffer.append((self._seq, event, data))
+            self._cond.notify_all()
+            waiters, self._waiters = self._waiters, set()
+            seq = self._seq
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # that loop is closed
+        return seq
+
+    def listener(self, event: str, fetch_one: Callable[[int], Optional[Dict[str, Any]]], dumps: Callable[[Any], str]) -> Callable[[str, str, Any, Optional[Dict[str, Any]]], None]:
+        """A db change listener publishing `event` with the row as it now reads (None once deleted)."""
+        def on_change(table: str, action: str, key: Any, row: Optional[Dict[str, Any]]) -> None:
+            item = fetch_one(int(key)) if action != "delete" else None
+            self.publish(event, dumps({"action": action, "id": int(key), "item": item}))
+        return on_change
+
+    # -------------------------
+    # Subscribing
+    # -------------------------
+    def full(self) -> bool:
+        """True while max_subscribers are connected (checked before a stream starts)."""
+        with self._cond:
+            return self._subscribers >= self.max_subscribers
+
+    def subscribe(self) -> None:
+        with self._cond:
+            self._subscribers += 1
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self._subscribers -= 1
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.boot}-{seq}"
+
+    def position(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """
+        Where a subscriber starts: (sequence to send events after, whether it missed
+        events that can no longer be replayed). No Last-Event-ID starts at "now".
+        """
+        with self._cond:
+            current = self._seq
+            oldest = self._buffer[0][0] if self._buffer else current + 1
+        if not last_event_id:
+            return current, False
+        boot, _, seq_text = last_event_id.partition("-")
+        try:
+            seq = int(seq_text)
+        except ValueError:
+            return current, True
+        if boot != self.boot or seq > current or seq < oldest - 1:
+            return current, True
+        return seq, False
+
+    def _after(self, seq: int) -> Optional[List[Entry]]:
+        """Events after `seq` (caller holds the lock); None if some were already evicted."""
+        if seq >= self._seq:
+            return []
+        if not self._buffer or self._buffer[0][0] > seq + 1:
+            return None
+        return [entry for entry in self._buffer if entry[0] > seq]
+
+    def wait(self, seq: int, timeout: float) -> Tuple[int, Optional[List[Entry]]]:
+        """Block until there are events after `seq` or `timeout` passes; returns (latest seq, events)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout)
+            return self._seq, self._after(seq)
+
+    async def wait_async(self, seq: int, timeout: float) -> Tuple[int, Optional[List[Entry]]]:
+        """wait() for coroutines: parks on a future instead of a thread."""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._seq > seq:
+                return self._seq, self._after(seq)
+            waiter = (loop, loop.create_future())
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._waiters.discard(waiter)
+        with self._cond:
+            return self._seq, self._after(seq)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"subscribers": self._subscribers, "buffered": len(self._buffer), "last_seq": self._seq}
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# -------------------------
+# Wire format
+# -------------------------
+class Subscription:
+    """
+    One /stream connection: turns what ChangeFeed.wait returns into SSE text.
+    Events outside `events` are skipped but still advance the position.
+    """
+
+    def __init__(self, feed: ChangeFeed, last_event_id: Optional[str], events: Set[str], retry_ms: int) -> None:
+        self.feed = feed
+        self.events = events
+        self.seq, self.missed = feed.position(last_event_id)
+        self.retry_ms = retry_ms
+
+    def opening(self) -> str:
+        text = f"retry: {self.retry_ms}\n\n"
+        if self.missed:
+            text += self._reset()
+        return text
+
+    def render(self, latest: int, entries: Optional[List[Entry]]) -> str:
+        if entries is None:
+            # Fell behind the buffer while connected
+            self.seq = latest
+            return self._reset()
+        parts = [
+            f"id: {self.feed.event_id(seq)}\nevent: {event}\ndata: {data}\n\n"
+            for seq, event, data in entries
+            if event in self.events
+        ]
+        if entries:
+            self.seq = entries[-1][0]
+        # A comment line keeps proxies from timing the connection out and detects dead clients
+        return "".join(parts) or ": keep-alive\n\n"
+
+    def _reset(self) -> str:
+        return f"id: {self.feed.event_id(self.seq)}\nevent: reset\ndata: {{}}\n\n"
+
+
+def stream(sub: Subscription, heartbeat: float, lifetime: float) -> Iterator[str]:
+    """SSE body for threaded servers; ends after `lifetime` seconds (the client reconnects and resumes)."""
+    deadline = time.monotonic() + lifetime
+    # Counted from the first chunk on: a body that is never iterated never reaches `finally`
+    sub.feed.subscribe()
+    try:
+        yield sub.opening()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            yield sub.render(*sub.feed.wait(sub.seq, min(heartbeat, remaining)))
+    finally:
+        sub.feed.unsubscribe()
+
+
+async def stream_async(sub: Subscription, heartbeat: float, lifetime: float) -> AsyncIterator[str]:
+    """stream() for the ASGI bridge: waiting subscribers hold no thread."""
+    deadline = time.monotonic() + lifetime
+    # Counted from the first chunk on: a body that is never iterated never reaches `finally`
+    sub.feed.subscribe()
+    try:
+        yield sub.opening()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            yield sub.render(*await sub.feed.wait_async(sub.seq, min(heartbeat, remaining)))
+    finally:
+        sub.feed.unsubscribe()
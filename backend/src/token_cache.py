@@ -0,0 +1,183 @@
+"""
+@author Anish
+@description In-process cache of revoked JWT ids so the blocklist check rarely hits MySQL
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime
+import calendar
+import hashlib
+import math
+import threading
+import time
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Convert a blocklist expires_at (naive UTC datetime or MySQL string) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return float(calendar.timegm(value.timetuple()))
+    return None
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings. No false negatives; the false positive
+    rate stays near `error_rate` while at most `capacity` items are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(1, capacity)
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self._bits = max(64, bits)
+        self._hashes = max(1, round(self._bits / capacity * math.log(2)))
+        self._array = bytearray((self._bits + 7) // 8)
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevokedTokenCache:
+    """
+    Answers "is this jti revoked?" from memory.
+
+    - A Bloom filter holds every unexpired revoked jti, loaded from the blocklist
+      and refreshed every `sync_interval` seconds. A miss is a definite "not revoked"
+      and never touches the database.
+    - A bounded LRU of jti -> expiry confirms hits without a query; entries whose
+      expiry has passed are dropped on lookup.
+    - Anything the filter cannot settle (false positive, evicted entry, failed load)
+      falls back to `fallback`, i.e. the authoritative DB lookup.
+
+    Tokens revoked in this process are added immediately via add(). Revocations made
+    by other worker processes become visible at the next sync.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Optional[List[Dict[str, Any]]]],
+        fallback: Callable[[str], bool],
+        sync_interval: float = 30.0,
+        capacity: int = 100_000,
+    ) -> None:
+        self._loader = loader
+        self._fallback = fallback
+        self.sync_interval = sync_interval
+        self.capacity = capacity
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._recent: "OrderedDict[str, Optional[float]]" = OrderedDict()
+        self._synced_at = 0.0
+        # jtis added while a sync is loading, replayed onto the rebuilt filter
+        self._added_during_sync: Optional[List[tuple]] = None
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def is_revoked(self, jti: str) -> bool:
+        self._maybe_sync()
+        with self._lock:
+            if self._bloom is not None:
+                if jti not in self._bloom:
+                    return False
+                if jti in self._recent:
+                    expires = self._recent[jti]
+                    if expires is not None and expires <= time.time():
+                        del self._recent[jti]
+                        return False
+                    self._recent.move_to_end(jti)
+                    return True
+
+        revoked = self._fallback(jti)
+        if revoked:
+            with self._lock:
+                self._remember(jti, None)
+        return revoked
+
+    def add(self, jti: str, expires_at: Any = None) -> None:
+        """Record a jti revoked by this process (called after the blocklist insert commits)."""
+        expires = _to_epoch(expires_at)
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            self._remember(jti, expires)
+            if self._added_during_sync is not None:
+                self._added_during_sync.append((jti, expires))
+
+    def sync(self) -> bool:
+        """Reload the filter from the blocklist. Returns False if the load failed."""
+        with self._lock:
+            self._added_during_sync = []
+        try:
+            rows = self._loader()
+        except Exception as exc:
+            print("[ERROR] RevokedTokenCache.sync:", exc)
+            rows = None
+
+        with self._lock:
+            pending = self._added_during_sync or []
+            self._added_during_sync = None
+            self._synced_at = time.monotonic()
+            if rows is None:
+                return False
+
+            entries = [(str(r["jti"]), _to_epoch(r.get("expires_at"))) for r in rows] + pending
+            bloom = BloomFilter(max(len(entries) * 2, 1024))
+            recent: "OrderedDict[str, Optional[float]]" = OrderedDict()
+            for jti, expires in entries:
+                bloom.add(jti)
+                recent[jti] = expires
+            while len(recent) > self.capacity:
+                recent.popitem(last=False)
+            self._bloom = bloom
+            self._recent = recent
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"loaded": self._bloom is not None, "recent": len(self._recent)}
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _remember(self, jti: str, expires: Optional[float]) -> None:
+        """Insert into the LRU. Caller holds the lock."""
+        self._recent[jti] = expires
+        self._recent.move_to_end(jti)
+        while len(self._recent) > self.capacity:
+            self._recent.popitem(last=False)
+
+    def _maybe_sync(self) -> None:
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        # Only one thread reloads; the rest keep answering from the current filter
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if time.monotonic() - self._synced_at >= self.sync_interval:
+                self.sync()
+        finally:
+            self._sync_lock.release()
@@ -5,8 +5,32 @@
 @returns nothing
 '''
 
+from typing import Any, List
 from datetime import datetime
+import base64
+import json
 
 def now_mysql() -> str:
     """Return current timestamp formatted for MySQL: YYYY-MM-DD HH:MM:SS"""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def encode_cursor(*parts: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque URL-safe cursor.
+    datetime parts are stored in MySQL format so they can be bound back into SQL.
+    """
+    values = [p.strftime("%Y-%m-%d %H:%M:%S") if isinstance(p, datetime) else p for p in parts]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
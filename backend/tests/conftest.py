@@ -0,0 +1,11 @@
+"""
+@author Anish
+@description pytest setup: make the backend's `src` package importable (run `python -m pytest tests` from backend/)
+@date 17/10/2026
+@returns nothing
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
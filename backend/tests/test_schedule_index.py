@@ -0,0 +1,210 @@
+"""
+@author Anish
+@description Tests for the interval treap and the schedule double-booking index
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import random
+import threading
+
+import pytest
+
+from src.schedule_index import IntervalTree, ScheduleIndex, _Node, parse_slot_time
+
+BASE = datetime(2026, 10, 19, 9, 0)
+
+
+def at(minutes: int) -> datetime:
+    return BASE + timedelta(minutes=minutes)
+
+
+def slot(schedule_id: int, start: int, end: int, teacher_id: Optional[int] = 1, location: Any = "Room 101") -> Dict[str, Any]:
+    return {
+        "schedule_id": schedule_id,
+        "subject_id": 1,
+        "teacher_id": teacher_id,
+        "location": location,
+        "start_time": at(start),
+        "end_time": at(end),
+    }
+
+
+def check_invariants(node: Optional[_Node]) -> Tuple[int, Optional[datetime]]:
+    """Walk the treap: heap order on priority, BST order on start, correct max_end. Returns (size, max_end)."""
+    if node is None:
+        return 0, None
+    size, max_end = 1, node.end
+    for child in (node.left, node.right):
+        if child is None:
+            continue
+        assert child.priority <= node.priority
+        child_size, child_max = check_invariants(child)
+        size += child_size
+        assert child_max is not None
+        max_end = max(max_end, child_max)
+    if node.left is not None:
+        assert node.left.start <= node.start
+    if node.right is not None:
+        assert node.right.start >= node.start
+    assert node.max_end == max_end
+    return size, max_end
+
+
+# -------------------------
+# IntervalTree
+# -------------------------
+def test_overlap_is_half_open() -> None:
+    tree = IntervalTree()
+    tree.insert(at(0), at(60), "a")
+    assert tree.overlapping(at(60), at(120)) == []
+    assert tree.overlapping(at(-60), at(0)) == []
+    assert tree.overlapping(at(59), at(61)) == ["a"]
+    assert tree.overlapping(at(10), at(20)) == ["a"]
+    assert tree.overlapping(at(-10), at(200)) == ["a"]
+
+
+def test_hits_come_back_in_start_order_and_respect_exclude() -> None:
+    tree = IntervalTree()
+    for key, start in (("c", 40), ("a", 0), ("b", 20)):
+        tree.insert(at(start), at(start + 30), key)
+    assert tree.overlapping(at(0), at(100)) == ["a", "b", "c"]
+    assert tree.overlapping(at(0), at(100), exclude="b") == ["a", "c"]
+
+
+def test_insert_under_existing_key_replaces_it() -> None:
+    tree = IntervalTree()
+    tree.insert(at(0), at(60), 7)
+    tree.insert(at(120), at(180), 7)
+    assert len(tree) == 1
+    assert tree.overlapping(at(0), at(60)) == []
+    assert tree.overlapping(at(150), at(160)) == [7]
+    check_invariants(tree._root)
+
+
+def test_remove() -> None:
+    tree = IntervalTree()
+    tree.insert(at(0), at(60), 1)
+    tree.insert(at(0), at(90), 2)  # same start: ties are broken by key
+    assert tree.remove(1) is True
+    assert tree.remove(1) is False
+    assert tree.overlapping(at(0), at(30)) == [2]
+    assert tree.remove(2) is True
+    assert len(tree) == 0 and tree._root is None
+
+
+def test_random_operations_match_brute_force() -> None:
+    rng = random.Random(12)
+    tree = IntervalTree()
+    spans: Dict[int, Tuple[datetime, datetime]] = {}
+    for _ in range(3000):
+        key = rng.randrange(300)
+        if rng.random() < 0.3:
+            assert tree.remove(key) == (spans.pop(key, None) is not None)
+        else:
+            start = rng.randrange(0, 5000)
+            spans[key] = (at(start), at(start + rng.randrange(1, 240)))
+            tree.insert(*spans[key], key)
+
+        q_start = rng.randrange(-100, 5200)
+        q_end = q_start + rng.randrange(1, 300)
+        exclude = rng.choice([None, key])
+        expected = sorted(
+            (k for k, (s, e) in spans.items() if s < at(q_end) and e > at(q_start) and k != exclude),
+            key=lambda k: (spans[k][0], repr(k)),
+        )
+        assert tree.overlapping(at(q_start), at(q_end), exclude=exclude) == expected
+
+    assert len(tree) == len(spans)
+    assert check_invariants(tree._root)[0] == len(spans)
+
+
+# -------------------------
+# ScheduleIndex
+# -------------------------
+def make_index(rows: List[Dict[str, Any]]) -> ScheduleIndex:
+    table = {row["schedule_id"]: row for row in rows}
+    return ScheduleIndex(loader=lambda: list(table.values()), fetch_one=table.get, sync_interval=3600)
+
+
+def test_parse_slot_time() -> None:
+    assert parse_slot_time("2026-10-19 09:00:00") == BASE
+    assert parse_slot_time("2026-10-19T09:00:00+05:30") == BASE
+    with pytest.raises(ValueError):
+        parse_slot_time("")
+    with pytest.raises(ValueError):
+        parse_slot_time(None)
+
+
+def test_conflicts_by_teacher_and_by_room() -> None:
+    index = make_index([slot(1, 0, 60, teacher_id=1, location="Room 101")])
+    assert index.load()
+
+    hits = index.conflicts(1, "Lab 2", at(30), at(90))
+    assert [(h["type"], h["schedule_id"]) for h in hits or []] == [("teacher", 1)]
+
+    # Rooms compare case- and whitespace-insensitively
+    hits = index.conflicts(2, "  room   101 ", at(30), at(90))
+    assert [(h["type"], h["schedule_id"]) for h in hits or []] == [("location", 1)]
+
+    assert index.conflicts(2, "Lab 2", at(30), at(90)) == []
+    assert index.conflicts(1, "Room 101", at(60), at(120)) == []
+    assert index.conflicts(1, "Room 101", at(0), at(60), exclude_id=1) == []
+
+
+def test_change_listener_keeps_index_in_sync() -> None:
+    table = {1: slot(1, 0, 60)}
+    index = ScheduleIndex(loader=lambda: list(table.values()), fetch_one=table.get, sync_interval=3600)
+    assert index.load()
+
+    table[1] = slot(1, 120, 180)
+    index.on_change("schedules", "update", 1, None)
+    assert index.conflicts(1, None, at(0), at(60)) == []
+    assert [h["schedule_id"] for h in index.conflicts(1, None, at(150), at(160)) or []] == [1]
+
+    del table[1]
+    index.on_change("schedules", "delete", 1, None)
+    assert index.stats() == {"loaded": True, "schedules": 0, "teachers": 0, "locations": 0}
+
+
+def test_validate_checks_the_batch_against_itself() -> None:
+    index = make_index([slot(1, 0, 60, teacher_id=1, location="Room 101")])
+    proposals = [
+        {"teacher_id": 2, "location": "Lab 2", "start": at(0), "end": at(60)},
+        {"teacher_id": 2, "location": "Lab 3", "start": at(30), "end": at(90)},
+        # Moves schedule 1 away, so it no longer blocks Room 101 at its old time
+        {"teacher_id": 1, "location": "Room 101", "start": at(300), "end": at(360), "schedule_id": 1},
+        {"teacher_id": 3, "location": "Room 101", "start": at(0), "end": at(60)},
+    ]
+    found = index.validate(proposals)
+    assert found == [{"index": 1, "type": "teacher", "with_index": 0}]
+
+
+def test_first_load_runs_in_background() -> None:
+    release = threading.Event()
+
+    def slow_loader() -> List[Dict[str, Any]]:
+        release.wait(5)
+        return [slot(1, 0, 60)]
+
+    index = ScheduleIndex(loader=slow_loader, fetch_one=lambda schedule_id: None, sync_interval=3600)
+    # Not loaded yet: the fast path steps aside instead of blocking the request
+    assert index.conflicts(1, None, at(0), at(60)) is None
+    release.set()
+    # validate() waits for the load it needs
+    assert index.validate([{"teacher_id": 1, "location": None, "start": at(0), "end": at(60)}]) == [
+        {"index": 0, "type": "teacher", "schedule_id": 1, "teacher_id": 1, "location": "Room 101",
+         "start_time": at(0), "end_time": at(60)},
+    ]
+
+
+def test_failed_load_keeps_serving_the_old_index() -> None:
+    rows: Optional[List[Dict[str, Any]]] = [slot(1, 0, 60)]
+    index = ScheduleIndex(loader=lambda: rows, fetch_one=lambda schedule_id: None, sync_interval=3600)
+    assert index.load()
+    rows = None
+    assert index.load() is False
+    assert [h["schedule_id"] for h in index.conflicts(1, None, at(0), at(60)) or []] == [1]
@@ -0,0 +1,179 @@
+"""
+@author Anish
+@description Tests for the BM25 search index: stemming, ranking and background rebuilds
+@date 17/10/2026
+@returns nothing
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+
+import pytest
+
+from src.search import InvertedIndex, SearchIndex, analyze, stem
+
+
+def notice(doc_id: int, title: str, body: str = "") -> Dict[str, Any]:
+    return {"notice_id": doc_id, "title": title, "content": body}
+
+
+def to_document(row: Dict[str, Any]) -> Tuple[int, str, str, Dict[str, Any]]:
+    return row["notice_id"], row["title"], row["content"], {}
+
+
+class Table:
+    """A notices table the index loads from; `gate` holds load_all() until set."""
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = {row["notice_id"]: row for row in rows}
+        self.gate = threading.Event()
+        self.gate.set()
+        self.reading = threading.Event()
+        self.fail = False
+
+    def load_all(self) -> Optional[List[Dict[str, Any]]]:
+        snapshot = list(self.rows.values())
+        self.reading.set()
+        self.gate.wait(5)
+        return None if self.fail else snapshot
+
+    def fetch_one(self, doc_id: int) -> Optional[Dict[str, Any]]:
+        return self.rows.get(doc_id)
+
+    def index(self, sync_interval: float = 3600) -> SearchIndex:
+        return SearchIndex({"notice": (self.load_all, self.fetch_one, to_document)}, sync_interval=sync_interval)
+
+
+def ids(result: Optional[Tuple[int, List[Dict[str, Any]]]]) -> List[int]:
+    assert result is not None
+    return [hit["id"] for hit in result[1]]
+
+
+# -------------------------
+# Analysis
+# -------------------------
+@pytest.mark.parametrize("word, expected", [
+    ("caresses", "caress"),
+    ("ponies", "poni"),
+    ("relational", "relat"),
+    ("hopping", "hop"),
+    ("generalizations", "gener"),
+    ("sky", "sky"),
+])
+def test_porter_stemmer(word: str, expected: str) -> None:
+    assert stem(word) == expected
+
+
+def test_analyze_lowercases_stems_and_drops_stop_words() -> None:
+    assert analyze("The Examinations of the semester") == ["examin", "semest"]
+    assert analyze("examination") == analyze("EXAMINATIONS")
+
+
+# -------------------------
+# Ranking
+# -------------------------
+def test_stemmed_query_matches_other_forms() -> None:
+    table = Table([notice(1, "End semester examinations", "Schedule attached"), notice(2, "Holiday list")])
+    assert ids(table.index().search("examination")) == [1]
+
+
+def test_bm25_ranking() -> None:
+    index = InvertedIndex()
+    index.add(("notice", 1), "Library hours", "The library opens at nine.")
+    index.add(("notice", 2), "Exam results", "Results of the exam are out. Exam rechecking opens Monday.")
+    index.add(("notice", 3), "Sports day", "Bring your exam admit card to the sports day.")
+    scores = index.search(analyze("exam"))
+    # Title hits and repeated terms rank higher; documents without the term score nothing
+    assert set(scores) == {("notice", 2), ("notice", 3)}
+    assert scores[("notice", 2)] > scores[("notice", 3)]
+    # A term found in fewer documents weighs more
+    assert index.search(analyze("library"))[("notice", 1)] > scores[("notice", 3)]
+
+
+def test_remove_and_kind_filter() -> None:
+    index = InvertedIndex()
+    index.add(("notice", 1), "Exam", "")
+    index.add(("job", 1), "Exam invigilator", "")
+    assert set(index.search(analyze("exam"), {"job"})) == {("job", 1)}
+    assert index.remove(("job", 1)) is True
+    assert index.remove(("job", 1)) is False
+    assert set(index.search(analyze("exam"))) == {("notice", 1)}
+
+
+def test_search_pagination_and_hit_payload() -> None:
+    table = Table([notice(i, f"Exam notice {i}", "exam " * i) for i in range(1, 6)])
+    index = table.index()
+    total, hits = index.search("exam", limit=2) or (0, [])
+    assert total == 5 and len(hits) == 2
+    assert ids(index.search("exam", offset=2, limit=10)) == ids(index.search("exam"))[2:]
+    assert set(hits[0]) == {"type", "id", "score", "title", "snippet"}
+    assert index.search("the of and") == (0, [])
+
+
+# -------------------------
+# Background loading
+# -------------------------
+def test_first_load_runs_in_background() -> None:
+    table = Table([notice(1, "Exam timetable")])
+    table.gate.clear()
+    index = table.index()
+    # Not loaded yet: callers that can do without the index are not held up
+    assert index._ensure_loaded() is False
+    assert table.reading.wait(5)
+
+    waiter = threading.Thread(target=lambda: results.append(index.search("exam")))
+    results: List[Any] = []
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()  # search() waits for the first load
+    table.gate.set()
+    waiter.join(5)
+    assert ids(results[0]) == [1]
+
+
+def test_failed_reload_keeps_serving_the_old_index() -> None:
+    table = Table([notice(1, "Exam timetable")])
+    index = table.index()
+    assert index.load()
+    table.fail = True
+    assert index.load() is False
+    assert ids(index.search("exam")) == [1]
+
+
+def test_stale_index_is_rebuilt_without_blocking_searches() -> None:
+    table = Table([notice(1, "Exam timetable")])
+    index = table.index(sync_interval=0)
+    assert index.load()
+    table.rows[2] = notice(2, "Exam results")
+    table.gate.clear()
+    table.reading.clear()
+    # The rebuild is started but this search answers from the current index
+    assert ids(index.search("exam")) == [1]
+    assert table.reading.wait(5)
+    table.gate.set()
+    loading = index._loading
+    if loading is not None:
+        loading.join(5)
+    assert sorted(ids(index.search("exam"))) == [1, 2]
+
+
+def test_write_during_rebuild_is_not_lost() -> None:
+    table = Table([notice(1, "Exam timetable")])
+    index = table.index()
+    assert index.load()
+
+    table.gate.clear()
+    table.reading.clear()
+    rebuild = threading.Thread(target=index.load)
+    rebuild.start()
+    assert table.reading.wait(5)
+    # Lands after the rebuild took its snapshot
+    table.rows[2] = notice(2, "Exam results")
+    index.listener("notice")("notices", "insert", 2, None)
+    del table.rows[1]
+    index.listener("notice")("notices", "delete", 1, None)
+    table.gate.set()
+    rebuild.join(5)
+
+    assert ids(index.search("exam")) == [2]
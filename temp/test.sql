@@ -143,6 +143,79 @@
 -- ('70', 0),   -- Teacher (F)
 -- ('83', 0);   -- Student (S)
 
+-- -------------------------------------------
+-- 12) INDEXES (keyset pagination)
+-- -------------------------------------------
+-- /schedules/all?limit= pages on (start_time, schedule_id); InnoDB appends
+-- the primary key to secondary indexes so this covers the tie-breaker too.
+-- CREATE INDEX idx_schedules_start_time ON schedules (start_time);
+
+-- -------------------------------------------
+-- 13) COLLECTION VERSIONS (ETag / conditional GET)
+-- -------------------------------------------
+-- Bumped after every write to notices/events/job_updates/schedules.
+-- Rows are created on the first write; until then list routes send no ETag.
+-- CREATE TABLE collection_versions (
+--     name VARCHAR(50) PRIMARY KEY,
+--     version BIGINT NOT NULL DEFAULT 0
+-- );
+
+-- INSERT INTO collection_versions VALUES
+-- ('notices', 0),
+-- ('events', 0),
+-- ('job_updates', 0),
+-- ('schedules', 0);
+
+-- -------------------------------------------
+-- 14) TOKEN BLOCKLIST (revoked refresh tokens)
+-- -------------------------------------------
+-- expires_at is stored in UTC. The index serves both the purge
+-- (DELETE ... WHERE expires_at < UTC_TIMESTAMP() ORDER BY expires_at LIMIT n)
+-- and the revoked-token cache load (expires_at > UTC_TIMESTAMP()).
+-- CREATE TABLE token_blocklist (
+--     jti VARCHAR(64) PRIMARY KEY,
+--     expires_at DATETIME NULL,
+--     INDEX idx_token_blocklist_expires_at (expires_at)
+-- );
+
+-- Existing installs:
+-- CREATE INDEX idx_token_blocklist_expires_at ON token_blocklist (expires_at);
+
+-- Optional, for very large volumes: partition by expiry day and drop whole
+-- partitions instead of deleting rows. MySQL requires the partition column in
+-- every unique key, so the primary key becomes (jti, expires_at) and
+-- expires_at must be NOT NULL.
+-- ALTER TABLE token_blocklist
+--     MODIFY expires_at DATETIME NOT NULL,
+--     DROP PRIMARY KEY,
+--     ADD PRIMARY KEY (jti, expires_at);
+-- ALTER TABLE token_blocklist
+--     PARTITION BY RANGE (TO_DAYS(expires_at)) (
+--         PARTITION p_old VALUES LESS THAN (TO_DAYS('2026-01-01')),
+--         PARTITION p_future VALUES LESS THAN MAXVALUE
+--     );
+-- ALTER TABLE token_blocklist DROP PARTITION p_old;
+
+-- -------------------------------------------
+-- 15) INDEXES (filtered timetable queries)
+-- -------------------------------------------
+-- GET /schedules?from=&to=&teacher_id=&location= filters on start_time ranges,
+-- optionally after an equality on teacher or room. idx_schedules_start_time
+-- (section 12) serves the plain date-range view.
+-- CREATE INDEX idx_schedules_teacher_start ON schedules (teacher_id, start_time);
+-- CREATE INDEX idx_schedules_location_start ON schedules (location, start_time);
+-- CREATE INDEX idx_schedules_subject_start ON schedules (subject_id, start_time);
+-- program_id / semester filters join subjects on its primary key and filter there.
+-- CREATE INDEX idx_subjects_program_semester ON subjects (program_id, semester);
+
+-- -------------------------------------------
+-- 16) SQLITE (DB_ENGINE="sqlite")
+-- -------------------------------------------
+-- backend/src/sqlite_backend.py creates sections 1-15 in SQLite syntax on
+-- first connect (INTEGER PRIMARY KEY AUTOINCREMENT, emails and login ids
+-- COLLATE NOCASE, DATETIME stored as 'YYYY-MM-DD HH:MM:SS' text) and opens the
+-- file in WAL mode. Nothing to run by hand; keep it in step with this file.
+
 -- DONE
 
 